@@ -0,0 +1,49 @@
+'''
+Benchmarks a generated Python matcher against simulating the DFA through its
+transition function and against its compiled transition table, on automata
+of growing size. Two families are measured: (a|b)*a(a|b)^n, whose minimal DFA
+has 2^(n+1) states and changes state on almost every symbol, and strings
+whose count of b's is a multiple of n, on text that is mostly a's, where the
+DFA stays in the same state for long runs
+
+Usage: python benchmarks/dfa_codegen.py [max n] [input length]
+'''
+
+import random
+import sys
+import time
+
+from regular_languages import NFA_to_DFA, Regex, regex_to_nfa
+from regular_languages.operators import minimize_dfa
+
+def benchmark(pattern: str, text: str):
+    dfa = minimize_dfa(NFA_to_DFA(regex_to_nfa(Regex.from_string(pattern))))
+    compiled = dfa.compile()
+    matcher = dfa.to_python_matcher()
+    timings = []
+
+    for name, test in [('interpreted', dfa.test), ('table', compiled.test), ('generated', matcher)]:
+        start = time.perf_counter()
+        test(text)
+        timings.append(f'{name} {time.perf_counter() - start:.3f}s')
+
+    print(f'  {compiled.num_states - 1} states: ' + ', '.join(timings))
+
+def main():
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+
+    rng = random.Random(0)
+    mixed_text = ''.join(rng.choice('ab') for _ in range(length))
+    runs_text = ''.join('b' if rng.random() < 0.02 else 'a' for _ in range(length))
+
+    print('(a|b)*a(a|b)^n, on random text')
+    for n in range(0, max_n + 1, 2):
+        benchmark('(a|b)*a' + '(a|b)' * n, mixed_text)
+
+    print('((a*ba*)^n)*, on text that is mostly a\'s')
+    for n in range(1, 2 ** (max_n // 2) + 1, 2):
+        benchmark('(' + 'a*ba*' * n + ')*', runs_text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+'''
+Benchmarks matching a single large buffer with a compiled DFA, sequentially
+and split into chunks across a pool of worker processes
+
+Usage: python benchmarks/parallel_matching.py [megabytes] [max workers]
+'''
+
+import os
+import random
+import sys
+import time
+
+from regular_languages import DFA
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    # Accepts the buffers whose last line has an even number of a's
+    transition_map = {
+        parity: {byte: 0 if byte == 10 else parity ^ (byte == 97) for byte in range(256)}
+        for parity in (0, 1)
+    }
+    dfa = DFA.from_transition_map(transition_map, 0, {0})
+    compiled = dfa.compile()
+
+    buffer = random.Random(0).randbytes(megabytes * 1024 * 1024)
+
+    start = time.perf_counter()
+    expected = compiled.test(buffer)
+    sequential = time.perf_counter() - start
+    print(f'sequential: {sequential:.3f}s')
+
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        assert compiled.test_parallel(buffer, workers) == expected
+        elapsed = time.perf_counter() - start
+        print(f'{workers} workers: {elapsed:.3f}s ({sequential / elapsed:.2f}x)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+'''
+Benchmarks the parallel subset construction against the sequential one, on
+an NFA whose DFA is exponentially larger: (a|b)*a(a|b)^n
+
+Usage: python benchmarks/parallel_subset_construction.py [n] [max workers]
+'''
+
+import os
+import sys
+import time
+
+from regular_languages import NFA_to_DFA, Regex, regex_to_nfa
+from regular_languages.Converters import NFA_to_DFA_parallel
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    nfa = regex_to_nfa(Regex.from_string('(a|b)*a' + '(a|b)' * n))
+
+    start = time.perf_counter()
+    dfa = NFA_to_DFA(nfa)
+    sequential = time.perf_counter() - start
+    print(f'sequential: {len(dfa.states)} states in {sequential:.3f}s')
+
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        NFA_to_DFA_parallel(nfa, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f'{workers} workers: {elapsed:.3f}s ({sequential / elapsed:.2f}x)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+'''
+Benchmarks the passes over regex asts on deeply nested asts, which would
+overflow the stack of a recursive implementation. The ast at depth n nests
+closures and concatenations n levels deep: (...((a)*b)*a...)*
+
+Usage: python benchmarks/regex_ast_depth.py [max depth]
+'''
+
+import sys
+import time
+
+from regular_languages.Converters.regex_to_nfa import regex_ast_to_nfa
+from regular_languages.RegularExpressions.extract_alphabet import extract_alphabet
+from regular_languages.RegularExpressions.regex_ast import ClosureNode, ConcatNode, SymbolNode
+from regular_languages.RegularExpressions.regex_ast_to_DNF import regex_ast_to_DNF
+from regular_languages.RegularExpressions.regex_to_string import regex_ast_to_string
+from regular_languages.RegularExpressions.required_literals import extract_required_literals
+from regular_languages.RegularExpressions.simplify_regex_ast import simplify_regex_ast
+
+PASSES = [
+    ('extract_alphabet', extract_alphabet),
+    ('to_string', regex_ast_to_string),
+    ('simplify', simplify_regex_ast),
+    ('to_DNF', regex_ast_to_DNF),
+    ('required_literals', extract_required_literals),
+    ('to_nfa', regex_ast_to_nfa),
+]
+
+def nested_ast(depth: int):
+    ast = SymbolNode('a')
+
+    for level in range(depth):
+        ast = ClosureNode(ConcatNode(ast, SymbolNode('ab'[level % 2])))
+
+    return ast
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    depth = 1_000
+    while depth <= max_depth:
+        ast = nested_ast(depth)
+        timings = []
+
+        for name, regex_pass in PASSES:
+            start = time.perf_counter()
+            regex_pass(ast)
+            timings.append(f'{name} {time.perf_counter() - start:.3f}s')
+
+        print(f'depth {depth}: ' + ', '.join(timings))
+        depth *= 10
+
+if __name__ == '__main__':
+    main()
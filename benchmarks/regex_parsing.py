@@ -0,0 +1,39 @@
+'''
+Benchmarks the shift-reduce regex parser against the precedence parser, on
+patterns of a growing number of tokens. The shift-reduce parser is quadratic,
+so it is only run up to a limit
+
+Usage: python benchmarks/regex_parsing.py [max tokens] [max shift-reduce tokens]
+'''
+
+import sys
+import time
+
+from regular_languages.RegularExpressions import compile_regular_expression, compile_regular_expression_by_precedence
+
+# 10 tokens, which exercise every rule of the grammar
+UNIT = '(ab|c*)*|d'
+
+def main():
+    max_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    max_shift_reduce_tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    tokens = 1_000
+    while tokens <= max_tokens:
+        pattern = '|'.join([UNIT] * (tokens // (len(UNIT) + 1)))
+        timings = []
+
+        start = time.perf_counter()
+        compile_regular_expression_by_precedence(pattern)
+        timings.append(f'precedence {time.perf_counter() - start:.3f}s')
+
+        if tokens <= max_shift_reduce_tokens:
+            start = time.perf_counter()
+            compile_regular_expression(pattern)
+            timings.append(f'shift-reduce {time.perf_counter() - start:.3f}s')
+
+        print(f'{tokens} tokens: ' + ', '.join(timings))
+        tokens *= 10
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,15 @@
 from typing import TypeVar
 from regular_languages import DFA
 from regular_languages import Regex
-from regular_languages.GNFAs.gnfa import GNFA
+from regular_languages.GNFAs.gnfa import GNFA, RipHeuristic
 
 T = TypeVar('T')
 U = TypeVar('U')
 
-def DFA_to_Regex(dfa: DFA[T, U]) -> Regex[U]:
+def DFA_to_Regex(dfa: DFA[T, U], heuristic: RipHeuristic | None = None) -> Regex[U]:
     '''
     Constructs a regular expression that matches the same language as the
-    given DFA
+    given DFA. The heuristic chooses the order in which states are eliminated
     '''
 
     # TODO: consider passing a callback that can be used to simplify the
@@ -17,6 +17,6 @@ def DFA_to_Regex(dfa: DFA[T, U]) -> Regex[U]:
     # I think we should just call the GNFA support function:
 
     gnfa = GNFA.from_DFA(dfa)
-    regex_ast = gnfa.to_regexAST()
+    regex_ast = gnfa.to_regexAST(heuristic=heuristic)
 
     return Regex(dfa.alphabet, regex_ast)
@@ -1,8 +1,12 @@
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations
+import os
+from typing import FrozenSet, List, Optional, Tuple
 from regular_languages import DFA
 from regular_languages import NFA
 from regular_languages.DFAs.dfa import TransitionMap
+from regular_languages.NFAs.flat_nfa import FlatNFA
 
 def NFA_to_DFA(nfa: NFA) -> DFA:
     '''
@@ -22,6 +26,9 @@ def NFA_to_DFA(nfa: NFA) -> DFA:
     while len(queue) > 0:
         state = queue.pop()
 
+        # Ensure the state is in the transition map, even with an empty alphabet
+        transition_map[state]
+
         for symbol in nfa.alphabet:
             next_state = nfa.simulate([symbol], state)
             frozen_state = frozenset(next_state)
@@ -58,3 +65,70 @@ def NFA_to_DFA_complete(nfa: NFA) -> DFA:
     accept_states = {state for state in states if len(state.intersection(nfa.accept_states)) > 0}
 
     return DFA.from_transition_map(transition_map, start_state, accept_states)
+
+# The flattened NFA each worker process computes moves against. It is sent to
+# each worker once, when the worker starts
+_worker_nfa: Optional[FlatNFA] = None
+
+def _init_worker(flat_nfa: FlatNFA):
+    global _worker_nfa
+    _worker_nfa = flat_nfa
+
+def _expand_subsets(subsets: List[FrozenSet[int]]) -> List[Tuple[FrozenSet[int], ...]]:
+    '''
+    Computes the moves of each subset on every symbol, in a worker process
+    '''
+
+    return [_worker_nfa.expand(subset) for subset in subsets]
+
+def NFA_to_DFA_parallel(nfa: NFA, max_workers: Optional[int] = None,
+                        chunks_per_worker: int = 4) -> DFA:
+    '''
+    Converts an NFA to a DFA that recognizes the same language, computing the
+    subset construction across a pool of worker processes.
+
+    The subsets are explored in breadth-first frontiers. Each frontier is
+    split into chunks that the workers expand on every symbol, and the new
+    subsets are merged and deduplicated centrally to form the next frontier.
+    The resulting DFA is the same as the one produced by NFA_to_DFA
+    '''
+
+    flat_nfa = FlatNFA.from_NFA(nfa)
+    workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+
+    start_subset = flat_nfa.start_subset()
+    subsets = {start_subset}
+    frontier = [start_subset]
+    subset_transitions = {}
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(flat_nfa,)) as executor:
+        while len(frontier) > 0:
+            chunk_size = -(-len(frontier) // (workers * chunks_per_worker))
+            chunks = [frontier[i:i + chunk_size] for i in range(0, len(frontier), chunk_size)]
+            next_frontier = []
+
+            for chunk, expansions in zip(chunks, executor.map(_expand_subsets, chunks)):
+                for subset, next_subsets in zip(chunk, expansions):
+                    subset_transitions[subset] = next_subsets
+
+                    for next_subset in next_subsets:
+                        if next_subset not in subsets:
+                            subsets.add(next_subset)
+                            next_frontier.append(next_subset)
+
+            frontier = next_frontier
+
+    # Translate the subsets of state indices back to the original NFA states,
+    # so that the DFA matches the one produced by the sequential construction
+    states = {subset: flat_nfa.unflatten_subset(subset) for subset in subsets}
+    transition_map: TransitionMap = {
+        states[subset]: {
+            symbol: states[next_subset] for symbol, next_subset
+            in zip(flat_nfa.alphabet, next_subsets)
+        } for subset, next_subsets in subset_transitions.items()
+    }
+
+    start_state = states[start_subset]
+    accept_states = {state for subset, state in states.items() if flat_nfa.is_accepting(subset)}
+
+    return DFA.from_transition_map(transition_map, start_state, accept_states)
@@ -0,0 +1,20 @@
+from typing import TypeVar
+from regular_languages import NFA
+from regular_languages import Regex
+from regular_languages.GNFAs.gnfa import GNFA, RipHeuristic
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+def NFA_to_Regex(nfa: NFA[T, U], heuristic: RipHeuristic | None = None, reduce: bool = True) -> Regex[U]:
+    '''
+    Constructs a regular expression that matches the same language as the
+    given NFA, by eliminating the states of the NFA directly rather than of
+    an equivalent DFA, which can have exponentially more states. The NFA is
+    reduced first, unless reduce is False
+    '''
+
+    gnfa = GNFA.from_NFA(nfa.reduce() if reduce else nfa)
+    regex_ast = gnfa.to_regexAST(heuristic=heuristic)
+
+    return Regex(nfa.alphabet, regex_ast)
@@ -1,4 +1,6 @@
 from .DFA_to_NFA import DFA_to_NFA
-from .NFA_to_DFA import NFA_to_DFA
+from .NFA_to_DFA import NFA_to_DFA, NFA_to_DFA_parallel
 from .DFA_to_Regex import DFA_to_Regex
 from .regex_to_nfa import regex_to_nfa
+from .regex_to_symbolic_nfa import regex_to_symbolic_nfa
+from .NFA_to_Regex import NFA_to_Regex
@@ -0,0 +1,49 @@
+from collections import defaultdict
+from regular_languages import Regex
+from regular_languages.NFAs.nfa import SpecialSymbols
+from regular_languages.RegularExpressions.regex_ast import CharClassNode, RegexAST, SymbolNode
+from regular_languages.SymbolicAutomata import SymbolicNFA
+from regular_languages.helpers.interval_set import IntervalSet
+from .thompson import thompson_construction
+
+def regex_to_symbolic_nfa(regex: Regex) -> SymbolicNFA[int]:
+    '''
+    Converts a regular expression over characters to a symbolic NFA that
+    recognizes the same language
+    '''
+
+    return regex_ast_to_symbolic_nfa(regex.ast)
+
+def regex_ast_to_symbolic_nfa(ast: RegexAST) -> SymbolicNFA[int]:
+    '''
+    Converts the regex ast to a symbolic NFA with Thompson's construction.
+    Each symbol and character class becomes a single transition labelled with
+    its set of characters, so the NFA does not grow with the size of the
+    classes. Every symbol must be a single character
+    '''
+
+    transitions, start_state, accept_state = thompson_construction(ast, leaf_chars)
+    guards = defaultdict(list)
+    epsilon_transitions = defaultdict(set)
+
+    for state, state_transitions in enumerate(transitions):
+        for label, dests in state_transitions.items():
+            if label is SpecialSymbols.EMPTY:
+                epsilon_transitions[state].update(dests)
+
+            else:
+                guards[state].extend((label, dest) for dest in dests)
+
+    return SymbolicNFA(set(range(len(transitions))), dict(guards), dict(epsilon_transitions),
+                       start_state, {accept_state})
+
+def leaf_chars(node: SymbolNode | CharClassNode):
+    match node:
+        case SymbolNode(symbol):
+            if not isinstance(symbol, str) or len(symbol) != 1:
+                raise Exception(f'Symbolic automata are over characters, but {symbol!r} is not a single character')
+
+            return [IntervalSet.from_chars(symbol)]
+
+        case CharClassNode(chars):
+            return [chars]
@@ -0,0 +1,146 @@
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from regular_languages.NFAs.nfa import SpecialSymbols
+from regular_languages.RegularExpressions.regex_ast import CharClassNode, ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, OptionalNode, PlusNode, RegexAST, RepeatNode, SymbolNode, UnionNode
+from regular_languages.RegularExpressions.traversal import iterate_post_order
+
+# The start and accept state of the NFA built for a subexpression, and the
+# first of its states. The states of a fragment are numbered consecutively,
+# from its first state to the last state created so far
+Fragment = Tuple[int, int, int]
+
+def thompson_construction(ast: RegexAST, leaf_labels: Callable[[RegexAST], Iterable]) -> Tuple[List[Dict[object, Set[int]]], int, int]:
+    '''
+    Builds an NFA for the regex ast with Thompson's construction. The states
+    are integers, and the fragments for the nodes are built in post-order
+    with an explicit stack, so ASTs of any depth can be converted.
+
+    The labels of the transitions for a symbol or character class are given
+    by leaf_labels, so the same construction builds NFAs over symbols and
+    over sets of characters. Empty transitions are labelled with
+    SpecialSymbols.EMPTY. Returns the transitions of each state, and the
+    start and accept state
+    '''
+
+    transitions: List[Dict[object, Set[int]]] = []
+
+    def new_state() -> int:
+        transitions.append({})
+
+        return len(transitions) - 1
+
+    def add_transition(source: int, symbol, dest: int):
+        transitions[source].setdefault(symbol, set()).add(dest)
+
+    def copy_fragment(fragment: Fragment, end_state: int) -> Fragment:
+        '''
+        Stamps a copy of a fragment whose states end before end_state, by
+        shifting its states past the states created so far. The transitions
+        of a fragment never leave it, until it is connected to the fragments
+        around it
+        '''
+
+        start, accept, first_state = fragment
+        offset = len(transitions) - first_state
+
+        for state in range(first_state, end_state):
+            transitions.append({symbol: {dest + offset for dest in dests}
+                                for symbol, dests in transitions[state].items()})
+
+        return start + offset, accept + offset, first_state + offset
+
+    # The fragments of the children of the nodes that have not been built yet
+    fragments: List[Fragment] = []
+
+    for node in iterate_post_order(ast):
+        first_state = len(transitions)
+
+        match node:
+            case EmptyStrNode():
+                start, accept = new_state(), new_state()
+                add_transition(start, SpecialSymbols.EMPTY, accept)
+
+            case EmptyLangNode():
+                start, accept = new_state(), new_state()
+
+            case SymbolNode(_) | CharClassNode(_):
+                start, accept = new_state(), new_state()
+
+                for label in leaf_labels(node):
+                    add_transition(start, label, accept)
+
+            case UnionNode(children):
+                child_fragments = pop_fragments(fragments, len(children))
+                first_state = child_fragments[0][2]
+                start, accept = new_state(), new_state()
+
+                for child_start, child_accept, _ in child_fragments:
+                    add_transition(start, SpecialSymbols.EMPTY, child_start)
+                    add_transition(child_accept, SpecialSymbols.EMPTY, accept)
+
+            case ConcatNode(children):
+                child_fragments = pop_fragments(fragments, len(children))
+                first_state = child_fragments[0][2]
+                start, accept = child_fragments[0][0], child_fragments[-1][1]
+
+                for (_, left_accept, _), (right_start, _, _) in zip(child_fragments, child_fragments[1:]):
+                    add_transition(left_accept, SpecialSymbols.EMPTY, right_start)
+
+            case ClosureNode(_) | OptionalNode(_) | PlusNode(_):
+                child_start, child_accept, first_state = fragments.pop()
+                start, accept = new_state(), new_state()
+
+                add_transition(start, SpecialSymbols.EMPTY, child_start)
+                add_transition(child_accept, SpecialSymbols.EMPTY, accept)
+
+                # The closure and optional operators can skip the child
+                if not isinstance(node, PlusNode):
+                    add_transition(start, SpecialSymbols.EMPTY, accept)
+
+                # The closure and plus operators can repeat the child
+                if not isinstance(node, OptionalNode):
+                    add_transition(child_accept, SpecialSymbols.EMPTY, child_start)
+
+            case RepeatNode(_, min_count, max_count):
+                child_fragment = fragments.pop()
+                first_state, child_end = child_fragment[2], len(transitions)
+
+                # The copies needed: one for each required repetition, and
+                # one for each optional repetition, or a single repeating copy
+                # when there is no max
+                num_copies = max(min_count, 1) if max_count is None else max_count
+                copies = [child_fragment] + [copy_fragment(child_fragment, child_end) for _ in range(num_copies - 1)]
+
+                start, accept = new_state(), new_state()
+                add_transition(start, SpecialSymbols.EMPTY, copies[0][0] if num_copies > 0 else accept)
+
+                for (_, left_accept, _), (right_start, _, _) in zip(copies, copies[1:]):
+                    add_transition(left_accept, SpecialSymbols.EMPTY, right_start)
+
+                # Every copy after the required ones can end the repetition
+                for count, (_, copy_accept, _) in enumerate(copies, 1):
+                    if count >= min_count:
+                        add_transition(copy_accept, SpecialSymbols.EMPTY, accept)
+
+                if min_count == 0 and num_copies > 0:
+                    add_transition(start, SpecialSymbols.EMPTY, accept)
+
+                if max_count is None:
+                    last_start, last_accept, _ = copies[-1]
+                    add_transition(last_accept, SpecialSymbols.EMPTY, last_start)
+
+        fragments.append((start, accept, first_state))
+
+    start_state, accept_state, _ = fragments.pop()
+
+    return transitions, start_state, accept_state
+
+def pop_fragments(fragments: List[Fragment], count: int) -> List[Fragment]:
+    '''
+    Pops the fragments of the last count nodes built, in the order they were
+    built
+    '''
+
+    popped = fragments[len(fragments) - count:]
+    del fragments[len(fragments) - count:]
+
+    return popped
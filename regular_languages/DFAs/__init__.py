@@ -1 +1,6 @@
-from .dfa import DFA
+from .dfa import DFA, LanguageSize
+from .compiled_dfa import BaseCompiledDFA, CompiledDFA
+from .sparse_compiled_dfa import SparseCompiledDFA
+from .incremental_matcher import IncrementalMatcher
+from .shared_compiled_dfa import SharedCompiledDFA
+from .levenshtein import LevenshteinAutomaton, fuzzy_dfa, fuzzy_lookup
@@ -0,0 +1,169 @@
+from __future__ import annotations
+from ast import literal_eval
+import importlib.util
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, TypeVar
+
+if TYPE_CHECKING:
+    from .compiled_dfa import BaseCompiledDFA
+
+U = TypeVar('U')
+
+# States with more distinct symbols than this dispatch on a dictionary rather
+# than a match statement, whose cases are tried one by one
+MAX_MATCH_SYMBOLS = 8
+
+def generate_matcher_source(compiled: BaseCompiledDFA[U], function_name: str = 'matches',
+                            max_match_symbols: int = MAX_MATCH_SYMBOLS) -> str:
+    '''
+    Generates the source of a Python module defining a function that tests
+    if a sequence of symbols is accepted by a compiled DFA.
+
+    Each state becomes its own loop, which consumes symbols for as long as
+    they lead back to the state, so the state is only dispatched on when it
+    changes, through a binary search over the state numbers. The transitions
+    of a state are a match statement on the symbol, or a dictionary lookup
+    for states with many symbols. Transitions to dead states return False
+    right away, and whether each state accepts is inlined where its loop runs
+    out of input. Symbols must be literals, like strings or integers, so the
+    source can be written to a file
+    '''
+
+    for symbol in compiled.symbol_columns:
+        if not is_literal(symbol):
+            raise Exception(f'Symbol {symbol!r} cannot be written as a Python literal')
+
+    tables: List[str] = []
+    bodies: Dict[int, List[str]] = {}
+
+    for state in range(compiled.num_states):
+        if compiled.dead[state]:
+            continue
+
+        # Group the symbols by the live state they lead to. Any other symbol
+        # leads to a dead state
+        symbols_to: Dict[int, List[U]] = {}
+
+        for symbol in compiled.symbol_columns:
+            next_state = compiled.step(state, symbol)
+
+            if not compiled.dead[next_state]:
+                symbols_to.setdefault(next_state, []).append(symbol)
+
+        if sum(len(symbols) for symbols in symbols_to.values()) <= max_match_symbols:
+            dispatch = match_dispatch(state, symbols_to)
+
+        else:
+            tables.append(f'_NEXT_{state} = {{' + ', '.join(f'{symbol!r}: {next_state}' for next_state, symbols
+                                                           in symbols_to.items() for symbol in symbols) + '}')
+            dispatch = dict_dispatch(state)
+
+        bodies[state] = [
+            'while index < length:',
+            '    symbol = string[index]',
+            '    index += 1',
+            *(f'    {line}' for line in dispatch),
+            '    break',
+            'else:',
+            f'    return {compiled.accepting[state] == 1}',
+        ]
+
+    lines = [
+        f'def {function_name}(string):',
+        '    index, length = 0, len(string)',
+        '    state = 0',
+        '',
+        '    while True:',
+        *(f'        {line}' for line in state_dispatch(sorted(bodies), bodies)),
+    ]
+
+    return '\n'.join(tables + ([''] if len(tables) > 0 else []) + lines) + '\n'
+
+def state_dispatch(states: List[int], bodies: Dict[int, List[str]]) -> List[str]:
+    '''
+    Generates a binary search over the current state, reaching the body of
+    each state in a logarithmic number of comparisons
+    '''
+
+    # Only reached if the start state is dead
+    if len(states) == 0:
+        return ['return False']
+
+    if len(states) == 1:
+        return bodies[states[0]]
+
+    middle = len(states) // 2
+
+    return [
+        f'if state < {states[middle]}:',
+        *(f'    {line}' for line in state_dispatch(states[:middle], bodies)),
+        'else:',
+        *(f'    {line}' for line in state_dispatch(states[middle:], bodies)),
+    ]
+
+def match_dispatch(state: int, symbols_to: Dict[int, List]) -> List[str]:
+    '''
+    Generates the transitions of a state as a match statement
+    '''
+
+    lines = ['match symbol:']
+
+    # Check the self loop first, since it is taken most often
+    for next_state in sorted(symbols_to, key=lambda next_state: next_state != state):
+        lines.append('    case ' + ' | '.join(repr(symbol) for symbol in symbols_to[next_state]) + ':')
+        lines.append('        continue' if next_state == state else f'        state = {next_state}')
+
+    lines.append('    case _:')
+    lines.append('        return False')
+
+    return lines
+
+def dict_dispatch(state: int) -> List[str]:
+    '''
+    Generates the transitions of a state as a lookup in the dictionary of
+    its transitions
+    '''
+
+    return [
+        f'next_state = _NEXT_{state}.get(symbol, -1)',
+        f'if next_state == {state}:',
+        '    continue',
+        'if next_state < 0:',
+        '    return False',
+        'state = next_state',
+    ]
+
+def is_literal(symbol) -> bool:
+    '''
+    Determines if a symbol is written back exactly by its repr
+    '''
+
+    try:
+        value = literal_eval(repr(symbol))
+
+    except (ValueError, SyntaxError):
+        return False
+
+    return type(value) is type(symbol) and value == symbol
+
+def load_matcher(source: str, function_name: str = 'matches', path: Optional[str] = None
+                 ) -> Callable[[Sequence], bool]:
+    '''
+    Loads the matcher function from generated source. The source is compiled
+    in memory, unless a path is given, in which case it is written there and
+    imported as a module, so it can be inspected, cached or shipped
+    '''
+
+    if path is None:
+        namespace = {}
+        exec(compile(source, f'<generated {function_name}>', 'exec'), namespace)
+
+        return namespace[function_name]
+
+    with open(path, 'w') as file:
+        file.write(source)
+
+    spec = importlib.util.spec_from_file_location(function_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return getattr(module, function_name)
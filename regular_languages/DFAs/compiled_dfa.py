@@ -0,0 +1,361 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass, field
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from regular_languages.helpers import PartitionRefinement
+
+if TYPE_CHECKING:
+    from .dfa import DFA
+
+U = TypeVar('U')
+
+# A row of a compiled table: the state most columns lead to, and the columns
+# that lead anywhere else
+SparseRow = Tuple[int, Dict[int, int]]
+
+@dataclass
+class BaseCompiledDFA(ABC, Generic[U]):
+    '''
+    The matching interface shared by the compiled forms of a DFA. States are
+    renumbered to integers in breadth-first order, so the start state is
+    always 0.
+
+    Symbols that lead to the same state from every state are equivalent, so
+    each class of equivalent symbols shares a single column of the table.
+    Real alphabets, like bytes or the tokens of a lexer, tend to have far
+    fewer classes than symbols, so the table is much smaller than one column
+    per symbol would be.
+
+    The last column is used for every symbol outside the alphabet. It leads
+    to a dead state, or back to the start state for automata that search for
+    matches anywhere in the input. Subclasses decide how the table is stored
+    '''
+
+    # Maps from each symbol in the alphabet to the column of its class
+    symbol_columns: Dict[U, int]
+
+    # The number of columns, including the column for unknown symbols
+    num_columns: int
+
+    # Whether each state is an accept state (1) or not (0)
+    accepting: Sequence[int] = field(kw_only=True)
+
+    # Whether each state can never reach an accept state (1) or not (0)
+    dead: Sequence[int] = field(kw_only=True)
+
+    # Maps from each byte to its column, if the alphabet is made of bytes
+    # (integers from 0 to 255), to simulate bytes without a dictionary lookup
+    byte_columns: Optional[Sequence[int]] = field(default=None, kw_only=True)
+
+    @staticmethod
+    def _compile_rows(dfa: DFA[object, U], restart_on_unknown_symbol: bool
+                      ) -> Tuple[Dict[U, int], int, List[SparseRow], bytes]:
+        '''
+        Compiles the states of a DFA reachable from its start state to sparse
+        rows over the columns of the symbol classes. Returns the column of
+        each symbol, the number of columns, the rows and the accept states.
+
+        Symbols outside the alphabet lead to an extra dead state, or to the
+        start state if restart_on_unknown_symbol is set. Only the transitions
+        that do not lead to the default state of their row are ever stored
+        '''
+
+        symbols = list(dfa.alphabet)
+        pr = PartitionRefinement.from_set(set(range(len(symbols))))
+
+        # Number the states in breadth-first order from the start state
+        state_index = {dfa.start_state: 0}
+        states = [dfa.start_state]
+        symbol_rows: List[SparseRow] = []
+
+        for state in states:
+            targets = []
+
+            for symbol in symbols:
+                next_state = dfa.transition_function(state, symbol)
+
+                if next_state not in state_index:
+                    state_index[next_state] = len(states)
+                    states.append(next_state)
+
+                targets.append(state_index[next_state])
+
+            default = Counter(targets).most_common(1)[0][0] if len(targets) > 0 else None
+            symbols_to = defaultdict(set)
+
+            for index, next_state in enumerate(targets):
+                if next_state != default:
+                    symbols_to[next_state].add(index)
+
+            # Refine the symbol classes with the symbols leading to each
+            # state, which leaves the symbols leading to the default together
+            for symbol_set in symbols_to.values():
+                pr.refine(symbol_set)
+
+            symbol_rows.append((default, {index: next_state for next_state, symbol_set in symbols_to.items()
+                                          for index in symbol_set}))
+
+        # Keep a column for each class, ordered by their first symbol
+        classes = sorted(sorted(symbol_class) for symbol_class in pr.sets if len(symbol_class) > 0)
+        symbol_columns = {symbols[index]: column for column, symbol_class in enumerate(classes)
+                          for index in symbol_class}
+        num_columns = len(classes) + 1
+        unknown_column = num_columns - 1
+
+        # Add a sink state for symbols outside the alphabet
+        sink = len(states)
+        unknown_target = 0 if restart_on_unknown_symbol else sink
+
+        rows: List[SparseRow] = []
+        for default, entries in symbol_rows:
+            default = unknown_target if default is None else default
+            row_entries = {symbol_columns[symbols[index]]: next_state for index, next_state in entries.items()}
+
+            if unknown_target != default:
+                row_entries[unknown_column] = unknown_target
+
+            rows.append((default, row_entries))
+
+        rows.append((sink, {}))
+
+        accepting = bytes(state in dfa.accept_states for state in states) + b'\x00'
+
+        return symbol_columns, num_columns, rows, accepting
+
+    @staticmethod
+    def _build_byte_columns(symbol_columns: Dict[U, int], num_columns: int) -> Optional[Sequence[int]]:
+        '''
+        Builds the column lookup array for every byte, if every symbol is a
+        byte
+        '''
+
+        if len(symbol_columns) == 0 or not all(type(symbol) is int and 0 <= symbol < 256
+                                                for symbol in symbol_columns):
+            return None
+
+        return array('i', (symbol_columns.get(byte, num_columns - 1) for byte in range(256)))
+
+    @staticmethod
+    def _find_dead_states(edges: Iterable[Tuple[int, int]], accepting: bytes) -> bytes:
+        '''
+        Finds the states that cannot reach an accept state, by flooding the
+        reversed transitions backwards from the accept states
+        '''
+
+        num_states = len(accepting)
+        predecessors = [[] for _ in range(num_states)]
+
+        for state, next_state in edges:
+            predecessors[next_state].append(state)
+
+        live = bytearray(accepting)
+        queue = [state for state in range(num_states) if accepting[state]]
+
+        while len(queue) > 0:
+            state = queue.pop()
+
+            for prev_state in predecessors[state]:
+                if not live[prev_state]:
+                    live[prev_state] = 1
+                    queue.append(prev_state)
+
+        return bytes(1 - is_live for is_live in live)
+
+    @property
+    def num_states(self) -> int:
+        return len(self.accepting)
+
+    @property
+    def num_classes(self) -> int:
+        '''
+        The number of classes of equivalent symbols, not counting the column
+        for symbols outside the alphabet
+        '''
+
+        return self.num_columns - 1
+
+    def column(self, symbol: U) -> int:
+        '''
+        Returns the column of the table used for the given symbol
+        '''
+
+        return self.symbol_columns.get(symbol, self.num_columns - 1)
+
+    @classmethod
+    @abstractmethod
+    def from_DFA(cls, dfa: DFA[object, U], restart_on_unknown_symbol: bool = False):
+        '''
+        Compiles the states of a DFA reachable from its start state to the
+        layout of the subclass
+        '''
+
+    @abstractmethod
+    def transition(self, state: int, column: int) -> int:
+        '''
+        Looks up the state reached from the given state on a column
+        '''
+
+    def step(self, state: int, symbol: U) -> int:
+        '''
+        Computes the state reached from the given state on a single symbol
+        '''
+
+        return self.transition(state, self.column(symbol))
+
+    def columns_of(self, test_string: Sequence[U]) -> Iterable[int]:
+        '''
+        Maps each symbol of a string to its column
+        '''
+
+        if self.byte_columns is not None and isinstance(test_string, (bytes, bytearray, memoryview)):
+            return map(self.byte_columns.__getitem__, test_string)
+
+        get_column, unknown_column = self.symbol_columns.get, self.num_columns - 1
+
+        return (get_column(symbol, unknown_column) for symbol in test_string)
+
+    def simulate(self, test_string: Sequence[U], start_state: int = 0) -> int:
+        '''
+        Simulates the compiled DFA, returning the resulting state
+        '''
+
+        transition = self.transition
+        state = start_state
+
+        for column in self.columns_of(test_string):
+            state = transition(state, column)
+
+        return state
+
+    def test(self, test_string: Sequence[U]) -> bool:
+        '''
+        Tests if the given string is accepted by the compiled DFA
+        '''
+
+        return self.accepting[self.simulate(test_string)] == 1
+
+    def test_parallel(self, buffer: bytes | bytearray | memoryview, workers: Optional[int] = None) -> bool:
+        '''
+        Tests if a large buffer of bytes is accepted, simulating chunks of it
+        across a pool of worker processes
+        '''
+
+        from .parallel_simulation import simulate_parallel
+
+        return self.accepting[simulate_parallel(self, buffer, max_workers=workers)] == 1
+
+    def share(self, path: Optional[str] = None):
+        '''
+        Copies the tables into shared memory, or into a file at the given
+        path, returning a handle that worker processes can attach to
+        '''
+
+        from .shared_compiled_dfa import SharedCompiledDFA
+
+        return SharedCompiledDFA.create(self, path)
+
+    def longest_prefix(self, text: Sequence[U], start: int = 0, end: int | None = None) -> int:
+        '''
+        Returns the end index of the longest prefix of text[start:end] that
+        is accepted, or -1 if no prefix is accepted. Stops as soon as the
+        simulation reaches a dead state
+        '''
+
+        transition, accepting, dead = self.transition, self.accepting, self.dead
+        end = len(text) if end is None else end
+
+        state = 0
+        longest = start if accepting[state] else -1
+
+        for index, column in enumerate(self.columns_of(text[start:end]), start):
+            state = transition(state, column)
+
+            if dead[state]:
+                break
+
+            if accepting[state]:
+                longest = index + 1
+
+        return longest
+
+@dataclass
+class CompiledDFA(BaseCompiledDFA[U]):
+    '''
+    A DFA compiled to a flat, dense transition table, for fast simulation
+    '''
+
+    # The next state for each state and column, at state * num_columns + column
+    table: Sequence[int]
+
+    @classmethod
+    def from_DFA(cls, dfa: DFA[object, U], restart_on_unknown_symbol: bool = False):
+        '''
+        Compiles the states of a DFA reachable from its start state. Symbols
+        outside the alphabet lead to an extra dead state, or to the start
+        state if restart_on_unknown_symbol is set
+        '''
+
+        symbol_columns, num_columns, rows, accepting = cls._compile_rows(dfa, restart_on_unknown_symbol)
+
+        table = array('i')
+        for default, entries in rows:
+            table.extend(entries.get(column, default) for column in range(num_columns))
+
+        dead = cls._find_dead_states(((index // num_columns, next_state) for index, next_state in enumerate(table)),
+                                     accepting)
+
+        return cls(symbol_columns, num_columns, table, accepting=accepting, dead=dead,
+                   byte_columns=cls._build_byte_columns(symbol_columns, num_columns))
+
+    def transition(self, state: int, column: int) -> int:
+        return self.table[state * self.num_columns + column]
+
+    def simulate(self, test_string: Sequence[U], start_state: int = 0) -> int:
+        '''
+        Simulates the compiled DFA, returning the resulting state
+        '''
+
+        table, num_columns = self.table, self.num_columns
+        get_column, unknown_column = self.symbol_columns.get, self.num_columns - 1
+        state = start_state
+
+        if self.byte_columns is not None and isinstance(test_string, (bytes, bytearray, memoryview)):
+            byte_columns = self.byte_columns
+
+            for byte in test_string:
+                state = table[state * num_columns + byte_columns[byte]]
+
+            return state
+
+        for symbol in test_string:
+            state = table[state * num_columns + get_column(symbol, unknown_column)]
+
+        return state
+
+    def longest_prefix(self, text: Sequence[U], start: int = 0, end: int | None = None) -> int:
+        '''
+        Returns the end index of the longest prefix of text[start:end] that
+        is accepted, or -1 if no prefix is accepted. Stops as soon as the
+        simulation reaches a dead state
+        '''
+
+        table, num_columns, accepting, dead = self.table, self.num_columns, self.accepting, self.dead
+        get_column, unknown_column = self.symbol_columns.get, self.num_columns - 1
+        end = len(text) if end is None else end
+
+        state = 0
+        longest = start if accepting[state] else -1
+
+        for index in range(start, end):
+            state = table[state * num_columns + get_column(text[index], unknown_column)]
+
+            if dead[state]:
+                break
+
+            if accepting[state]:
+                longest = index + 1
+
+        return longest
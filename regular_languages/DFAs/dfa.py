@@ -2,7 +2,10 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from enum import Enum, auto
 from itertools import product
-from typing import Callable, Dict, Generic, List, Set, TypeAlias, TypeVar
+from typing import Callable, Dict, Generic, List, Optional, Sequence, Set, TypeAlias, TypeVar
+
+from .compiled_dfa import BaseCompiledDFA, CompiledDFA
+from .sparse_compiled_dfa import SparseCompiledDFA
 
 T = TypeVar('T')
 U = TypeVar('U')
@@ -20,6 +23,13 @@ class DFASpecialStates(Enum):
 
     DEAD = auto()
 
+class LanguageSize(Enum):
+    '''
+    The size of a language that is not a number of strings
+    '''
+
+    INFINITE = auto()
+
 @dataclass
 class DFA(Generic[T, U]):
     '''
@@ -125,6 +135,20 @@ class DFA(Generic[T, U]):
         # We can't use classmethod because subclasses could restrict non-int states
         return DFA.from_transition_map(transition_map, 0, accept_states)
 
+    @staticmethod
+    def from_words(words: Iterable[Sequence[U]]):
+        '''
+        Constructs the minimal DFA that accepts exactly the given words, which
+        must be sorted, in a single pass over them. This is far cheaper than
+        minimizing the DFA of the union of the words, for very many words
+        '''
+
+        from .word_automaton import minimal_acyclic_transitions
+
+        transition_list, accept_states = minimal_acyclic_transitions(words)
+
+        return DFA.from_transition_list(transition_list, accept_states)
+
     def simulate(self, test_string: Iterable[U], start_state=None) -> T:
         '''
         Simulates the DFA, returning the resulting state. This is the extended
@@ -145,6 +169,50 @@ class DFA(Generic[T, U]):
 
         return self.simulate(test_string) in self.accept_states
 
+    def compile(self, restart_on_unknown_symbol: bool = False, sparse: bool = False) -> BaseCompiledDFA[U]:
+        '''
+        Compiles the states reachable from the start state to a flat
+        transition table, which is much faster to simulate. A sparse table
+        only stores the transitions that do not lead to the most common next
+        state of their state, for automata too large for a dense table
+        '''
+
+        if sparse:
+            return SparseCompiledDFA.from_DFA(self, restart_on_unknown_symbol)
+
+        return CompiledDFA.from_DFA(self, restart_on_unknown_symbol)
+
+    def test_parallel(self, buffer: bytes | bytearray | memoryview, workers: Optional[int] = None) -> bool:
+        '''
+        Tests if a large buffer of bytes is accepted by the DFA, whose
+        symbols are the integers from 0 to 255. The DFA is compiled, and
+        chunks of the buffer are simulated across a pool of worker processes
+        '''
+
+        return self.compile().test_parallel(buffer, workers)
+
+    def codegen(self, function_name: str = 'matches') -> str:
+        '''
+        Generates the source of a Python module with a function specialized
+        to test strings against the minimized DFA
+        '''
+
+        from regular_languages.operators import minimize_dfa
+        from .codegen import generate_matcher_source
+
+        return generate_matcher_source(minimize_dfa(self).compile(), function_name)
+
+    def to_python_matcher(self, path: Optional[str] = None) -> Callable[[Sequence[U]], bool]:
+        '''
+        Generates and loads a Python function specialized to test strings
+        against the DFA. If a path is given, the generated module is written
+        there and imported from disk
+        '''
+
+        from .codegen import load_matcher
+
+        return load_matcher(self.codegen(), path=path)
+
     def drop_disconnected(self):
         '''
         Returns an equivalent DFA with with states that are not reachable from
@@ -259,13 +327,68 @@ class DFA(Generic[T, U]):
         pass
 
 
-    def size(self) -> int:
+    def live_states(self) -> Set[T]:
+        '''
+        Finds the states that can reach an accept state, by flooding the
+        reversed transitions backwards from the accept states
+        '''
+
+        predecessors: Dict[T, Set[T]] = {state: set() for state in self.states}
+        for state, symbol in product(self.states, self.alphabet):
+            predecessors[self.transition_function(state, symbol)].add(state)
+
+        live = set(self.accept_states)
+        queue = list(live)
+
+        while len(queue) > 0:
+            for prev_state in predecessors[queue.pop()]:
+                if prev_state not in live:
+                    live.add(prev_state)
+                    queue.append(prev_state)
+
+        return live
+
+    def size(self) -> int | LanguageSize:
         '''
         Returns the number of strings accepted by the DFA, or a special enum
-        value if the DFA has infinite size
+        value if the DFA has infinite size.
+
+        Only the states on some path from the start state to an accept state
+        matter. The language is infinite if those states have a cycle, and
+        otherwise the strings are counted along the paths in post-order
         '''
 
-        raise NotImplementedError
+        live = self.live_states()
+
+        if self.start_state not in live:
+            return 0
+
+        # Count the strings accepted from each live state, with an explicit
+        # stack. A state seen again while it is still on the stack is a cycle
+        counts: Dict[T, int] = {}
+        on_stack = {self.start_state}
+        stack = [(self.start_state, iter(self.alphabet))]
+
+        while len(stack) > 0:
+            state, symbols = stack[-1]
+            next_state = next((next_state for next_state in map(lambda symbol: self.transition_function(state, symbol), symbols)
+                               if next_state in live and next_state not in counts), None)
+
+            if next_state is None:
+                stack.pop()
+                on_stack.remove(state)
+                counts[state] = int(state in self.accept_states) + sum(
+                    counts[self.transition_function(state, symbol)] for symbol in self.alphabet
+                    if self.transition_function(state, symbol) in live)
+
+            elif next_state in on_stack:
+                return LanguageSize.INFINITE
+
+            else:
+                on_stack.add(next_state)
+                stack.append((next_state, iter(self.alphabet)))
+
+        return counts[self.start_state]
 
     def asJSON(self) -> str:
         '''
@@ -0,0 +1,129 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Generic, Iterable, List, TypeVar
+
+if TYPE_CHECKING:
+    from .compiled_dfa import BaseCompiledDFA
+    from .dfa import DFA
+
+U = TypeVar('U')
+
+@dataclass
+class IncrementalMatcher(Generic[U]):
+    '''
+    Keeps track of whether a compiled DFA accepts a text that is edited over
+    time, without simulating the whole text after every edit.
+
+    The state of the simulation is stored at checkpoints, about every spacing
+    symbols. An edit only invalidates the checkpoints after it, so it is
+    simulated from the checkpoint before it. At each later checkpoint, the
+    new state is compared with the stored one, and once they agree the rest
+    of the simulation is known to be unchanged, so an edit costs about the
+    size of the edit plus the spacing rather than the size of the text
+    '''
+
+    compiled: BaseCompiledDFA[U]
+    text: List[U]
+    spacing: int = 1024
+
+    # The positions of the checkpoints, in increasing order, and the state of
+    # the simulation before the symbol at each position. The first
+    # checkpoint is at the start of the text
+    positions: List[int] = field(default_factory=list, init=False, repr=False)
+    states: List[int] = field(default_factory=list, init=False, repr=False)
+
+    # The state of the simulation at the end of the text
+    final_state: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        if self.spacing < 1:
+            raise Exception(f'The checkpoint spacing must be positive, not {self.spacing}')
+
+        self.text = list(self.text)
+        self.positions, self.states = [0], [0]
+        self.final_state = self._advance(0, len(self.text), 0)
+
+    @classmethod
+    def from_DFA(cls, dfa: DFA[object, U], text: Iterable[U], spacing: int = 1024):
+        return cls(dfa.compile(), list(text), spacing)
+
+    @property
+    def accepted(self) -> bool:
+        '''
+        Whether the DFA accepts the current text
+        '''
+
+        return self.compiled.accepting[self.final_state] == 1
+
+    def _advance(self, position: int, target: int, state: int) -> int:
+        '''
+        Simulates the text from a position up to a target position, adding a
+        checkpoint every spacing symbols along the way. Returns the state
+        reached at the target
+        '''
+
+        while target - position > self.spacing:
+            state = self.compiled.simulate(self.text[position:position + self.spacing], state)
+            position += self.spacing
+
+            self.positions.append(position)
+            self.states.append(state)
+
+        return self.compiled.simulate(self.text[position:target], state)
+
+    def edit(self, start: int, end: int, replacement: Iterable[U]) -> bool:
+        '''
+        Replaces the symbols of the text from start to end with the
+        replacement, and returns whether the DFA accepts the edited text
+        '''
+
+        if not 0 <= start <= end <= len(self.text):
+            raise Exception(f'Invalid range of the text to edit: {start} to {end}')
+
+        replacement = list(replacement)
+        shift = len(replacement) - (end - start)
+        self.text[start:end] = replacement
+
+        # The checkpoints up to the start of the edit are unaffected. The
+        # ones after it keep their states, at shifted positions, until the
+        # simulation shows otherwise
+        resume = bisect_right(self.positions, start) - 1
+        after = max(bisect_left(self.positions, end), resume + 1)
+
+        # A deletion can move a later checkpoint onto the one resumed from
+        if after < len(self.positions) and self.positions[after] + shift <= self.positions[resume]:
+            after += 1
+
+        later_positions = [position + shift for position in self.positions[after:]]
+        later_states = self.states[after:]
+
+        del self.positions[resume + 1:]
+        del self.states[resume + 1:]
+
+        position, state = self.positions[resume], self.states[resume]
+
+        for index, (later_position, later_state) in enumerate(zip(later_positions, later_states)):
+            state = self._advance(position, later_position, state)
+            position = later_position
+
+            # The simulation has resynchronized, so the remaining checkpoints
+            # and the final state are still correct
+            if state == later_state:
+                self.positions.extend(later_positions[index:])
+                self.states.extend(later_states[index:])
+
+                return self.accepted
+
+            self.positions.append(position)
+            self.states.append(state)
+
+        self.final_state = self._advance(position, len(self.text), state)
+
+        return self.accepted
+
+    def insert(self, position: int, symbols: Iterable[U]) -> bool:
+        return self.edit(position, position, symbols)
+
+    def delete(self, start: int, end: int) -> bool:
+        return self.edit(start, end, [])
@@ -0,0 +1,190 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from .compiled_dfa import BaseCompiledDFA
+
+if TYPE_CHECKING:
+    from .dfa import DFA
+
+U = TypeVar('U')
+
+# A state of a Levenshtein automaton: the positions (number of symbols of the
+# word consumed, number of edits made) it may be in, after removing the
+# positions subsumed by others
+LevenshteinState = FrozenSet[Tuple[int, int]]
+
+class LevenshteinAutomaton:
+    '''
+    Steps through the DFA accepting every string within an edit distance of a
+    word, without building it up front.
+
+    A state is a set of positions in the word, each with the number of edits
+    made to reach it. Positions are kept relative to the leftmost one, which
+    gives the parametric form of the state: its transitions only depend on
+    which of the nearby symbols of the word match the symbol read, so they are
+    computed once per parametric state and vector of matches, and reused at
+    every offset of the word
+    '''
+
+    def __init__(self, word: Sequence[U], max_distance: int):
+        if max_distance < 0:
+            raise Exception(f'The maximum edit distance must not be negative, not {max_distance}')
+
+        self.word = word
+        self.max_distance = max_distance
+
+        # Maps from each parametric state, number of symbols left in the word
+        # and vector of matches to the parametric next state and its offset
+        self.parametric_transitions: Dict[Tuple, Tuple[LevenshteinState, int]] = {}
+
+        self.start: LevenshteinState = frozenset({(0, 0)})
+
+    @staticmethod
+    def reduce(positions: Set[Tuple[int, int]]) -> LevenshteinState:
+        '''
+        Drops the positions subsumed by another position, which has fewer
+        edits and can reach anything the position can with its spare edits
+        '''
+
+        return frozenset(
+            (index, edits) for index, edits in positions
+            if not any(other_edits < edits and edits - other_edits >= abs(index - other_index)
+                       for other_index, other_edits in positions)
+        )
+
+    def step(self, state: LevenshteinState, symbol: U) -> LevenshteinState:
+        if len(state) == 0:
+            return state
+
+        offset = min(index for index, _ in state)
+        span = max(index for index, _ in state) - offset + 1
+
+        parametric_state = frozenset((index - offset, edits) for index, edits in state)
+        remaining = min(len(self.word) - offset, span + self.max_distance)
+        matches = tuple(self.word[offset + index] == symbol for index in range(remaining))
+
+        key = (parametric_state, remaining, matches)
+
+        if key not in self.parametric_transitions:
+            self.parametric_transitions[key] = self.parametric_step(parametric_state, remaining, matches)
+
+        next_state, next_offset = self.parametric_transitions[key]
+
+        return frozenset((index + offset + next_offset, edits) for index, edits in next_state)
+
+    def parametric_step(self, state: LevenshteinState, remaining: int, matches: Tuple[bool, ...]
+                        ) -> Tuple[LevenshteinState, int]:
+        '''
+        Steps a parametric state, given the vector of which symbols of the
+        word match the symbol read, up to the furthest symbol the state can
+        reach
+        '''
+
+        positions = set()
+
+        for index, edits in state:
+            if index < remaining and matches[index]:
+                positions.add((index + 1, edits))
+                continue
+
+            if edits == self.max_distance:
+                continue
+
+            # Inserting the symbol, or substituting it for the next symbol of
+            # the word
+            positions.add((index, edits + 1))
+
+            if index < remaining:
+                positions.add((index + 1, edits + 1))
+
+            # Deleting symbols of the word up to the next one that matches.
+            # Matching any later one is subsumed by this
+            for deleted in range(1, min(self.max_distance - edits, remaining - index - 1) + 1):
+                if matches[index + deleted]:
+                    positions.add((index + deleted + 1, edits + deleted))
+                    break
+
+        next_state = self.reduce(positions)
+
+        if len(next_state) == 0:
+            return next_state, 0
+
+        next_offset = min(index for index, _ in next_state)
+
+        return frozenset((index - next_offset, edits) for index, edits in next_state), next_offset
+
+    def distance(self, state: LevenshteinState) -> Optional[int]:
+        '''
+        Returns the smallest edit distance between the word and the string
+        leading to a state, or None if it is more than the maximum distance
+        '''
+
+        distances = [edits + len(self.word) - index for index, edits in state
+                     if edits + len(self.word) - index <= self.max_distance]
+
+        return min(distances, default=None)
+
+def fuzzy_dfa(word: Sequence[U], max_distance: int, alphabet: Optional[Set[U]] = None) -> DFA:
+    '''
+    Constructs the DFA that accepts every string within the given edit
+    distance of the word, over the symbols of the word and the alphabet
+    '''
+
+    from .dfa import DFA
+
+    automaton = LevenshteinAutomaton(word, max_distance)
+    alphabet = set(word).union(alphabet or set())
+
+    transition_map = {}
+    queue = [automaton.start]
+
+    while len(queue) > 0:
+        state = queue.pop()
+
+        if state in transition_map:
+            continue
+
+        transition_map[state] = {symbol: automaton.step(state, symbol) for symbol in alphabet}
+        queue.extend(next_state for next_state in transition_map[state].values() if next_state not in transition_map)
+
+    accept_states = {state for state in transition_map if automaton.distance(state) is not None}
+
+    return DFA.from_transition_map(transition_map, automaton.start, accept_states)
+
+def fuzzy_lookup(dictionary: DFA | BaseCompiledDFA[U], query: Sequence[U], max_distance: int) -> List[Sequence[U]]:
+    '''
+    Finds every word accepted by a dictionary DFA within the given edit
+    distance of the query, sorted.
+
+    The dictionary is walked in lockstep with the Levenshtein automaton of
+    the query, and a pair of states is pruned as soon as either can no longer
+    accept, so only the words that share a close enough prefix with the query
+    are ever visited. DFAs are compiled first to find their dead states, so
+    lookups against the same dictionary should pass it compiled
+    '''
+
+    compiled = dictionary if isinstance(dictionary, BaseCompiledDFA) else dictionary.compile()
+    automaton = LevenshteinAutomaton(query, max_distance)
+    symbol_columns = list(compiled.symbol_columns.items())
+
+    words = []
+    stack: List[Tuple[int, LevenshteinState, List[U]]] = [(0, automaton.start, [])]
+
+    while len(stack) > 0:
+        state, fuzzy_state, prefix = stack.pop()
+
+        if compiled.accepting[state] and automaton.distance(fuzzy_state) is not None:
+            words.append(''.join(prefix) if isinstance(query, str) else tuple(prefix))
+
+        for symbol, column in symbol_columns:
+            next_state = compiled.transition(state, column)
+
+            if compiled.dead[next_state]:
+                continue
+
+            next_fuzzy_state = automaton.step(fuzzy_state, symbol)
+
+            if len(next_fuzzy_state) > 0:
+                stack.append((next_state, next_fuzzy_state, prefix + [symbol]))
+
+    return sorted(words)
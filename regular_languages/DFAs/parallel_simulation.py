@@ -0,0 +1,126 @@
+from __future__ import annotations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .compiled_dfa import BaseCompiledDFA
+
+# The compiled DFA and the shared input each worker process simulates
+# against. They are sent to each worker once, when the worker starts
+_worker_dfa: Optional[BaseCompiledDFA] = None
+_worker_memory: Optional[SharedMemory] = None
+
+# The number of symbols the simulations of a chunk are stepped together
+# without merging, before each is finished on its own
+SYNC_WINDOW = 1024
+
+def _init_worker(compiled: BaseCompiledDFA, memory_name: str):
+    global _worker_dfa, _worker_memory
+    _worker_dfa = compiled
+    _worker_memory = SharedMemory(memory_name)
+
+def _map_chunk(bounds: Tuple[int, int, Optional[int]]) -> Sequence[int]:
+    '''
+    Simulates a chunk of the shared input in a worker process, returning the
+    state mapping of the chunk
+    '''
+
+    start, end, start_state = bounds
+
+    return chunk_state_mapping(_worker_dfa, _worker_memory.buf[start:end], start_state)
+
+def chunk_state_mapping(compiled: BaseCompiledDFA, chunk: Sequence, start_state: Optional[int] = None) -> Sequence[int]:
+    '''
+    Computes the state that simulating a chunk of input ends in, from every
+    state of a compiled DFA, or from only start_state if it is given. The
+    mapping is an array indexed by the state the simulation started in, with
+    -1 for the states it did not start from.
+
+    The simulations are run together, grouped by their current state. DFAs
+    tend to synchronize quickly, so the groups merge until a few simulations
+    remain, which each run at the speed of a plain simulation. States that
+    every symbol leads back to, like the sink state, are never simulated
+    '''
+
+    origins = range(compiled.num_states) if start_state is None else [start_state]
+    transition, num_columns = compiled.transition, compiled.num_columns
+    absorbing = {state for state in origins
+                 if all(transition(state, column) == state for column in range(num_columns))}
+
+    groups: Dict[int, List[int]] = {state: [state] for state in origins}
+    columns = iter(compiled.columns_of(chunk))
+    index = last_merge = 0
+
+    # Step the groups together while they keep merging
+    while len(groups) - len(absorbing.intersection(groups)) > 1 and index - last_merge < SYNC_WINDOW:
+        column = next(columns, None)
+
+        if column is None:
+            break
+
+        next_groups: Dict[int, List[int]] = {}
+
+        for state, group in groups.items():
+            next_state = state if state in absorbing else transition(state, column)
+            next_groups.setdefault(next_state, []).extend(group)
+
+        if len(next_groups) < len(groups):
+            last_merge = index
+
+        groups = next_groups
+        index += 1
+
+    mapping = array('i', [-1]) * compiled.num_states
+
+    for state, group in groups.items():
+        final_state = state if state in absorbing else compiled.simulate(chunk[index:], state)
+
+        for origin in group:
+            mapping[origin] = final_state
+
+    return mapping
+
+def simulate_parallel(compiled: BaseCompiledDFA, buffer: bytes | bytearray | memoryview, start_state: int = 0,
+                      max_workers: Optional[int] = None, chunks_per_worker: int = 4) -> int:
+    '''
+    Simulates a compiled DFA over a large buffer of bytes across a pool of
+    worker processes, returning the resulting state.
+
+    The buffer is copied once into shared memory and split into chunks. The
+    first chunk is simulated from the start state, and every other chunk
+    from every state, since the state it starts in is not known yet. Each
+    chunk gives a mapping from the state it starts in to the state it ends
+    in, and composing the mappings in order gives the resulting state
+    '''
+
+    workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+    num_chunks = workers * chunks_per_worker
+
+    if len(buffer) < num_chunks:
+        return compiled.simulate(buffer, start_state)
+
+    chunk_size = -(-len(buffer) // num_chunks)
+    bounds = [(start, min(start + chunk_size, len(buffer)), start_state if start == 0 else None)
+              for start in range(0, len(buffer), chunk_size)]
+
+    memory = SharedMemory(create=True, size=len(buffer))
+
+    try:
+        memory.buf[:len(buffer)] = buffer
+
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(compiled, memory.name)) as executor:
+            state = start_state
+
+            # Composing the mappings is associative, so they can be applied
+            # in order to the start state as they arrive
+            for mapping in executor.map(_map_chunk, bounds):
+                state = mapping[state]
+
+        return state
+
+    finally:
+        memory.close()
+        memory.unlink()
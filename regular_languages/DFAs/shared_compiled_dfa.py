@@ -0,0 +1,177 @@
+from __future__ import annotations
+from array import array
+import atexit
+from dataclasses import dataclass, fields
+import mmap
+import os
+from multiprocessing.shared_memory import SharedMemory
+import sys
+from typing import Dict, Generic, List, Optional, Tuple, Type, TypeVar
+
+from .compiled_dfa import BaseCompiledDFA
+
+U = TypeVar('U')
+
+# The attributes of a compiled DFA that are not tables
+TABLE_EXCLUDED_FIELDS = ('symbol_columns', 'num_columns')
+
+# Each table is placed at an offset that is a multiple of this
+TABLE_ALIGNMENT = 8
+
+# The compiled DFAs attached to in this process, with the memory and the
+# views of it they use, by the name of the shared memory or the path of the
+# file
+_attached: Dict[str, Tuple[object, List[memoryview], BaseCompiledDFA]] = {}
+
+@atexit.register
+def _detach_all():
+    '''
+    Releases the views of the attached memory before closing it, since
+    memory cannot be closed while views of it exist
+    '''
+
+    for memory, views, _ in _attached.values():
+        for view in reversed(views):
+            view.release()
+
+        memory.close()
+
+    _attached.clear()
+
+@dataclass(frozen=True)
+class SharedCompiledDFA(Generic[U]):
+    '''
+    A handle to the tables of a compiled DFA placed in shared memory, or in a
+    file that is mapped into memory. The handle is small and can be pickled,
+    so a parent process can compile a DFA once and send the handle to its
+    workers, which attach to the tables read-only, without copying them.
+
+    Shared memory is tracked by the resource tracker of the processes that
+    attach to it, which only works for workers started by the parent, like a
+    multiprocessing pool. Unrelated processes should share a file instead
+    '''
+
+    # The class of the compiled DFA, and its attributes that are not tables
+    compiled_type: Type[BaseCompiledDFA]
+    symbol_columns: Dict[U, int]
+    num_columns: int
+
+    # The name, array type code, byte offset and length of each table, or
+    # None for tables that were not built
+    tables: Tuple[Tuple[str, Optional[str], int, int], ...]
+
+    # The name of the shared memory, or the path of the file, holding the
+    # tables
+    memory_name: Optional[str]
+    path: Optional[str]
+
+    @classmethod
+    def create(cls, compiled: BaseCompiledDFA[U], path: Optional[str] = None):
+        '''
+        Copies the tables of a compiled DFA into new shared memory, or into a
+        new file at the given path. The creator must unlink the handle once
+        no process needs the tables anymore
+        '''
+
+        tables = []
+        size = 0
+
+        for table_field in fields(compiled):
+            if table_field.name in TABLE_EXCLUDED_FIELDS:
+                continue
+
+            table = getattr(compiled, table_field.name)
+
+            if table is None:
+                tables.append((table_field.name, None, 0, 0))
+                continue
+
+            typecode = table.typecode if isinstance(table, array) else 'B'
+            size = -(-size // TABLE_ALIGNMENT) * TABLE_ALIGNMENT
+            tables.append((table_field.name, typecode, size, len(table)))
+            size += len(table) * array(typecode).itemsize
+
+        # Neither shared memory nor a mapped file can be empty
+        size = max(size, 1)
+
+        if path is None:
+            memory = SharedMemory(create=True, size=size)
+            buffer = memory.buf
+
+        else:
+            with open(path, 'wb') as file:
+                file.truncate(size)
+
+            with open(path, 'r+b') as file:
+                memory = mmap.mmap(file.fileno(), size)
+
+            buffer = memoryview(memory)
+
+        for name, typecode, offset, length in tables:
+            if typecode is not None:
+                data = memoryview(getattr(compiled, name)).cast('B')
+                buffer[offset:offset + len(data)] = data
+
+                data.release()
+
+        buffer.release()
+        memory.close()
+
+        return cls(type(compiled), compiled.symbol_columns, compiled.num_columns, tuple(tables),
+                   memory.name if path is None else None, path)
+
+    @property
+    def key(self) -> str:
+        return self.memory_name if self.path is None else self.path
+
+    def attach(self) -> BaseCompiledDFA[U]:
+        '''
+        Builds a compiled DFA whose tables are read-only views of the shared
+        tables. Attaching again in the same process returns the same DFA
+        '''
+
+        if self.key in _attached:
+            return _attached[self.key][2]
+
+        if self.path is None:
+            # Before Python 3.13, attaching always registers the memory with
+            # the resource tracker, which pools share with their parent
+            if sys.version_info >= (3, 13):
+                memory = SharedMemory(self.memory_name, track=False)
+
+            else:
+                memory = SharedMemory(self.memory_name)
+
+            buffer = memory.buf.toreadonly()
+
+        else:
+            with open(self.path, 'rb') as file:
+                memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            buffer = memoryview(memory)
+
+        table_views = {
+            name: None if typecode is None else
+                  buffer[offset:offset + length * array(typecode).itemsize].cast(typecode)
+            for name, typecode, offset, length in self.tables
+        }
+
+        compiled = self.compiled_type(symbol_columns=self.symbol_columns, num_columns=self.num_columns, **table_views)
+        views = [buffer, *(view for view in table_views.values() if view is not None)]
+        _attached[self.key] = (memory, views, compiled)
+
+        return compiled
+
+    def unlink(self):
+        '''
+        Frees the shared memory, or deletes the file. Processes that already
+        attached keep their view of the tables
+        '''
+
+        if self.path is None:
+            memory = SharedMemory(self.memory_name)
+            memory.close()
+            memory.unlink()
+
+        else:
+            os.remove(self.path)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Sequence, Tuple, TypeVar
+
+from .compiled_dfa import BaseCompiledDFA, SparseRow
+
+if TYPE_CHECKING:
+    from .dfa import DFA
+
+U = TypeVar('U')
+
+@dataclass
+class SparseCompiledDFA(BaseCompiledDFA[U]):
+    '''
+    A DFA compiled to a table compressed by row displacement, as in classic
+    scanner generators. Each state has a default next state, which most of
+    its columns lead to, and only the other transitions are stored.
+
+    The stored transitions of every row are overlaid in the shared next and
+    check arrays, each row displaced by its base so that its entries land in
+    free slots. The transition of state s on column c is next[base[s] + c] if
+    check[base[s] + c] == s, and default[s] otherwise, so lookups stay
+    constant time while the memory is proportional to the stored transitions
+    '''
+
+    # The next state of each state for the columns that are not stored
+    default: Sequence[int]
+
+    # The offset of the entries of each state in the next and check arrays
+    base: Sequence[int]
+
+    # The next state for each stored transition
+    next: Sequence[int]
+
+    # The state that owns each slot of the next array, or -1 for free slots
+    check: Sequence[int]
+
+    @classmethod
+    def from_DFA(cls, dfa: DFA[object, U], restart_on_unknown_symbol: bool = False):
+        '''
+        Compiles the states of a DFA reachable from its start state. Symbols
+        outside the alphabet lead to an extra dead state, or to the start
+        state if restart_on_unknown_symbol is set
+        '''
+
+        symbol_columns, num_columns, rows, accepting = cls._compile_rows(dfa, restart_on_unknown_symbol)
+        base, next, check = pack_rows(rows, num_columns)
+        default = array('i', (row_default for row_default, _ in rows))
+
+        edges = ((state, next_state) for state, (row_default, entries) in enumerate(rows)
+                 for next_state in (row_default, *entries.values()))
+        dead = cls._find_dead_states(edges, accepting)
+
+        return cls(symbol_columns, num_columns, default, base, next, check, accepting=accepting, dead=dead,
+                   byte_columns=cls._build_byte_columns(symbol_columns, num_columns))
+
+    @property
+    def num_stored_transitions(self) -> int:
+        return sum(1 for owner in self.check if owner != -1)
+
+    def transition(self, state: int, column: int) -> int:
+        index = self.base[state] + column
+
+        return self.next[index] if self.check[index] == state else self.default[state]
+
+    def simulate(self, test_string: Sequence[U], start_state: int = 0) -> int:
+        '''
+        Simulates the compiled DFA, returning the resulting state
+        '''
+
+        default, base, next, check = self.default, self.base, self.next, self.check
+        state = start_state
+
+        for column in self.columns_of(test_string):
+            index = base[state] + column
+            state = next[index] if check[index] == state else default[state]
+
+        return state
+
+def pack_rows(rows: List[SparseRow], num_columns: int) -> Tuple[Sequence[int], Sequence[int], Sequence[int]]:
+    '''
+    Overlays the stored entries of the rows in a single pair of next and
+    check arrays, placing each row at the first base where all its entries
+    land in free slots. Returns the base, next and check arrays.
+
+    The arrays are padded so that base[s] + c is within them for every state
+    and column, so lookups need no bounds check
+    '''
+
+    base = array('i', [0]) * len(rows)
+    next = array('i')
+    check = array('i')
+
+    # Every slot before this one is taken
+    first_free = 0
+
+    for state, (_, entries) in enumerate(rows):
+        if len(entries) == 0:
+            continue
+
+        columns = sorted(entries)
+        offset = max(first_free - columns[0], 0)
+
+        while any(offset + column < len(check) and check[offset + column] != -1 for column in columns):
+            offset += 1
+
+        if offset + columns[-1] >= len(check):
+            padding = offset + columns[-1] + 1 - len(check)
+            next.extend([0] * padding)
+            check.extend([-1] * padding)
+
+        for column in columns:
+            next[offset + column] = entries[column]
+            check[offset + column] = state
+
+        base[state] = offset
+
+        while first_free < len(check) and check[first_free] != -1:
+            first_free += 1
+
+    next.extend([0] * num_columns)
+    check.extend([-1] * num_columns)
+
+    return base, next, check
@@ -0,0 +1,104 @@
+from typing import Dict, Hashable, Iterable, List, Sequence, Set, Tuple, TypeVar
+
+U = TypeVar('U')
+
+def minimal_acyclic_transitions(words: Iterable[Sequence[U]]) -> Tuple[List[Dict[U, int]], Set[int]]:
+    '''
+    Builds the minimal DFA accepting exactly the given words, which must be
+    sorted, with Daciuk's incremental algorithm. Returns the transition list,
+    with the start state at 0, and the accept states.
+
+    Since the words are sorted, once a word is added, the states along the
+    part of the previous word it does not share can never change again, so
+    they are merged with an equivalent state already built, or registered as
+    new. Only the path of the last word is ever unminimized, so the memory
+    used is about the size of the minimal DFA. States merged away are reused
+    for later words
+    '''
+
+    transitions: List[Dict[U, int]] = [{}]
+    accepting: List[bool] = [False]
+    free_states: List[int] = []
+
+    # Maps from the accepting status and transitions of each minimized state
+    # to that state
+    register: Dict[Tuple[bool, Hashable], int] = {}
+
+    def new_state() -> int:
+        if len(free_states) > 0:
+            state = free_states.pop()
+            transitions[state], accepting[state] = {}, False
+
+            return state
+
+        transitions.append({})
+        accepting.append(False)
+
+        return len(transitions) - 1
+
+    def minimize_path(word: Sequence[U], path: List[int], prefix_length: int):
+        '''
+        Replaces each state along the path of a word beyond the prefix with an
+        equivalent registered state, or registers it, from the end backwards
+        '''
+
+        for index in range(len(word), prefix_length, -1):
+            state = path[index]
+            signature = (accepting[state], frozenset(transitions[state].items()))
+            registered = register.get(signature)
+
+            if registered is None:
+                register[signature] = state
+
+            else:
+                transitions[path[index - 1]][word[index - 1]] = registered
+                free_states.append(state)
+
+    previous = None
+    path = [0]
+
+    for word in words:
+        if previous is not None and word <= previous:
+            if word == previous:
+                continue
+
+            raise Exception(f'The words are not sorted: {word!r} comes after {previous!r}')
+
+        prefix_length = 0
+        if previous is not None:
+            for prev_symbol, symbol in zip(previous, word):
+                if prev_symbol != symbol:
+                    break
+
+                prefix_length += 1
+
+            minimize_path(previous, path, prefix_length)
+
+        del path[prefix_length + 1:]
+
+        for symbol in word[prefix_length:]:
+            state = new_state()
+            transitions[path[-1]][symbol] = state
+            path.append(state)
+
+        accepting[path[-1]] = True
+        previous = word
+
+    if previous is not None:
+        minimize_path(previous, path, 0)
+
+    # Number the remaining states compactly, in breadth-first order
+    state_index = {0: 0}
+    states = [0]
+
+    for state in states:
+        for next_state in transitions[state].values():
+            if next_state not in state_index:
+                state_index[next_state] = len(states)
+                states.append(next_state)
+
+    transition_list = [{symbol: state_index[next_state] for symbol, next_state in transitions[state].items()}
+                       for state in states]
+    accept_states = {state_index[state] for state in states if accepting[state]}
+
+    return transition_list, accept_states
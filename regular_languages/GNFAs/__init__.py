@@ -1 +1 @@
-from .gnfa import GNFA
+from .gnfa import GNFA, min_degree_product, min_weight
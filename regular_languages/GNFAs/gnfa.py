@@ -1,13 +1,16 @@
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Callable, Dict, Generic, Literal, Set, TypeVar
 
-from regular_languages import DFA
+from regular_languages import DFA, NFA
 from regular_languages.DFAs.dfa import DFASpecialStates
-from regular_languages.RegularExpressions.regex_ast import ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, RegexAST, SymbolNode, UnionNode
+from regular_languages.NFAs.nfa import SpecialSymbols
+from regular_languages.RegularExpressions.regex_ast import ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, OptionalNode, PlusNode, RegexAST, RepeatNode, SymbolNode, UnionNode
 from regular_languages.RegularExpressions.extract_alphabet import extract_alphabet
 from regular_languages.RegularExpressions.simplify_regex_ast import simplify_regex_ast
+from regular_languages.RegularExpressions.smart_constructors import closure_of, concat_of, union_of
+from regular_languages.RegularExpressions.traversal import fold_regex_ast
 
 class GNFASpecialStates(Enum):
     '''
@@ -22,30 +25,59 @@ U = TypeVar('U')
 
 AdjList = Dict[T | Literal[GNFASpecialStates.SOURCE], Dict[T | Literal[GNFASpecialStates.SINK], RegexAST[U]]]
 
+# Scores a state of a GNFA: the state with the lowest score is ripped next
+RipHeuristic = Callable[['GNFA', T], float]
+
 @dataclass
 class GNFA(Generic[T, U]):
+    '''
+    A generalized NFA, whose transitions are labelled with regular expressions.
+
+    The adjacency list is sparse: a transition that is missing from it is
+    labelled with the empty language. The reverse adjacency list is derived
+    from it, to find the transitions into each state
+    '''
+
     states: Set[T | DFASpecialStates]
     alphabet: Set[U]
     adj_list: AdjList
+    reverse_adj_list: AdjList = field(init=False, repr=False)
 
     def __post_init__(self):
-        for source_state in self.states.union({GNFASpecialStates.SOURCE}):
-            for dest_state in self.states.union({GNFASpecialStates.SINK}):
-                try:
-                    implied_sub_alphabet = extract_alphabet(self.adj_list[source_state][dest_state])
-                except KeyError:
-                    raise Exception(f'({source_state}, {dest_state}) is missing from the adjacency list')
-
-                if not implied_sub_alphabet.issubset(self.alphabet):
+        valid_sources = self.states.union({GNFASpecialStates.SOURCE})
+        valid_dests = self.states.union({GNFASpecialStates.SINK})
+
+        # Drop the explicit empty language transitions, to keep the lists sparse
+        adj_list = defaultdict(dict)
+        reverse_adj_list = defaultdict(dict)
+
+        for source_state, transitions in self.adj_list.items():
+            if source_state not in valid_sources:
+                raise Exception(f'{source_state} is not a valid source state')
+
+            for dest_state, ast in transitions.items():
+                if dest_state not in valid_dests:
+                    raise Exception(f'{dest_state} is not a valid destination state')
+
+                if not extract_alphabet(ast).issubset(self.alphabet):
                     raise Exception('The implied alphabet in an ast is not a subset of the defined alphabet')
 
+                if isinstance(ast, EmptyLangNode):
+                    continue
+
+                adj_list[source_state][dest_state] = ast
+                reverse_adj_list[dest_state][source_state] = ast
+
+        self.adj_list = adj_list
+        self.reverse_adj_list = reverse_adj_list
+
     # TODO: should this be a converter? Or is it ok since GNFAs aren't really
     # meant to be an external class?
     @classmethod
     def from_DFA(cls, dfa: DFA[T, U]):
         states = set(dfa.states)
         alphabet = set(dfa.alphabet)
-        adj_list: AdjList = defaultdict(lambda: defaultdict(EmptyLangNode))
+        adj_list: AdjList = defaultdict(dict)
 
         # Add the connection from the new source to the start state
         adj_list[GNFASpecialStates.SOURCE][dfa.start_state] = EmptyStrNode()
@@ -59,8 +91,8 @@ class GNFA(Generic[T, U]):
             for symbol in dfa.alphabet:
                 dest_state = dfa.transition_function(source_state, symbol)
 
-                match adj_list[source_state][dest_state]:
-                    case EmptyLangNode():
+                match adj_list[source_state].get(dest_state):
+                    case None:
                         adj_list[source_state][dest_state] = SymbolNode(symbol)
 
                     case node:
@@ -68,30 +100,153 @@ class GNFA(Generic[T, U]):
 
         return cls(states, alphabet, adj_list)
 
-    def to_regexAST(self, simplify: Callable[[RegexAST], RegexAST]=simplify_regex_ast):
-        orig_states = set(self.states)
+    @classmethod
+    def from_NFA(cls, nfa: NFA[T, U]):
+        '''
+        Constructs a GNFA from an NFA, with the epsilon transitions labelled
+        with the empty string. This avoids the subset construction, so the
+        GNFA has no more states than the NFA
+        '''
+
+        states = set(nfa.states)
+        alphabet = set(nfa.alphabet)
+        adj_list: AdjList = defaultdict(dict)
+
+        adj_list[GNFASpecialStates.SOURCE][nfa.start_state] = EmptyStrNode()
+
+        for accept_state in nfa.accept_states:
+            adj_list[accept_state][GNFASpecialStates.SINK] = EmptyStrNode()
+
+        for source_state in nfa.states:
+            for symbol in nfa.alphabet.union({SpecialSymbols.EMPTY}):
+                symbol_node = EmptyStrNode() if symbol is SpecialSymbols.EMPTY else SymbolNode(symbol)
+
+                for dest_state in nfa.transition_function(source_state, symbol):
+                    match adj_list[source_state].get(dest_state):
+                        case None:
+                            adj_list[source_state][dest_state] = symbol_node
+
+                        case node:
+                            adj_list[source_state][dest_state] = UnionNode(node, symbol_node)
+
+        return cls(states, alphabet, adj_list)
+
+    def to_regexAST(self, simplify: Callable[[RegexAST], RegexAST]=simplify_regex_ast,
+                    heuristic: RipHeuristic | None = None):
+        '''
+        Converts the GNFA to a regular expression by state elimination,
+        ripping the state with the lowest heuristic score at each step
+        '''
 
-        for state in orig_states:
-            self.rip_state(state, simplify)
+        heuristic = min_degree_product if heuristic is None else heuristic
 
-        final_ast = self.adj_list[GNFASpecialStates.SOURCE][GNFASpecialStates.SINK]
+        while len(self.states) > 0:
+            rip_state = min(self.states, key=lambda state: heuristic(self, state))
+            self.rip_state(rip_state, simplify)
+
+        final_ast = self.adj_list[GNFASpecialStates.SOURCE].get(GNFASpecialStates.SINK, EmptyLangNode())
 
         return simplify(final_ast)
 
     def rip_state(self, rip_state: T | DFASpecialStates, simplify):
+        '''
+        Removes a state, replacing each path through the state with a direct
+        transition. Only pairs of states with a transition into and out of the
+        ripped state are updated
+        '''
+
+        self_loop = self.adj_list[rip_state].get(rip_state)
+        incoming = {state: ast for state, ast in self.reverse_adj_list[rip_state].items() if state != rip_state}
+        outgoing = {state: ast for state, ast in self.adj_list[rip_state].items() if state != rip_state}
+
         # Update the adj list to account for the state being removed
-        for source_state in self.states.union({GNFASpecialStates.SOURCE}).difference({rip_state}):
-            for dest_state in self.states.union({GNFASpecialStates.SINK}).difference({rip_state}):
-                orig_ast = self.adj_list[source_state][dest_state]
-                r1 = self.adj_list[source_state][rip_state]
-                r2 = self.adj_list[rip_state][rip_state]
-                r3 = self.adj_list[rip_state][dest_state]
-
-                new_ast = UnionNode(orig_ast, ConcatNode(ConcatNode(r1, ClosureNode(r2)), r3))
+        for source_state, r1 in incoming.items():
+            for dest_state, r3 in outgoing.items():
+                path_ast = concat_path(r1, self_loop, r3)
+                orig_ast = self.adj_list[source_state].get(dest_state)
+
+                new_ast = path_ast if orig_ast is None else union_of(orig_ast, path_ast)
+                new_ast = simplify(new_ast)
+
                 self.adj_list[source_state][dest_state] = new_ast
+                self.reverse_adj_list[dest_state][source_state] = new_ast
 
         # Remove the state from the list of states
         self.states.remove(rip_state)
 
-        # Remove the state from the adj list
+        # Remove the state from the adj lists
+        for source_state in incoming:
+            del self.adj_list[source_state][rip_state]
+
+        for dest_state in outgoing:
+            del self.reverse_adj_list[dest_state][rip_state]
+
         del self.adj_list[rip_state]
+        del self.reverse_adj_list[rip_state]
+
+    def in_degree(self, state: T) -> int:
+        '''
+        Returns the number of transitions into the state, excluding self loops
+        '''
+
+        return len(self.reverse_adj_list[state]) - (state in self.reverse_adj_list[state])
+
+    def out_degree(self, state: T) -> int:
+        '''
+        Returns the number of transitions out of the state, excluding self loops
+        '''
+
+        return len(self.adj_list[state]) - (state in self.adj_list[state])
+
+def concat_path(r1: RegexAST, self_loop: RegexAST | None, r3: RegexAST) -> RegexAST:
+    '''
+    Builds the expression for a path through a ripped state, leaving out the
+    closure when there is no self loop
+    '''
+
+    if self_loop is None:
+        return concat_of(r1, r3)
+
+    return concat_of(r1, closure_of(self_loop), r3)
+
+def min_degree_product(gnfa: GNFA, state) -> int:
+    '''
+    Scores a state by the number of transitions that ripping it creates
+    '''
+
+    return gnfa.in_degree(state) * gnfa.out_degree(state)
+
+def min_weight(gnfa: GNFA, state) -> int:
+    '''
+    Scores a state by the total size of the expressions that ripping it
+    creates, as described by Delgado and Morais: each incoming expression is
+    copied once for every outgoing transition and vice versa, and the self
+    loop is copied once for every pair
+    '''
+
+    in_degree, out_degree = gnfa.in_degree(state), gnfa.out_degree(state)
+    self_loop = gnfa.adj_list[state].get(state)
+
+    in_weight = sum(regex_ast_size(ast) for source, ast in gnfa.reverse_adj_list[state].items() if source != state)
+    out_weight = sum(regex_ast_size(ast) for dest, ast in gnfa.adj_list[state].items() if dest != state)
+    loop_weight = 0 if self_loop is None else regex_ast_size(self_loop)
+
+    return in_weight * (out_degree - 1) + out_weight * (in_degree - 1) + loop_weight * (in_degree * out_degree - 1)
+
+def regex_ast_size(ast: RegexAST) -> int:
+    '''
+    Counts the nodes of an ast, as if it were a tree. Each distinct node is
+    only counted once, then reused wherever it is shared
+    '''
+
+    return fold_regex_ast(ast, node_size)
+
+def node_size(node: RegexAST, size_of: Callable[[RegexAST], int]) -> int:
+    match node:
+        case UnionNode(children) | ConcatNode(children):
+            return len(children) - 1 + sum(size_of(child) for child in children)
+
+        case ClosureNode(child) | OptionalNode(child) | PlusNode(child) | RepeatNode(child, _, _):
+            return 1 + size_of(child)
+
+    return 1
@@ -1,2 +1,3 @@
 from .nfa import NFA
-from .generated_states import BasisState, InternalState, LeftInternalState, RightInternalState
+from .generated_states import BasisState, InternalState, LeftInternalState, RightInternalState, TaggedInternalState
+from .flat_nfa import FlatNFA
@@ -0,0 +1,104 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, FrozenSet, Generic, Iterable, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from .nfa import NFA
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+@dataclass(frozen=True)
+class FlatNFA(Generic[T, U]):
+    '''
+    A flattened snapshot of an NFA, with states and symbols renumbered to
+    integers and every transition precomputed into plain tuples and
+    dictionaries. Unlike an NFA built from closures, this representation can
+    be pickled, so it can be shipped to worker processes
+    '''
+
+    # Maps from state index to the original state
+    states: Tuple[T, ...]
+
+    # Maps from symbol index to the original symbol
+    alphabet: Tuple[U, ...]
+
+    # Maps from state index and symbol index to the epsilon closure of the
+    # states reached on that symbol. Symbols with no transition are omitted
+    moves: Tuple[Dict[int, FrozenSet[int]], ...]
+
+    # Maps from state index to the epsilon closure of that state
+    closures: Tuple[FrozenSet[int], ...]
+
+    start_state: int
+    accept_states: FrozenSet[int]
+
+    @classmethod
+    def from_NFA(cls, nfa: NFA[T, U]):
+        '''
+        Flattens an NFA by evaluating its transition function on every
+        state/symbol combination
+        '''
+
+        states = tuple(nfa.states)
+        alphabet = tuple(nfa.alphabet)
+        state_index = {state: index for index, state in enumerate(states)}
+
+        closures = tuple(frozenset(state_index[closure_state] for closure_state
+                                   in nfa.epsilon_closure({state}))
+                         for state in states)
+
+        # Epsilon transitions are folded into the closures, so they need no
+        # entry of their own
+        moves = []
+        for state in states:
+            state_moves = {}
+
+            for symbol_index, symbol in enumerate(alphabet):
+                next_states = nfa.transition_function(state, symbol)
+
+                if len(next_states) > 0:
+                    state_moves[symbol_index] = frozenset().union(
+                        *(closures[state_index[next_state]] for next_state in next_states))
+
+            moves.append(state_moves)
+
+        start_state = state_index[nfa.start_state]
+        accept_states = frozenset(state_index[state] for state in nfa.accept_states)
+
+        return cls(states, alphabet, tuple(moves), closures, start_state, accept_states)
+
+    def start_subset(self) -> FrozenSet[int]:
+        '''
+        Returns the epsilon closure of the start state, the start state of the
+        equivalent DFA
+        '''
+
+        return self.closures[self.start_state]
+
+    def move(self, subset: Iterable[int], symbol: int) -> FrozenSet[int]:
+        '''
+        Computes the set of states reachable from an (epsilon closed) subset of
+        states by reading the symbol with the given index, including epsilon
+        transitions afterwards
+        '''
+
+        return frozenset().union(*(self.moves[state].get(symbol, ()) for state in subset))
+
+    def expand(self, subset: Iterable[int]) -> Tuple[FrozenSet[int], ...]:
+        '''
+        Computes the move of a subset on every symbol of the alphabet, in the
+        order of the alphabet
+        '''
+
+        return tuple(self.move(subset, symbol) for symbol in range(len(self.alphabet)))
+
+    def is_accepting(self, subset: Iterable[int]) -> bool:
+        return not self.accept_states.isdisjoint(subset)
+
+    def unflatten_subset(self, subset: Iterable[int]) -> FrozenSet[T]:
+        '''
+        Converts a subset of state indices back to a set of the original states
+        '''
+
+        return frozenset(self.states[state] for state in subset)
@@ -31,4 +31,13 @@ class RightInternalState:
     def wrap(states: Set):
         return {RightInternalState(state) for state in states}
 
-GeneratedNFAState = BasisState | InternalState | LeftInternalState | RightInternalState
+@dataclass(eq=True, frozen=True)
+class TaggedInternalState:
+    tag: int
+    child: GeneratedNFAState
+
+    @staticmethod
+    def wrap(tag: int, states: Set):
+        return {TaggedInternalState(tag, state) for state in states}
+
+GeneratedNFAState = BasisState | InternalState | LeftInternalState | RightInternalState | TaggedInternalState
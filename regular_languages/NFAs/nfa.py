@@ -167,6 +167,17 @@ class NFA(Generic[T, U]):
 
         return any(final_state in self.accept_states for final_state in final_states)
 
+    def reduce(self):
+        '''
+        Returns a smaller equivalent NFA without epsilon transitions, with
+        useless states dropped and bisimilar states merged, which is cheaper
+        to simulate or determinize
+        '''
+
+        from regular_languages.operators.reduce_nfa import reduce_nfa
+
+        return reduce_nfa(self)
+
     def rename_states(self, name_map: Dict[T, V]):
         inv_name_map = {
             value: key for key, value in name_map.items()
@@ -0,0 +1 @@
+from .pattern_set import PatternSet, compile_pattern_set
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Generic, Iterable, Sequence, Set, TypeVar
+
+from regular_languages.DFAs.dfa import DFA, TransitionMap
+from regular_languages.NFAs.flat_nfa import FlatNFA
+from regular_languages.RegularExpressions.regex import Regex
+from regular_languages.Converters.regex_to_nfa import regex_to_nfa
+from regular_languages.operators import minimize_dfa, tagged_union_nfa
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+@dataclass
+class PatternSet(Generic[T, U]):
+    '''
+    A DFA that recognizes the union of several patterns, where each state is
+    labelled with the ids of the patterns that accept when the DFA ends in
+    that state. This reports every matching pattern in a single pass over the
+    input, instead of simulating a DFA per pattern
+    '''
+
+    dfa: DFA[T, U]
+    labels: Dict[T, FrozenSet[int]]
+
+    def __post_init__(self):
+        '''
+        Verifies that every state has a label, and that the accept states are
+        exactly the states with a non-empty label
+        '''
+
+        if set(self.labels.keys()) != self.dfa.states:
+            raise Exception('Every state of the DFA must have a label')
+
+        labelled_states = {state for state, label in self.labels.items() if len(label) > 0}
+
+        if labelled_states != self.dfa.accept_states:
+            raise Exception('The accept states of the DFA must be exactly the states with a non-empty label')
+
+    def match_all(self, test_string: Iterable[U]) -> FrozenSet[int]:
+        '''
+        Returns the ids of every pattern that accepts the given string
+        '''
+
+        return self.labels[self.dfa.simulate(test_string)]
+
+    def minimized(self):
+        '''
+        Returns an equivalent pattern set with the fewest states, merging only
+        states that are labelled with the same pattern ids
+        '''
+
+        dfa = minimize_dfa(self.dfa, self.labels)
+
+        # Every member of a merged state has the same label
+        labels = {state: self.labels[next(iter(state))] for state in dfa.states}
+
+        return PatternSet(dfa, labels)
+
+def compile_pattern_set(regexes: Sequence[Regex[U]], minimize: bool = True) -> PatternSet:
+    '''
+    Compiles regular expressions into a single pattern set, where the id of
+    each pattern is its index in the sequence.
+
+    The NFAs of the patterns are combined with a tagged union, and determinized
+    with a labelled subset construction: each subset is labelled with the tags
+    of the accept states it contains
+    '''
+
+    nfa = tagged_union_nfa([regex_to_nfa(regex) for regex in regexes])
+    flat_nfa = FlatNFA.from_NFA(nfa)
+
+    # Maps from each accept state index to the id of the pattern it accepts
+    accept_tags = {state: flat_nfa.states[state].tag for state in flat_nfa.accept_states}
+
+    start_subset = flat_nfa.start_subset()
+    subsets = {start_subset: flat_nfa.unflatten_subset(start_subset)}
+    queue = [start_subset]
+    transition_map: TransitionMap = {}
+
+    while len(queue) > 0:
+        subset = queue.pop()
+        transitions = transition_map[subsets[subset]] = {}
+
+        for symbol, next_subset in zip(flat_nfa.alphabet, flat_nfa.expand(subset)):
+            if next_subset not in subsets:
+                subsets[next_subset] = flat_nfa.unflatten_subset(next_subset)
+                queue.append(next_subset)
+
+            transitions[symbol] = subsets[next_subset]
+
+    state_labels: Dict[object, FrozenSet[int]] = {
+        state: frozenset(accept_tags[index] for index in subset if index in accept_tags)
+        for subset, state in subsets.items()
+    }
+    accept_states = {state for state, label in state_labels.items() if len(label) > 0}
+
+    dfa = DFA.from_transition_map(transition_map, subsets[start_subset], accept_states)
+
+    # The transition map implies a dead state, which accepts no pattern
+    labels = {state: state_labels.get(state, frozenset()) for state in dfa.states}
+    pattern_set = PatternSet(dfa, labels)
+
+    return pattern_set.minimized() if minimize else pattern_set
@@ -1,2 +1,6 @@
 from .regex import Regex
 from .simplify_regex_ast import simplify_regex_ast
+from .required_literals import RequiredLiterals, extract_required_literals
+from .smart_constructors import closure_of, concat_of, optional_of, plus_of, repeat_of, union_of
+from .regex_ast_to_DNF import LazyDNF
+from .regex_compiler import compile_regular_expression, compile_regular_expression_by_precedence
@@ -0,0 +1,59 @@
+from .regex_ast import ClosureNode, ConcatNode, EmptyStrNode, OptionalNode, PlusNode, RegexAST, RepeatNode, UnionNode
+from .traversal import fold_regex_ast
+
+def expand_repetitions(ast: RegexAST) -> RegexAST:
+    '''
+    Rewrites the optional, plus and counted repetition operators of an ast
+    with only union, concatenation and closure. Only needed by passes that
+    work on the core operators alone, since the expansion of a counted
+    repetition is as large as its count
+    '''
+
+    return fold_regex_ast(ast, expand_node)
+
+def expand_node(ast: RegexAST, expanded_of) -> RegexAST:
+    '''
+    Expands the repetition operators of a single node, using the given
+    function to get the expansions of its children
+    '''
+
+    match ast:
+        # a? == \e|a
+        case OptionalNode(child):
+            return UnionNode(EmptyStrNode(), expanded_of(child))
+
+        # a+ == aa*
+        case PlusNode(child):
+            expanded = expanded_of(child)
+
+            return ConcatNode(expanded, ClosureNode(expanded))
+
+        # a{m,} == a...aa* and a{m,n} == a...a(\e|a(\e|a...)), with m copies
+        # before the optional part
+        case RepeatNode(child, min, max):
+            expanded = expanded_of(child)
+
+            if max is None:
+                tail = ClosureNode(expanded)
+
+            else:
+                tail = EmptyStrNode()
+
+                for _ in range(max - min):
+                    tail = UnionNode(EmptyStrNode(), expanded if tail == EmptyStrNode() else ConcatNode(expanded, tail))
+
+            copies = [expanded] * min
+
+            return ConcatNode(*copies) if tail == EmptyStrNode() else ConcatNode(*copies, tail)
+
+        case UnionNode(children):
+            return UnionNode(*(expanded_of(child) for child in children))
+
+        case ConcatNode(children):
+            return ConcatNode(*(expanded_of(child) for child in children))
+
+        case ClosureNode(child):
+            return ClosureNode(expanded_of(child))
+
+    # The basis nodes have no children to expand
+    return ast
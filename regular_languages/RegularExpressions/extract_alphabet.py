@@ -1,23 +1,54 @@
-
-from typing import Set, TypeVar
-from regular_languages.RegularExpressions.regex_ast import ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, RegexAST, SymbolNode, UnionNode
+from typing import Callable, Iterable, Set, TypeVar
+from regular_languages.helpers.interval_set import IntervalSet
+from regular_languages.RegularExpressions.regex_ast import CharClassNode, ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, OptionalNode, PlusNode, RegexAST, RepeatNode, SymbolNode, UnionNode
+from regular_languages.RegularExpressions.traversal import fold_regex_ast
 
 U = TypeVar('U')
 
 def extract_alphabet(regex_ast: RegexAST[U]) -> Set:
     '''
-    Extracts the alphabet implied by a regular expression ast
+    Extracts the alphabet implied by a regular expression ast. Each distinct
+    node is visited once, even if it is shared by several parents.
+
+    If the ast has character classes, the alphabet is an interval set, so
+    classes over huge ranges of characters are never enumerated
+    '''
+
+    alphabet = fold_regex_ast(regex_ast, node_alphabet)
+
+    return alphabet if isinstance(alphabet, IntervalSet) else set(alphabet)
+
+def node_alphabet(node: RegexAST[U], alphabet_of: Callable[[RegexAST[U]], Set]) -> Set:
+    '''
+    Extracts the alphabet of a single node, using the given function to get
+    the alphabets of its children
     '''
 
-    match regex_ast:
-        case UnionNode(left, right) | ConcatNode(left, right):
-            return extract_alphabet(left).union(extract_alphabet(right))
+    match node:
+        case UnionNode(children) | ConcatNode(children):
+            return union_alphabets(alphabet_of(child) for child in children)
 
-        case ClosureNode(child):
-            return extract_alphabet(child)
+        case ClosureNode(child) | OptionalNode(child) | PlusNode(child) | RepeatNode(child, _, _):
+            return alphabet_of(child)
 
         case SymbolNode(symbol):
             return {symbol}
 
+        case CharClassNode(chars):
+            return chars
+
         case EmptyStrNode() | EmptyLangNode():
             return set()
+
+def union_alphabets(alphabets: Iterable[Set]) -> Set:
+    '''
+    Computes the union of alphabets, which is an interval set if any of them
+    is, and a set of symbols otherwise
+    '''
+
+    alphabets = list(alphabets)
+
+    if any(isinstance(alphabet, IntervalSet) for alphabet in alphabets):
+        return IntervalSet().union(*alphabets)
+
+    return set().union(*alphabets)
@@ -1,19 +1,16 @@
 from dataclasses import dataclass
-from typing import Callable, Generic, Optional, Set, TypeVar
+from typing import Callable, Generic, Iterator, Optional, Set, TypeVar
 from regular_languages.RegularExpressions.regex_to_string import regex_ast_to_string
-from regular_languages.RegularExpressions.regex_ast_to_DNF import regex_ast_to_DNF
+from regular_languages.RegularExpressions.regex_ast_to_DNF import LazyDNF, regex_ast_to_DNF
 
 from regular_languages.RegularExpressions.regex_compiler import compile_regular_expression
 from regular_languages.RegularExpressions.simplify_regex_ast import simplify_regex_ast
 
+from regular_languages.helpers.interval_set import IntervalSet
+
 from .regex_ast import RegexAST
 from .extract_alphabet import extract_alphabet
 
-# TODO: provide an augmented provider than can compile other operators to the
-# operators defined here (question mark, plus, min/max/exact count)
-# TODO: consider creating an augmented ast that cnopiles more advanced operators
-# to an NFA directly
-
 U = TypeVar('U')
 
 DEFAULT_REGEX_COMPILER = compile_regular_expression
@@ -30,7 +27,14 @@ class Regex(Generic[U]):
     def __post_init__(self):
         implicit_alphabet = extract_alphabet(self.ast)
 
-        if not implicit_alphabet.issubset(self.alphabet):
+        # Comparing as sets avoids enumerating alphabets of character ranges
+        if isinstance(self.alphabet, IntervalSet):
+            within_alphabet = implicit_alphabet <= self.alphabet
+
+        else:
+            within_alphabet = implicit_alphabet.issubset(self.alphabet)
+
+        if not within_alphabet:
             raise Exception('The defined alphabet for the regex is not a ' +
                             'subset of the alphabet implied by the regex')
 
@@ -67,14 +71,24 @@ class Regex(Generic[U]):
 
     # TODO: consider putting this in an operators file
     # I suppose that DFA minimize should possibly also be in there too
-    def to_DNF(self):
+    def to_DNF(self, max_terms: Optional[int] = None):
         '''
         Returns a new regex that places the regex in disjunctive normal form:
         the union of regular expressions consisting only of concatenation and
-        closures
+        closures. Raises an exception upfront if the DNF would have more than
+        max_terms terms
         '''
 
-        ast_in_DNF = regex_ast_to_DNF(self.ast)
+        ast_in_DNF = regex_ast_to_DNF(self.ast, max_terms)
 
         return Regex(self.alphabet, ast_in_DNF)
 
+    def iter_DNF(self, max_terms: Optional[int] = None) -> Iterator['Regex[U]']:
+        '''
+        Generates the terms of the disjunctive normal form of the regex one
+        at a time, as regexes, without building the whole union
+        '''
+
+        for term in LazyDNF(self.ast, max_terms):
+            yield Regex(self.alphabet, term)
+
@@ -1,33 +1,158 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Generic, Sequence, Set, TypeVar
+from itertools import count
+from typing import Generic, Optional, Sequence, Set, Tuple, TypeVar
+from weakref import WeakValueDictionary
+
+from regular_languages.helpers.interval_set import IntervalSet
 
 U = TypeVar('U')
 
-@dataclass
-class ConcatNode:
-    left: RegexAST
-    right: RegexAST
+class InternedNodeMeta(type):
+    '''
+    Metaclass that hash-conses the nodes of the AST: constructing a node that
+    is structurally equal to a live node returns that same node. Every
+    distinct subtree is stored once, so equality between nodes is an identity
+    check, and passes over the AST can memoize on node identity
+    '''
+
+    # Maps from the structural key of each live node to the node
+    interned: WeakValueDictionary = WeakValueDictionary()
+
+    # Numbers the nodes in the order they are created, which gives the nodes a
+    # deterministic order within a process
+    serials = count()
+
+    def __call__(cls, *args, **kwargs):
+        if issubclass(cls, NaryNode):
+            children = cls.flatten(tuple(kwargs['children']) if 'children' in kwargs else args)
+
+            # Unions and concatenations of fewer than two children are not
+            # needed: the child itself, or the identity of the operation
+            if len(children) == 1:
+                return children[0]
+
+            if len(children) == 0:
+                return cls.identity()
+
+            args = (children,)
+
+        elif len(kwargs) > 0:
+            args = args + tuple(kwargs[name] for name in cls.__match_args__[len(args):])
+
+        # Children are interned, so they are keyed by identity. Symbols are
+        # keyed by type as well, so that equal symbols of different types
+        # (like 1 and True) get different nodes
+        key = (cls, *args) if cls is not SymbolNode else (cls, type(args[0]), *args)
+        node = InternedNodeMeta.interned.get(key)
+
+        if node is None:
+            node = super().__call__(*args)
+            object.__setattr__(node, '_hash', hash(key))
+            object.__setattr__(node, '_serial', next(InternedNodeMeta.serials))
+            InternedNodeMeta.interned[key] = node
+
+        return node
+
+class RegexNode(metaclass=InternedNodeMeta):
+    '''
+    Base class for the nodes of the AST. Nodes are immutable and interned, so
+    their hash is computed once, when they are constructed
+    '''
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        # Reconstruct through the constructor, so unpickled nodes are interned
+        return (type(self), tuple(getattr(self, name) for name in self.__match_args__))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+class NaryNode(RegexNode):
+    '''
+    Base class for the associative operations, whose nodes hold any number of
+    children. Constructing one from nested nodes of the same operation
+    flattens them into a single node, so ConcatNode(a, ConcatNode(b, c)) is
+    ConcatNode(a, b, c)
+    '''
 
-@dataclass
-class UnionNode:
-    left: RegexAST
-    right: RegexAST
+    children: Tuple[RegexAST, ...]
 
-@dataclass
-class ClosureNode:
+    @classmethod
+    def flatten(cls, children: Tuple[RegexAST, ...]) -> Tuple[RegexAST, ...]:
+        return tuple(grandchild for child in children
+                     for grandchild in (child.children if type(child) is cls else (child,)))
+
+    def __reduce__(self):
+        return (type(self), self.children)
+
+@dataclass(frozen=True, eq=False)
+class ConcatNode(NaryNode):
+    children: Tuple[RegexAST, ...]
+
+    @staticmethod
+    def identity() -> RegexAST:
+        return EmptyStrNode()
+
+@dataclass(frozen=True, eq=False)
+class UnionNode(NaryNode):
+    children: Tuple[RegexAST, ...]
+
+    @staticmethod
+    def identity() -> RegexAST:
+        return EmptyLangNode()
+
+@dataclass(frozen=True, eq=False)
+class ClosureNode(RegexNode):
+    child: RegexAST
+
+@dataclass(frozen=True, eq=False)
+class OptionalNode(RegexNode):
     child: RegexAST
 
-@dataclass
-class EmptyStrNode:
+@dataclass(frozen=True, eq=False)
+class PlusNode(RegexNode):
+    child: RegexAST
+
+@dataclass(frozen=True, eq=False)
+class RepeatNode(RegexNode):
+    '''
+    Repetition of the child between min and max times, inclusive. A max of
+    None means there is no upper bound
+    '''
+
+    child: RegexAST
+    min: int
+    max: Optional[int]
+
+    def __post_init__(self):
+        if self.min < 0 or (self.max is not None and self.max < self.min):
+            raise Exception(f'Invalid bounds for repetition: {{{self.min},{self.max}}}')
+
+@dataclass(frozen=True, eq=False)
+class EmptyStrNode(RegexNode):
     pass
 
-@dataclass
-class EmptyLangNode:
+@dataclass(frozen=True, eq=False)
+class EmptyLangNode(RegexNode):
     pass
 
-@dataclass
-class SymbolNode(Generic[U]):
+@dataclass(frozen=True, eq=False)
+class SymbolNode(RegexNode, Generic[U]):
     symbol: U
 
-RegexAST = ConcatNode | UnionNode | ClosureNode | SymbolNode[U] | EmptyStrNode | EmptyLangNode
+@dataclass(frozen=True, eq=False)
+class CharClassNode(RegexNode):
+    '''
+    Matches any single character in a set of characters, without listing
+    each character as a symbol
+    '''
+
+    chars: IntervalSet
+
+RegexAST = ConcatNode | UnionNode | ClosureNode | OptionalNode | PlusNode | RepeatNode | SymbolNode[U] | CharClassNode | EmptyStrNode | EmptyLangNode
@@ -1,46 +1,170 @@
-from .regex_ast import ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, RegexAST, SymbolNode, UnionNode
+from dataclasses import dataclass, field
+from itertools import product
+from math import prod
+from typing import Dict, Iterator, List, Optional
+from .regex_ast import CharClassNode, ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, RegexAST, SymbolNode, UnionNode
+from .expand_repetitions import expand_repetitions
+from .smart_constructors import union_operands
+from .traversal import fold_regex_ast
 
-def regex_ast_to_DNF(ast: RegexAST):
+def regex_ast_to_DNF(ast: RegexAST, max_terms: Optional[int] = None):
     '''
     Places a regular expression in disjunctive normal form: the union of
-    collection of concatenations and closures
+    collection of concatenations and closures. Each distinct node is
+    converted once, even if it is shared by several parents.
+
+    Raises an exception before building anything if the DNF would have more
+    than max_terms terms
+    '''
+
+    return LazyDNF(ast, max_terms).to_ast()
+
+@dataclass
+class LazyDNF:
+    '''
+    The disjunctive normal form of a regular expression, whose terms are
+    built on demand. Only the number of terms of each node is computed
+    upfront, which is enough to build the term at any index directly, so the
+    terms can be generated one at a time, or split into ranges of indices.
+
+    The terms are in the same order as the union built by to_ast. The number
+    of terms can be far larger than could ever be materialized. Repetition
+    operators are expanded to the core operators first
+    '''
+
+    ast: RegexAST
+    max_terms: Optional[int] = None
+
+    # The number of terms in the DNF of each node
+    counts: Dict[RegexAST, int] = field(default_factory=dict, init=False, repr=False)
+
+    # The DNF of each node that has been fully converted
+    converted: Dict[RegexAST, RegexAST] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.ast = expand_repetitions(self.ast)
+        fold_regex_ast(self.ast, node_DNF_terms, results=self.counts)
+        self.check_terms(self.ast)
+
+    @property
+    def num_terms(self) -> int:
+        return self.counts[self.ast]
+
+    def check_terms(self, ast: RegexAST):
+        '''
+        Verifies that the DNF of a node does not exceed the maximum number of
+        terms
+        '''
+
+        if self.max_terms is not None and self.counts[ast] > self.max_terms:
+            raise Exception(f'The disjunctive normal form has {self.counts[ast]} terms, ' +
+                            f'more than the maximum of {self.max_terms}')
+
+    def term(self, index: int) -> RegexAST:
+        '''
+        Builds the term at the given index, by decomposing the index into the
+        choice of term for each union and concatenation it passes through
+        '''
+
+        if index < 0 or index >= self.num_terms:
+            raise Exception(f'There is no term {index} in a DNF of {self.num_terms} terms')
+
+        counts = self.counts
+        pieces: List[RegexAST] = []
+        stack = [(self.ast, index)]
+
+        while len(stack) > 0:
+            node, index = stack.pop()
+
+            match node:
+                # The terms of a union are the terms of each child in turn
+                case UnionNode(children):
+                    for child in children:
+                        if index < counts[child]:
+                            stack.append((child, index))
+                            break
+
+                        index -= counts[child]
+
+                # The terms of a concatenation are every combination of terms
+                # of its children, the last child changing fastest
+                case ConcatNode(children):
+                    # Pushing from the last child leaves the first child on
+                    # top of the stack, so the pieces are built left to right
+                    for child in reversed(children):
+                        index, child_index = divmod(index, counts[child])
+                        stack.append((child, child_index))
+
+                # A closure is a single term, whose child is converted in full
+                case ClosureNode(_):
+                    pieces.append(self.convert(node))
+
+                case _:
+                    pieces.append(node)
+
+        return ConcatNode(*pieces)
+
+    def __iter__(self) -> Iterator[RegexAST]:
+        return (self.term(index) for index in range(self.num_terms))
+
+    def convert(self, ast: RegexAST) -> RegexAST:
+        '''
+        Places a node of the ast in disjunctive normal form in full, checking
+        that no node converted along the way exceeds the maximum terms
+        '''
+
+        def convert_node(node: RegexAST, to_DNF) -> RegexAST:
+            self.check_terms(node)
+
+            return node_to_DNF(node, to_DNF)
+
+        return fold_regex_ast(ast, convert_node, results=self.converted)
+
+    def to_ast(self) -> RegexAST:
+        return self.convert(self.ast)
+
+def node_DNF_terms(ast: RegexAST, terms_of) -> int:
+    '''
+    Counts the terms in the DNF of a single node, using the given function to
+    count the terms of its children
+    '''
+
+    match ast:
+        case UnionNode(children):
+            return sum(terms_of(child) for child in children)
+
+        case ConcatNode(children):
+            return prod(terms_of(child) for child in children)
+
+    return 1
+
+def node_to_DNF(ast: RegexAST, to_DNF) -> RegexAST:
+    '''
+    Places a single node in disjunctive normal form, using the given function
+    to convert its children
     '''
 
     match ast:
         # Base case: basis nodes of a regex are in DNF
-        case SymbolNode(_) | EmptyLangNode() | EmptyStrNode() as node:
+        case SymbolNode(_) | CharClassNode(_) | EmptyLangNode() | EmptyStrNode() as node:
             return node
 
         # Simple case: union of expressions in DNF is still in DNF
-        case UnionNode(left, right):
-            left_in_DNF = regex_ast_to_DNF(left)
-            right_in_DNF = regex_ast_to_DNF(right)
-
-            return UnionNode(left_in_DNF, right_in_DNF)
+        case UnionNode(children):
+            return UnionNode(*(to_DNF(child) for child in children))
 
-        # Closure case: apply algebraic rule: (a|b)* == (a*b*)*
+        # Closure case: apply algebraic rule: (a|b|c)* == (a*b*c*)*
         case ClosureNode(child):
-            child_in_DNF = regex_ast_to_DNF(child)
+            child_in_DNF = to_DNF(child)
 
-            match ClosureNode(child_in_DNF):
-                case ClosureNode(UnionNode(a, b)):
-                    return ClosureNode(ConcatNode(ClosureNode(a), ClosureNode(b)))
+            match child_in_DNF:
+                case UnionNode(terms):
+                    return ClosureNode(ConcatNode(*(ClosureNode(term) for term in terms)))
 
             return ClosureNode(child_in_DNF)
 
         # Concat case: apply distributive law: (a|b)(c|d) == (ac|ad|bc|bd)
-        case ConcatNode(left, right):
-            left_in_DNF = regex_ast_to_DNF(left)
-            right_in_DNF = regex_ast_to_DNF(right)
-
-            match ConcatNode(left_in_DNF, right_in_DNF):
-                case ConcatNode(UnionNode(a, b), UnionNode(c, d)):
-                    return UnionNode(UnionNode(ConcatNode(a, c), ConcatNode(a, d)), UnionNode(ConcatNode(b, c), ConcatNode(b, d)))
-
-                case ConcatNode(a, UnionNode(b, c)):
-                    return UnionNode(ConcatNode(a, b), UnionNode(a, c))
-
-                case ConcatNode(UnionNode(a, b), c):
-                    return UnionNode(ConcatNode(a, c), UnionNode(b, c))
+        case ConcatNode(children):
+            children_terms = [union_operands(to_DNF(child)) for child in children]
 
-            return ConcatNode(left_in_DNF, right_in_DNF)
+            return UnionNode(*(ConcatNode(*terms) for terms in product(*children_terms)))
@@ -1,8 +1,9 @@
 from typing import TypeVar
 
 from regular_languages.RegularExpressions.regex_ast import RegexAST
-from regular_languages.RegularExpressions.regex_lexer import lex_regular_expression
+from regular_languages.RegularExpressions.regex_lexer import iterate_positioned_tokens, lex_regular_expression
 from regular_languages.RegularExpressions.regex_parser import parse_regular_expression
+from regular_languages.RegularExpressions.regex_precedence_parser import parse_regular_expression_by_precedence
 
 U = TypeVar('U')
 
@@ -15,3 +16,15 @@ def compile_regular_expression(regular_expression: str) -> RegexAST[str]:
     ast = parse_regular_expression(token_stream)
 
     return ast
+
+def compile_regular_expression_by_precedence(regular_expression: str) -> RegexAST[str]:
+    '''
+    Compiles a regular expression defined as a string to an AST for the
+    regex, using the linear time precedence parser. Syntax errors report the
+    position in the string where they occured
+    '''
+
+    tokens = iterate_positioned_tokens(regular_expression)
+    ast = parse_regular_expression_by_precedence(tokens)
+
+    return ast
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
-from typing import Dict, List, Set, Type
+from functools import cached_property
+from typing import Dict, Iterator, List, Set, Tuple
 
 from regular_languages.helpers import Stream
-from .regex_tokens import ClosureToken, EmptyLangToken, EmptyStrToken, LParenToken, RParenToken, RegexToken, SymbolToken, UnionToken, UnitRegexToken
+from regular_languages.helpers.interval_set import IntervalSet
+from .regex_tokens import CharClassToken, ClosureToken, EmptyLangToken, EmptyStrToken, LParenToken, OptionalToken, PlusToken, RParenToken, RegexToken, RepeatToken, SymbolToken, UnionToken
 
 # NOTE: this entire module could probably use some improvements after I read
 # more about context-free languages, since regular expressions are themselves
@@ -12,8 +14,12 @@ from .regex_tokens import ClosureToken, EmptyLangToken, EmptyStrToken, LParenTok
 class LexerConfig():
     '''
     Defines how the lexer converts symbols to tokens. This is the lexical
-    grammar, but defined without regular expressions. Note that ambiguous
-    configurations should be avoided, and have undefined behavior
+    grammar, but defined without regular expressions.
+
+    Lexing takes the longest symbol that matches at each position. A symbol
+    that is both in the alphabet and an operator symbol is lexed as a symbol
+    of the alphabet. The config is compiled into a lookup table the first
+    time it is used, so it should not be modified after that
     '''
 
     alphabet: Set[str]
@@ -23,6 +29,60 @@ class LexerConfig():
     rparen_symbol: str
     empty_str_symbol: str
     empty_lang_symbol: str
+    optional_symbol: str = "?"
+    plus_symbol: str = "+"
+    repeat_open_symbol: str = "{"
+    repeat_close_symbol: str = "}"
+    repeat_separator_symbol: str = ","
+    class_open_symbol: str = "["
+    class_close_symbol: str = "]"
+    class_negate_symbol: str = "^"
+    class_range_symbol: str = "-"
+    class_escape_symbol: str = "\\"
+
+    @cached_property
+    def token_table(self) -> Dict[str, RegexToken[str]]:
+        '''
+        Maps from each symbol to the token it is lexed to. Tokens are never
+        modified, so a single token is shared by every occurrence of a symbol
+        '''
+
+        token_table: Dict[str, RegexToken[str]] = {
+            self.union_symbol: UnionToken(),
+            self.closure_symbol: ClosureToken(),
+            self.lparen_symbol: LParenToken(),
+            self.rparen_symbol: RParenToken(),
+            self.empty_str_symbol: EmptyStrToken(),
+            self.empty_lang_symbol: EmptyLangToken(),
+            self.optional_symbol: OptionalToken(),
+            self.plus_symbol: PlusToken(),
+            self.repeat_open_symbol: REPEAT_COUNTS,
+            self.class_open_symbol: CHAR_CLASS
+        }
+
+        # Symbols of the alphabet take precedence over the operators
+        token_table.update((symbol, SymbolToken(symbol)) for symbol in self.alphabet)
+
+        if '' in token_table:
+            raise Exception('The symbols of a lexer config cannot be empty')
+
+        return token_table
+
+    @cached_property
+    def symbol_lengths(self) -> List[int]:
+        '''
+        The distinct lengths of the symbols, longest first
+        '''
+
+        return sorted({len(symbol) for symbol in self.token_table}, reverse=True)
+
+# Marks the symbol that opens the counts of a repetition in the token table.
+# The lexer replaces it with a token for the counts that follow it
+REPEAT_COUNTS = RepeatToken(0, None)
+
+# Marks the symbol that opens a character class in the token table. The lexer
+# replaces it with a token for the class that follows it
+CHAR_CLASS = CharClassToken(IntervalSet())
 
 ALPHANUMERIC = "abcdefghijklmnopqrstuvwxyzABCEDFGHIJKLMNOPQRSTUVWXYZ0123456789"
 DEFAULT_LEXER_CONFIG = LexerConfig(
@@ -39,43 +99,122 @@ def lex_regular_expression(regular_expression: str,
         config = DEFAULT_LEXER_CONFIG) -> Stream[RegexToken[str]]:
     '''
     Converts a regular expression encoded in a string to a stream of tokens.
-    Supporting lexing for non-strings doesn't seems worthwhile
+    Supporting lexing for non-strings doesn't seems worthwhile. The tokens
+    are lexed lazily, as the stream is consumed
+    '''
+
+    return Stream.from_iterable(iterate_tokens(regular_expression, config))
+
+def iterate_tokens(regular_expression: str,
+        config = DEFAULT_LEXER_CONFIG) -> Iterator[RegexToken[str]]:
+    '''
+    Generates the tokens of a regular expression
     '''
 
-    token_symbol_map: Dict[Type[UnitRegexToken], str] = {
-        UnionToken: config.union_symbol,
-        ClosureToken: config.closure_symbol,
-        LParenToken: config.lparen_symbol,
-        RParenToken: config.rparen_symbol,
-        EmptyStrToken: config.empty_str_symbol,
-        EmptyLangToken: config.empty_lang_symbol
-    }
+    return (token for token, _ in iterate_positioned_tokens(regular_expression, config))
+
+def iterate_positioned_tokens(regular_expression: str,
+        config = DEFAULT_LEXER_CONFIG) -> Iterator[Tuple[RegexToken[str], int]]:
+    '''
+    Generates the tokens of a regular expression, with the index in the
+    string that each token starts at. Takes the longest symbol in the config
+    that matches at each position, so each position only costs a lookup for
+    each distinct symbol length
+    '''
+
+    token_table, symbol_lengths = config.token_table, config.symbol_lengths
     index = 0
-    tokens: List[RegexToken[str]] = []
 
     while index < len(regular_expression):
-        alpha_match = False
-        for symbol in config.alphabet:
-            if regular_expression[index:index+len(symbol)] == symbol:
-                tokens.append(SymbolToken(symbol))
-                index += len(symbol)
-                alpha_match = True
+        for length in symbol_lengths:
+            token = token_table.get(regular_expression[index:index + length])
+
+            if token is REPEAT_COUNTS:
+                token, end = lex_repeat_counts(regular_expression, index + length, config)
+                yield token, index
+                index = end
                 break
 
-        if alpha_match:
-            continue
+            if token is CHAR_CLASS:
+                token, end = lex_char_class(regular_expression, index + length, config)
+                yield token, index
+                index = end
+                break
 
-        simple_match = False
-        for token, symbol in token_symbol_map.items():
-            if regular_expression[index:index + len(symbol)] == symbol:
-                tokens.append(token())
-                index += len(symbol)
-                simple_match = True
+            if token is not None:
+                yield token, index
+                index += length
                 break
 
-        if simple_match:
-            continue
+        else:
+            raise Exception(f'Encountered invalid symbol in regular expression at position {index}: "{regular_expression[index]}"')
+
+def lex_repeat_counts(regular_expression: str, index: int, config: LexerConfig) -> Tuple[RepeatToken, int]:
+    '''
+    Lexes the counts of a repetition, {m}, {m,} or {m,n}, starting just after
+    the opening symbol. Returns the token, and the index after the closing
+    symbol
+    '''
+
+    end = regular_expression.find(config.repeat_close_symbol, index)
+
+    if end == -1:
+        raise Exception(f'Unterminated repetition in regular expression at position {index}')
+
+    counts = regular_expression[index:end].split(config.repeat_separator_symbol)
+
+    if not 1 <= len(counts) <= 2 or not counts[0].isdecimal() or\
+            (len(counts) == 2 and counts[1] != '' and not counts[1].isdecimal()):
+        raise Exception(f'Invalid repetition counts in regular expression at position {index}: "{regular_expression[index:end]}"')
+
+    min_count = int(counts[0])
+    max_count = min_count if len(counts) == 1 else (None if counts[1] == '' else int(counts[1]))
+
+    if max_count is not None and max_count < min_count:
+        raise Exception(f'Invalid repetition counts in regular expression at position {index}: "{regular_expression[index:end]}"')
+
+    return RepeatToken(min_count, max_count), end + len(config.repeat_close_symbol)
+
+def lex_char_class(regular_expression: str, index: int, config: LexerConfig) -> Tuple[CharClassToken, int]:
+    '''
+    Lexes a character class like [a-z_] or [^0-9], starting just after the
+    opening symbol. Characters in the class can be escaped to include the
+    special symbols of classes. Returns the token, and the index after the
+    closing symbol
+    '''
+
+    start = index
+    negated = regular_expression.startswith(config.class_negate_symbol, index)
+    index += len(config.class_negate_symbol) if negated else 0
+    intervals = []
+
+    while not regular_expression.startswith(config.class_close_symbol, index):
+        first, index = lex_class_char(regular_expression, index, start, config)
+        last = first
+
+        # A range symbol right before the closing symbol is a literal
+        if regular_expression.startswith(config.class_range_symbol, index) and\
+                not regular_expression.startswith(config.class_close_symbol, index + len(config.class_range_symbol)):
+            last, index = lex_class_char(regular_expression, index + len(config.class_range_symbol), start, config)
+
+        if last < first:
+            raise Exception(f'Invalid range in character class at position {start}: "{first}-{last}"')
+
+        intervals.append((ord(first), ord(last)))
+
+    chars = IntervalSet.from_intervals(intervals)
+
+    return CharClassToken(chars.complement() if negated else chars), index + len(config.class_close_symbol)
+
+def lex_class_char(regular_expression: str, index: int, start: int, config: LexerConfig) -> Tuple[str, int]:
+    '''
+    Lexes a single, possibly escaped, character of a character class
+    '''
+
+    if regular_expression.startswith(config.class_escape_symbol, index):
+        index += len(config.class_escape_symbol)
 
-        raise Exception(f'Encountered invalid symbol in regular expression: "{regular_expression[index]}"')
+    if index >= len(regular_expression):
+        raise Exception(f'Unterminated character class in regular expression at position {start}')
 
-    return Stream.from_iterable(tokens)
+    return regular_expression[index], index + 1
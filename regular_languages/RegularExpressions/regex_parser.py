@@ -1,6 +1,6 @@
 from typing import List, TypeVar, get_args
-from regular_languages.RegularExpressions.regex_tokens import ClosureToken, EmptyLangToken, EmptyStrToken, LParenToken, RParenToken, RegexToken, SymbolToken, UnionToken
-from regular_languages.RegularExpressions.regex_ast import ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, RegexAST, SymbolNode, UnionNode
+from regular_languages.RegularExpressions.regex_tokens import CharClassToken, ClosureToken, EmptyLangToken, EmptyStrToken, LParenToken, OptionalToken, PlusToken, PostfixToken, RParenToken, RegexToken, RepeatToken, SymbolToken, UnionToken
+from regular_languages.RegularExpressions.regex_ast import CharClassNode, ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, OptionalNode, PlusNode, RegexAST, RepeatNode, SymbolNode, UnionNode
 from regular_languages.helpers import Stream
 
 U = TypeVar('U')
@@ -28,27 +28,32 @@ def parse_regular_expression(token_stream: Stream[RegexToken[U]]) -> RegexAST[U]
             case [
                 *rest,
                 LParenToken(),
-                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() as enclosed,
+                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() |\
+                        OptionalNode() | PlusNode() | RepeatNode() | CharClassNode() as enclosed,
                 RParenToken()
             ]:
                 for _ in range(3): stack.pop()
                 stack.append(enclosed)
 
-            # Closure has highest precedence, so reduce that next
+            # Closure and the other postfix operators have highest
+            # precedence, so reduce them next
             case [
                 *rest,
-                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() as child,
-                ClosureToken()
+                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() |\
+                        OptionalNode() | PlusNode() | RepeatNode() | CharClassNode() as child,
+                ClosureToken() | OptionalToken() | PlusToken() | RepeatToken() as operator
             ]:
                 for _ in range(2): stack.pop()
-                stack.append(ClosureNode(child))
+                stack.append(apply_postfix_operator(child, operator))
 
             # Reduce concatenation if next token in stream is not a closure token
             case [
                 *rest,
-                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() as left,
-                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() as right
-            ] if not isinstance(token_stream.peek(), ClosureToken):
+                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() |\
+                        OptionalNode() | PlusNode() | RepeatNode() | CharClassNode() as left,
+                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() |\
+                        OptionalNode() | PlusNode() | RepeatNode() | CharClassNode() as right
+            ] if not isinstance(token_stream.peek(), PostfixToken):
                 for _ in range(2): stack.pop()
                 stack.append(ConcatNode(left, right))
 
@@ -56,13 +61,17 @@ def parse_regular_expression(token_stream: Stream[RegexToken[U]]) -> RegexAST[U]
             # reduction
             case [
                 *rest,
-                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() as left,
+                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() |\
+                        OptionalNode() | PlusNode() | RepeatNode() | CharClassNode() as left,
                 UnionToken(),
-                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() as right
-            ] if not isinstance(token_stream.peek(), ClosureToken) and\
+                ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() |\
+                        OptionalNode() | PlusNode() | RepeatNode() | CharClassNode() as right
+            ] if not isinstance(token_stream.peek(), PostfixToken) and\
                     not isinstance(token_stream.peek(), SymbolToken) and\
+                    not isinstance(token_stream.peek(), CharClassToken) and\
                     not isinstance(token_stream.peek(), EmptyLangToken) and\
-                    not isinstance(token_stream.peek(), EmptyStrToken):
+                    not isinstance(token_stream.peek(), EmptyStrToken) and\
+                    not isinstance(token_stream.peek(), LParenToken):
                 for _ in range(3): stack.pop()
                 stack.append(UnionNode(left, right))
 
@@ -74,6 +83,9 @@ def parse_regular_expression(token_stream: Stream[RegexToken[U]]) -> RegexAST[U]
                     case SymbolToken(symbol):
                         stack.append(SymbolNode(symbol))
 
+                    case CharClassToken(chars):
+                        stack.append(CharClassNode(chars))
+
                     case EmptyStrToken():
                         stack.append(EmptyStrNode())
 
@@ -87,8 +99,27 @@ def parse_regular_expression(token_stream: Stream[RegexToken[U]]) -> RegexAST[U]
                 raise Exception('Invalid syntax')
 
     match stack[0]:
-        case ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode():
+        case ClosureNode() | ConcatNode() | EmptyLangNode() | EmptyStrNode() | SymbolNode() | UnionNode() |\
+                OptionalNode() | PlusNode() | RepeatNode() | CharClassNode():
             return stack[0]
 
         case _:
             raise Exception('Invalid syntax')
+
+def apply_postfix_operator(child: RegexAST[U], operator: PostfixToken) -> RegexAST[U]:
+    '''
+    Builds the node for a postfix operator applied to an expression
+    '''
+
+    match operator:
+        case ClosureToken():
+            return ClosureNode(child)
+
+        case OptionalToken():
+            return OptionalNode(child)
+
+        case PlusToken():
+            return PlusNode(child)
+
+        case RepeatToken(min, max):
+            return RepeatNode(child, min, max)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple, TypeVar
+from regular_languages.RegularExpressions.regex_tokens import CharClassToken, ClosureToken, EmptyLangToken, EmptyStrToken, LParenToken, OptionalToken, PlusToken, RParenToken, RegexToken, RepeatToken, SymbolToken, UnionToken
+from regular_languages.RegularExpressions.regex_ast import CharClassNode, ConcatNode, EmptyLangNode, EmptyStrNode, RegexAST, SymbolNode, UnionNode
+from regular_languages.RegularExpressions.regex_parser import apply_postfix_operator
+
+U = TypeVar('U')
+
+@dataclass
+class ParseFrame():
+    '''
+    The state of parsing a single (possibly parenthesized) expression: the
+    alternatives of the union completed so far, and the factors of the
+    concatenation in progress
+    '''
+
+    # The position of the opening parenthesis, or -1 for the whole expression
+    position: int
+
+    alternatives: List[RegexAST] = field(default_factory=list)
+    factors: List[RegexAST] = field(default_factory=list)
+
+def parse_regular_expression_by_precedence(tokens: Iterable[Tuple[RegexToken[U], int]]) -> RegexAST[U]:
+    '''
+    Parses a regex from its tokens, each paired with its position in the
+    source, in a single pass. The grammar is parsed by precedence: closures
+    and the other postfix operators bind tightest, then concatenation, then
+    union.
+
+    Each token is handled in constant time (apart from building the nodes),
+    and parentheses push a frame onto an explicit stack rather than
+    recursing, so parsing is linear in the number of tokens for any nesting.
+    Produces the same AST as parse_regular_expression
+    '''
+
+    frames = [ParseFrame(-1)]
+
+    for token, position in tokens:
+        frame = frames[-1]
+
+        match token:
+            case SymbolToken(symbol):
+                frame.factors.append(SymbolNode(symbol))
+
+            case CharClassToken(chars):
+                frame.factors.append(CharClassNode(chars))
+
+            case EmptyStrToken():
+                frame.factors.append(EmptyStrNode())
+
+            case EmptyLangToken():
+                frame.factors.append(EmptyLangNode())
+
+            case ClosureToken() | OptionalToken() | PlusToken() | RepeatToken():
+                if len(frame.factors) == 0:
+                    raise Exception(f'Invalid syntax at position {position}: postfix operator applied to nothing')
+
+                frame.factors[-1] = apply_postfix_operator(frame.factors[-1], token)
+
+            case UnionToken():
+                if len(frame.factors) == 0:
+                    raise Exception(f'Invalid syntax at position {position}: empty alternative')
+
+                frame.alternatives.append(ConcatNode(*frame.factors))
+                frame.factors = []
+
+            case LParenToken():
+                frames.append(ParseFrame(position))
+
+            case RParenToken():
+                if len(frames) == 1:
+                    raise Exception(f'Invalid syntax at position {position}: unmatched closing parenthesis')
+
+                if len(frame.factors) == 0:
+                    raise Exception(f'Invalid syntax at position {position}: empty expression')
+
+                frames.pop()
+                frames[-1].factors.append(complete_frame(frame))
+
+    if len(frames) > 1:
+        raise Exception(f'Invalid syntax at position {frames[-1].position}: unmatched opening parenthesis')
+
+    if len(frames[0].factors) == 0:
+        raise Exception('Invalid syntax at the end of the expression: empty expression')
+
+    return complete_frame(frames[0])
+
+def complete_frame(frame: ParseFrame) -> RegexAST:
+    '''
+    Builds the union of the alternatives of a frame, once all its tokens have
+    been parsed
+    '''
+
+    return UnionNode(*frame.alternatives, ConcatNode(*frame.factors))
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from .regex_ast import ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, RegexAST, SymbolNode, UnionNode
+from typing import List
+from regular_languages.helpers.interval_set import MAX_CODE_POINT
+from .regex_ast import CharClassNode, ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, OptionalNode, PlusNode, RegexAST, RegexNode, RepeatNode, SymbolNode, UnionNode
 
 # TODO: this file could probably use updates once I understand CFLs and yields better
 
@@ -16,6 +18,16 @@ class PrinterConfig():
     rparen_symbol: str
     empty_str_symbol: str
     empty_lang_symbol: str
+    optional_symbol: str = "?"
+    plus_symbol: str = "+"
+    repeat_open_symbol: str = "{"
+    repeat_close_symbol: str = "}"
+    repeat_separator_symbol: str = ","
+    class_open_symbol: str = "["
+    class_close_symbol: str = "]"
+    class_negate_symbol: str = "^"
+    class_range_symbol: str = "-"
+    class_escape_symbol: str = "\\"
 
 DEFAULT_PRINTER_CONFIG = PrinterConfig(
     union_symbol="|",
@@ -28,29 +40,96 @@ DEFAULT_PRINTER_CONFIG = PrinterConfig(
 
 # TODO: avoid adding parnatheses to this string where possible
 def regex_ast_to_string(ast: RegexAST, config=DEFAULT_PRINTER_CONFIG) -> str:
+    '''
+    Converts a regex ast to a string. The string is emitted piece by piece
+    with an explicit stack, so each level of nesting does not copy the
+    strings of the levels below it
+    '''
+
+    pieces: List[str] = []
+    stack: List[str | RegexAST] = [ast]
+
+    while len(stack) > 0:
+        piece = stack.pop()
+
+        if isinstance(piece, RegexNode):
+            # Push the pieces of the node in reverse, so they are emitted in order
+            stack.extend(reversed(node_pieces(piece, config)))
+
+        else:
+            pieces.append(piece)
+
+    return ''.join(pieces)
+
+def node_pieces(ast: RegexAST, config: PrinterConfig) -> List[str | RegexAST]:
+    '''
+    Breaks a single node into the pieces of its string: strings, and the
+    children of the node, which are converted in their place
+    '''
+
     match ast:
         case EmptyLangNode():
-            return f'{config.empty_lang_symbol}'
+            return [f'{config.empty_lang_symbol}']
 
         case EmptyStrNode():
-            return f'{config.empty_str_symbol}'
+            return [f'{config.empty_str_symbol}']
 
         case SymbolNode(symbol):
-            return f'{symbol}'
+            return [f'{symbol}']
+
+        # Classes that reach the last character are printed negated, so
+        # classes like [^\n] print as they are usually written
+        case CharClassNode(chars):
+            negated = bool(chars) and chars.intervals[-1][1] == MAX_CODE_POINT
+            printed = chars.complement() if negated else chars
 
-        case UnionNode(left, right):
-            left_str = regex_ast_to_string(left)
-            right_str = regex_ast_to_string(right)
+            return [config.class_open_symbol, config.class_negate_symbol if negated else '',
+                    *(char_class_interval_to_string(first, last, config) for first, last in printed.intervals),
+                    config.class_close_symbol]
 
-            return f'{config.lparen_symbol}{left_str}{config.union_symbol}{right_str}{config.rparen_symbol}'
+        case UnionNode(children):
+            children_pieces = [piece for child in children for piece in (config.union_symbol, child)]
 
-        case ConcatNode(left, right):
-            left_str = regex_ast_to_string(left)
-            right_str = regex_ast_to_string(right)
+            return [config.lparen_symbol, *children_pieces[1:], config.rparen_symbol]
 
-            return f'{config.lparen_symbol}{left_str}{right_str}{config.rparen_symbol}'
+        case ConcatNode(children):
+            return [config.lparen_symbol, *children, config.rparen_symbol]
 
         case ClosureNode(child):
-            child_str = regex_ast_to_string(child)
+            return [child, config.closure_symbol]
+
+        case OptionalNode(child):
+            return [child, config.optional_symbol]
+
+        case PlusNode(child):
+            return [child, config.plus_symbol]
+
+        case RepeatNode(child, min, max) if min == max:
+            return [child, f'{config.repeat_open_symbol}{min}{config.repeat_close_symbol}']
+
+        case RepeatNode(child, min, max):
+            max_str = '' if max is None else f'{max}'
+
+            return [child, f'{config.repeat_open_symbol}{min}{config.repeat_separator_symbol}{max_str}{config.repeat_close_symbol}']
+
+    raise Exception('A problem occured converting the regular expression to a string')
+
+def char_class_interval_to_string(first: int, last: int, config: PrinterConfig) -> str:
+    '''
+    Converts an interval of code points in a character class to a string,
+    escaping the characters that are special within classes
+    '''
+
+    special_symbols = {config.class_close_symbol, config.class_negate_symbol,
+                       config.class_range_symbol, config.class_escape_symbol}
+
+    def escape(char: str) -> str:
+        return f'{config.class_escape_symbol}{char}' if char in special_symbols else char
+
+    if first == last:
+        return escape(chr(first))
+
+    if first + 1 == last:
+        return f'{escape(chr(first))}{escape(chr(last))}'
 
-            return f'{child_str}{config.closure_symbol}'
+    return f'{escape(chr(first))}{config.class_range_symbol}{escape(chr(last))}'
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from typing import Generic, Sequence, TypeVar
+from typing import Generic, Optional, Sequence, TypeVar
+
+from regular_languages.helpers.interval_set import IntervalSet
 
 U = TypeVar('U')
 
@@ -7,6 +9,10 @@ U = TypeVar('U')
 class SymbolToken(Generic[U]):
     symbol: U
 
+@dataclass
+class CharClassToken:
+    chars: IntervalSet
+
 @dataclass
 class EmptyStrToken:
     pass
@@ -23,6 +29,19 @@ class UnionToken:
 class ClosureToken:
     pass
 
+@dataclass
+class OptionalToken:
+    pass
+
+@dataclass
+class PlusToken:
+    pass
+
+@dataclass
+class RepeatToken:
+    min: int
+    max: Optional[int]
+
 @dataclass
 class LParenToken:
     pass
@@ -31,5 +50,8 @@ class LParenToken:
 class RParenToken:
     pass
 
-UnitRegexToken = EmptyStrToken | EmptyLangToken | UnionToken | ClosureToken | LParenToken | RParenToken
-RegexToken = SymbolToken[U] | UnitRegexToken
+UnitRegexToken = EmptyStrToken | EmptyLangToken | UnionToken | ClosureToken | OptionalToken | PlusToken | LParenToken | RParenToken
+RegexToken = SymbolToken[U] | CharClassToken | RepeatToken | UnitRegexToken
+
+# The tokens of the operators applied to the expression before them
+PostfixToken = ClosureToken | OptionalToken | PlusToken | RepeatToken
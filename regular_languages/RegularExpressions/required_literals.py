@@ -0,0 +1,243 @@
+from dataclasses import dataclass
+from functools import reduce
+from itertools import chain, repeat
+from typing import FrozenSet, Generic, Optional, Tuple, TypeVar
+
+from .regex_ast import CharClassNode, ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, OptionalNode, PlusNode, RegexAST, RepeatNode, SymbolNode, UnionNode
+from .traversal import fold_regex_ast
+
+U = TypeVar('U')
+
+Literal = Tuple[U, ...]
+LiteralSet = FrozenSet[Literal]
+
+# The literal set that carries no information: every string starts with,
+# ends with, and contains the empty string
+NO_LITERALS: LiteralSet = frozenset({()})
+
+# The most copies of a counted repetition that are analyzed
+MAX_UNROLLED_COPIES = 64
+
+@dataclass(frozen=True)
+class RequiredLiterals(Generic[U]):
+    '''
+    Literal strings, as tuples of symbols, that every string matched by a
+    regular expression must contain. Each field is a set of alternatives:
+    every match starts with one of the prefixes, ends with one of the
+    suffixes, and contains one of the factors.
+
+    A set containing only the empty literal carries no information, and an
+    empty set means that nothing can match
+    '''
+
+    prefixes: LiteralSet
+    suffixes: LiteralSet
+    factors: LiteralSet
+
+@dataclass(frozen=True)
+class LiteralInfo(Generic[U]):
+    '''
+    The literal information computed for each node of the AST. The exact
+    field is the complete (finite) language of the node, if it is small enough
+    to track
+    '''
+
+    exact: Optional[LiteralSet]
+    prefixes: LiteralSet
+    suffixes: LiteralSet
+    factors: LiteralSet
+
+# The literal information of an expression that nothing is known about
+UNKNOWN_INFO = LiteralInfo(None, NO_LITERALS, NO_LITERALS, NO_LITERALS)
+
+def extract_required_literals(ast: RegexAST[U], max_literals: int = 16) -> RequiredLiterals[U]:
+    '''
+    Extracts the literal prefixes, suffixes and factors that every string
+    matched by a regular expression ast must contain. Sets of alternatives
+    larger than max_literals are discarded
+    '''
+
+    info = fold_regex_ast(ast, lambda node, info_of: literal_info(node, info_of, max_literals))
+
+    return RequiredLiterals(info.prefixes, info.suffixes, info.factors)
+
+def literal_info(ast: RegexAST[U], info_of, max_literals: int) -> LiteralInfo[U]:
+    '''
+    Computes the literal information for a single node, using the given
+    function to compute the information of its children
+    '''
+
+    match ast:
+        case EmptyLangNode():
+            return from_exact(frozenset())
+
+        case EmptyStrNode():
+            return from_exact(frozenset({()}))
+
+        case SymbolNode(symbol):
+            return from_exact(frozenset({(symbol,)}))
+
+        # A small class is a union of its characters, but a large one would
+        # only be discarded, so it is never enumerated
+        case CharClassNode(chars):
+            if len(chars) > max_literals:
+                return UNKNOWN_INFO
+
+            return from_exact(frozenset((char,) for char in chars))
+
+        case UnionNode(children):
+            return reduce(lambda left, right: union_info(left, right, max_literals),
+                          (info_of(child) for child in children))
+
+        case ConcatNode(children):
+            return reduce(lambda left, right: concat_info(left, right, max_literals),
+                          (info_of(child) for child in children))
+
+        case ClosureNode(child):
+            return closure_info(info_of(child))
+
+        case OptionalNode(child):
+            return union_info(from_exact(frozenset({()})), info_of(child), max_literals)
+
+        case PlusNode(child):
+            child_info = info_of(child)
+
+            return concat_info(child_info, closure_info(child_info), max_literals)
+
+        case RepeatNode(child, min, max):
+            return repeat_info(info_of(child), min, max, max_literals)
+
+    raise Exception('A problem occured extracting literals from the regular expression')
+
+def closure_info(child_info: LiteralInfo) -> LiteralInfo:
+    '''
+    Computes the literal information of the closure of an expression
+    '''
+
+    # The closure of the empty string or empty language is the empty string
+    if child_info.exact is not None and child_info.exact.issubset({()}):
+        return from_exact(frozenset({()}))
+
+    return UNKNOWN_INFO
+
+def repeat_info(child_info: LiteralInfo, min: int, max: Optional[int], max_literals: int) -> LiteralInfo:
+    '''
+    Computes the literal information of a counted repetition, by
+    concatenating the information of its copies: min required copies, then
+    optional copies up to max, or a closure if there is no max. Only a
+    bounded number of copies is unrolled, and the rest are treated as unknown,
+    which loses information but never adds any
+    '''
+
+    optional_info = union_info(from_exact(frozenset({()})), child_info, max_literals)
+    tail = [closure_info(child_info)] if max is None else repeat(optional_info, max - min)
+
+    info = from_exact(frozenset({()}))
+
+    for count, copy_info in enumerate(chain(repeat(child_info, min), tail)):
+        if count == MAX_UNROLLED_COPIES:
+            return concat_info(info, UNKNOWN_INFO, max_literals)
+
+        info = concat_info(info, copy_info, max_literals)
+
+    return info
+
+def union_info(left_info: LiteralInfo, right_info: LiteralInfo, max_literals: int) -> LiteralInfo:
+    '''
+    Combines the literal information of two alternatives
+    '''
+
+    if left_info.exact is not None and right_info.exact is not None:
+        exact = bounded(left_info.exact | right_info.exact, max_literals)
+
+        if exact is not None:
+            return from_exact(exact)
+
+    return LiteralInfo(
+        None,
+        bounded_alternatives(left_info.prefixes | right_info.prefixes, max_literals),
+        bounded_alternatives(left_info.suffixes | right_info.suffixes, max_literals),
+        bounded_alternatives(left_info.factors | right_info.factors, max_literals)
+    )
+
+def concat_info(left_info: LiteralInfo, right_info: LiteralInfo, max_literals: int) -> LiteralInfo:
+    '''
+    Combines the literal information of two consecutive expressions
+    '''
+
+    if left_info.exact is not None and right_info.exact is not None:
+        exact = cross(left_info.exact, right_info.exact, max_literals)
+
+        if exact is not None:
+            return from_exact(exact)
+
+    # A known left side extends the prefixes of the right side, and a
+    # known right side extends the suffixes of the left side
+    prefixes = None
+    if left_info.exact is not None:
+        prefixes = cross(left_info.exact, right_info.prefixes, max_literals)
+
+    suffixes = None
+    if right_info.exact is not None:
+        suffixes = cross(left_info.suffixes, right_info.exact, max_literals)
+
+    # A factor can come from either side, or span the boundary
+    factors = best_factors(left_info.factors, right_info.factors,
+                           cross(left_info.suffixes, right_info.prefixes, max_literals))
+
+    return LiteralInfo(
+        None,
+        normalize(left_info.prefixes if prefixes is None else prefixes),
+        normalize(right_info.suffixes if suffixes is None else suffixes),
+        factors
+    )
+
+def from_exact(exact: LiteralSet) -> LiteralInfo:
+    '''
+    Builds the literal information of a node whose language is known exactly
+    '''
+
+    normalized = normalize(exact)
+
+    return LiteralInfo(exact, normalized, normalized, normalized)
+
+def normalize(literals: LiteralSet) -> LiteralSet:
+    '''
+    A set of alternatives that includes the empty literal carries no
+    information, so it is replaced with the canonical set for that
+    '''
+
+    return NO_LITERALS if () in literals else literals
+
+def bounded(literals: LiteralSet, max_literals: int) -> Optional[LiteralSet]:
+    return literals if len(literals) <= max_literals else None
+
+def bounded_alternatives(literals: LiteralSet, max_literals: int) -> LiteralSet:
+    return normalize(literals) if len(literals) <= max_literals else NO_LITERALS
+
+def cross(left: LiteralSet, right: LiteralSet, max_literals: int) -> Optional[LiteralSet]:
+    '''
+    Concatenates every pair of literals from the two sets, or returns None if
+    the result would have too many literals
+    '''
+
+    if len(left) * len(right) > max_literals:
+        return None
+
+    return frozenset(a + b for a in left for b in right)
+
+def best_factors(*candidates: Optional[LiteralSet]) -> LiteralSet:
+    '''
+    Chooses the most selective set of factors: the one whose shortest literal
+    is longest, preferring fewer alternatives
+    '''
+
+    def score(literals: LiteralSet):
+        # An empty set of alternatives means nothing matches, which is the
+        # most selective factor there is
+        if len(literals) == 0:
+            return (float('inf'), 0)
+
+        return (min(len(literal) for literal in literals), -len(literals))
+
+    return normalize(max((candidate for candidate in candidates if candidate is not None), key=score))
@@ -1,86 +1,65 @@
 from .regex_ast import RegexAST
-from regular_languages.RegularExpressions.regex_ast import ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, SymbolNode, UnionNode
+from regular_languages.RegularExpressions.regex_ast import CharClassNode, ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, OptionalNode, PlusNode, RepeatNode, SymbolNode, UnionNode
+from regular_languages.RegularExpressions.smart_constructors import char_class_of, closure_of, concat_of, optional_of, plus_of, repeat_of, union_of
+from regular_languages.RegularExpressions.traversal import fold_regex_ast
 
 def simplify_regex_ast(ast: RegexAST) -> RegexAST:
     '''
     Simplifies a regex ast using the algebraic properties of ASTs
     Useful for simplifying an AST generated using a GNFA
-    '''
-
-    match ast:
-        # Base case: the basis elements of an AST cannot be simplified
-        case SymbolNode(_) | EmptyLangNode() | EmptyStrNode() as node:
-            return node
-
-        # Recursive cases: simplify the children then detect any patterns
-        # This strategy makes simplification linear w/r/t the nodes in the AST
-        case ClosureNode(child):
-            simplified_child = simplify_regex_ast(child)
-
-            # Match high-level patterns for the closure node
-            match ClosureNode(simplified_child):
-                # Closure of the empty language is the empty string
-                case ClosureNode(EmptyLangNode()):
-                    return EmptyStrNode()
 
-                # Closure of the empty string is the empty string
-                case ClosureNode(EmptyStrNode()):
-                    return EmptyStrNode()
+    Nodes are interned and immutable, so the simplified form of each node is
+    cached on the node itself: shared subtrees, and subtrees simplified by an
+    earlier call, are not simplified again
+    '''
 
-                # Closure of a closure eliminates the redundant closure
-                case ClosureNode(ClosureNode(a)):
-                    return ClosureNode(a)
+    return fold_regex_ast(ast, simplify_and_cache, cached_simplification)
 
-            # No simplification identified
-            return ClosureNode(simplified_child)
+def cached_simplification(ast: RegexAST) -> RegexAST | None:
+    return ast.__dict__.get('_simplified')
 
-        case UnionNode(left, right):
-            left_simplified = simplify_regex_ast(left)
-            right_simplified = simplify_regex_ast(right)
+def simplify_and_cache(ast: RegexAST, simplified_of) -> RegexAST:
+    simplified = simplify_node(ast, simplified_of)
+    object.__setattr__(ast, '_simplified', simplified)
 
-            # Match high-level patterns for union nodes
-            match UnionNode(left_simplified, right_simplified):
-                # Idempotent law
-                case UnionNode(left, right) if left == right:
-                    return left
+    # The simplified form is normalized, so it is its own simplified form
+    if '_simplified' not in simplified.__dict__:
+        object.__setattr__(simplified, '_simplified', simplified)
 
-                # TODO: generalized idempotent law (e.g. \e|1*) Can we detect this generally in an easy way?
-                # (e.g. ((1|2)*)|((12)*) is harder to detect)
+    return simplified
 
-                # Union of a language with the empty language is that language
-                case UnionNode(EmptyLangNode(), a) | UnionNode(a, EmptyLangNode()):
-                    return a
+def simplify_node(ast: RegexAST, simplified_of) -> RegexAST:
+    '''
+    Simplifies a single node, by rebuilding it from its simplified children
+    with the smart constructors, which apply the simplification laws
+    '''
 
-                # Union of the empty string with aa* is a*
-                case UnionNode(EmptyStrNode(), ConcatNode(a, ClosureNode(b)))\
-                        | UnionNode(EmptyStrNode(), ConcatNode(ClosureNode(a), b))\
-                        | UnionNode(ConcatNode(a, ClosureNode(b)), EmptyStrNode())\
-                        | UnionNode(ConcatNode(ClosureNode(a), b), EmptyStrNode())\
-                        if a == b:
-                    return ClosureNode(a)
+    match ast:
+        # Base case: the basis elements of an AST cannot be simplified
+        case SymbolNode(_) | EmptyLangNode() | EmptyStrNode() as node:
+            return node
 
-            # No simplifications identified
-            return UnionNode(left_simplified, right_simplified)
+        case CharClassNode(chars):
+            return char_class_of(chars)
 
-        case ConcatNode(left, right):
-            left_simplified = simplify_regex_ast(left)
-            right_simplified = simplify_regex_ast(right)
+        # Recursive cases: simplify the children then apply the laws
+        # This strategy makes simplification linear w/r/t the nodes in the AST
+        case ClosureNode(child):
+            return closure_of(simplified_of(child))
 
-            match ConcatNode(left_simplified, right_simplified):
-                # Concat with empty string eliminates the empty string
-                case ConcatNode(EmptyStrNode(), a) | ConcatNode(a, EmptyStrNode()):
-                    return a
+        case OptionalNode(child):
+            return optional_of(simplified_of(child))
 
-                # Concat anything with the empty language is the empty language
-                case ConcatNode(EmptyLangNode(), a) | ConcatNode(a, EmptyLangNode()):
-                    return EmptyLangNode()
+        case PlusNode(child):
+            return plus_of(simplified_of(child))
 
+        case RepeatNode(child, min, max):
+            return repeat_of(simplified_of(child), min, max)
 
-                # Concatenation of identical closures is redundant
-                case ConcatNode(ClosureNode(a), ClosureNode(b)) if a == b:
-                    return ClosureNode(a)
+        case UnionNode(children):
+            return union_of(*(simplified_of(child) for child in children))
 
-            # No simplifications identified
-            return ConcatNode(left_simplified, right_simplified)
+        case ConcatNode(children):
+            return concat_of(*(simplified_of(child) for child in children))
 
-    raise Exception('A problem occured simplifying the regular expression')
\ No newline at end of file
+    raise Exception('A problem occured simplifying the regular expression')
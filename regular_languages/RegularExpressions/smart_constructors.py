@@ -0,0 +1,255 @@
+from typing import Iterable, List
+
+from regular_languages.helpers.interval_set import IntervalSet
+
+from .regex_ast import CharClassNode, ClosureNode, ConcatNode, EmptyLangNode, EmptyStrNode, OptionalNode, PlusNode, RegexAST, RepeatNode, SymbolNode, UnionNode
+from .traversal import fold_regex_ast
+
+# Smart constructors build nodes while applying the algebraic laws of regular
+# expressions, so expressions stay normalized as they are built. Given
+# normalized arguments, each returns a normalized expression
+
+def union_of(*asts: RegexAST) -> RegexAST:
+    '''
+    Builds the union of expressions: flattened, without the empty language,
+    without duplicates, and with operands sorted in a canonical order
+    '''
+
+    operands = {operand for ast in asts for operand in union_operands(ast)}
+
+    # Union of a language with the empty language is that language
+    operands.discard(EmptyLangNode())
+
+    # Union of character classes is a single class: [a-c]|[x-z]|d == [a-dx-z]
+    if any(isinstance(operand, CharClassNode) for operand in operands):
+        chars = [operand for operand in operands if isinstance(operand, CharClassNode) or
+                 isinstance(operand, SymbolNode) and isinstance(operand.symbol, str) and len(operand.symbol) == 1]
+
+        operands.difference_update(chars)
+        operands.add(char_class_of(IntervalSet().union(*(
+            operand.chars if isinstance(operand, CharClassNode) else {operand.symbol} for operand in chars))))
+
+    # An operand is redundant when its closure is also an operand: a|a* == a*
+    closure_children = {operand.child for operand in operands if isinstance(operand, ClosureNode)}
+    operands = {operand for operand in operands if operand not in closure_children}
+
+    if EmptyStrNode() in operands:
+        # Union of the empty string with aa* or a*a is a*
+        for operand in list(operands):
+            closure = closure_of_repetition(operand)
+
+            if closure is not None:
+                operands.remove(operand)
+                operands.add(closure)
+
+        # The empty string is redundant when another operand accepts it
+        if any(nullable(operand) for operand in operands if operand != EmptyStrNode()):
+            operands.remove(EmptyStrNode())
+
+    return UnionNode(*sorted(operands, key=lambda operand: operand._serial))
+
+def concat_of(*asts: RegexAST) -> RegexAST:
+    '''
+    Builds the concatenation of expressions: flattened, without empty strings,
+    and with adjacent identical closures merged
+    '''
+
+    operands: List[RegexAST] = []
+
+    for ast in asts:
+        for operand in concat_operands(ast):
+            match operand:
+                # Concat anything with the empty language is the empty language
+                case EmptyLangNode():
+                    return EmptyLangNode()
+
+                # Concat with empty string eliminates the empty string
+                case EmptyStrNode():
+                    continue
+
+                # Concatenation of identical closures is redundant
+                case ClosureNode(_) if len(operands) > 0 and operands[-1] == operand:
+                    continue
+
+            operands.append(operand)
+
+    return ConcatNode(*operands)
+
+def char_class_of(chars: IntervalSet) -> RegexAST:
+    '''
+    Builds a character class: the empty class is the empty language, and a
+    class of a single character is that symbol
+    '''
+
+    if not chars:
+        return EmptyLangNode()
+
+    if len(chars.intervals) == 1 and chars.intervals[0][0] == chars.intervals[0][1]:
+        return SymbolNode(chars.first_char())
+
+    return CharClassNode(chars)
+
+def closure_of(ast: RegexAST) -> RegexAST:
+    '''
+    Builds the closure of an expression
+    '''
+
+    match ast:
+        # Closure of the empty language or the empty string is the empty string
+        case EmptyLangNode() | EmptyStrNode():
+            return EmptyStrNode()
+
+        # Closure of a closure eliminates the redundant closure
+        case ClosureNode(_):
+            return ast
+
+        # The closure of a repetition that can match the child once is the
+        # closure of the child: (a?)* == (a+)* == (a{0,3})* == a*
+        case OptionalNode(child) | PlusNode(child) | RepeatNode(child, 0 | 1, _):
+            return closure_of(child)
+
+        # Closures within the closure of a union are redundant, as is the
+        # empty string: (\e|a*|b)* == (a|b)*
+        case UnionNode(children) if any(unwrap_closure(child) is not child for child in children):
+            return closure_of(union_of(*(unwrap_closure(child) for child in children)))
+
+        # The closure of a concatenation of closures is the closure of their
+        # union: (a*b*)* == (a|b)*
+        case ConcatNode(children) if all(isinstance(child, ClosureNode) for child in children):
+            return closure_of(union_of(*(child.child for child in children)))
+
+    return ClosureNode(ast)
+
+def optional_of(ast: RegexAST) -> RegexAST:
+    '''
+    Builds the union of an expression with the empty string
+    '''
+
+    match ast:
+        case EmptyLangNode():
+            return EmptyStrNode()
+
+        # An expression that accepts the empty string is already optional
+        case _ if nullable(ast):
+            return ast
+
+    return OptionalNode(ast)
+
+def plus_of(ast: RegexAST) -> RegexAST:
+    '''
+    Builds the repetition of an expression one or more times
+    '''
+
+    match ast:
+        # Repeating these expressions does not change their language
+        case EmptyLangNode() | EmptyStrNode() | ClosureNode(_) | PlusNode(_):
+            return ast
+
+        case OptionalNode(child):
+            return closure_of(child)
+
+    return PlusNode(ast)
+
+def repeat_of(ast: RegexAST, min: int, max: int | None) -> RegexAST:
+    '''
+    Builds the repetition of an expression between min and max times,
+    preferring the simpler operators for the bounds they cover
+    '''
+
+    match (min, max):
+        case (0, 0):
+            return EmptyStrNode()
+
+        case (1, 1):
+            return ast
+
+        case (0, None):
+            return closure_of(ast)
+
+        case (1, None):
+            return plus_of(ast)
+
+        case (0, 1):
+            return optional_of(ast)
+
+    match ast:
+        # Repeating these expressions does not change their language
+        case EmptyStrNode() | ClosureNode(_):
+            return ast
+
+        case EmptyLangNode():
+            return EmptyStrNode() if min == 0 else ast
+
+    return RepeatNode(ast, min, max)
+
+def union_operands(ast: RegexAST) -> Iterable[RegexAST]:
+    return ast.children if isinstance(ast, UnionNode) else (ast,)
+
+def concat_operands(ast: RegexAST) -> Iterable[RegexAST]:
+    return ast.children if isinstance(ast, ConcatNode) else (ast,)
+
+def unwrap_closure(ast: RegexAST) -> RegexAST:
+    '''
+    Removes the repetition from an operand of a union within a closure,
+    where the repetition is redundant
+    '''
+
+    match ast:
+        case ClosureNode(child) | OptionalNode(child) | PlusNode(child) | RepeatNode(child, 0 | 1, _):
+            return child
+
+        case EmptyStrNode():
+            return EmptyLangNode()
+
+    return ast
+
+def closure_of_repetition(ast: RegexAST) -> RegexAST | None:
+    '''
+    Recognizes aa*, a*a and a+, returning a*, or returns None
+    '''
+
+    match ast:
+        case PlusNode(child):
+            return closure_of(child)
+
+        case ConcatNode(children) if isinstance(children[-1], ClosureNode) and\
+                children[-1].child == ConcatNode(*children[:-1]):
+            return children[-1]
+
+        case ConcatNode(children) if isinstance(children[0], ClosureNode) and\
+                children[0].child == ConcatNode(*children[1:]):
+            return children[0]
+
+    return None
+
+def nullable(ast: RegexAST) -> bool:
+    '''
+    Determines if an expression accepts the empty string. The result is
+    cached on the node
+    '''
+
+    return fold_regex_ast(ast, nullable_and_cache, lambda node: node.__dict__.get('_nullable'))
+
+def nullable_and_cache(ast: RegexAST, nullable_of) -> bool:
+    match ast:
+        case EmptyStrNode() | ClosureNode(_) | OptionalNode(_):
+            result = True
+
+        case PlusNode(child):
+            result = nullable_of(child)
+
+        case RepeatNode(child, min, _):
+            result = min == 0 or nullable_of(child)
+
+        case EmptyLangNode() | SymbolNode(_) | CharClassNode(_):
+            result = False
+
+        case UnionNode(children):
+            result = any(nullable_of(child) for child in children)
+
+        case ConcatNode(children):
+            result = all(nullable_of(child) for child in children)
+
+    object.__setattr__(ast, '_nullable', result)
+
+    return result
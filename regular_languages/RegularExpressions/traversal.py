@@ -0,0 +1,93 @@
+from typing import Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from .regex_ast import ClosureNode, ConcatNode, OptionalNode, PlusNode, RegexAST, RepeatNode, UnionNode
+
+V = TypeVar('V')
+
+# Computes the result for a single node, given the node and a function that
+# returns the results already computed for its children
+Combine = Callable[[RegexAST, Callable[[RegexAST], V]], V]
+
+# Passes over the AST use an explicit stack instead of recursion, so they
+# handle ASTs of any depth in bounded stack space
+
+def children_of(ast: RegexAST) -> Tuple[RegexAST, ...]:
+    '''
+    Returns the children of a node, in order
+    '''
+
+    match ast:
+        case UnionNode(children) | ConcatNode(children):
+            return children
+
+        case ClosureNode(child) | OptionalNode(child) | PlusNode(child) | RepeatNode(child, _, _):
+            return (child,)
+
+    return ()
+
+def fold_regex_ast(ast: RegexAST, combine: Combine,
+                   cached: Optional[Callable[[RegexAST], Optional[V]]] = None,
+                   results: Optional[Dict[RegexAST, V]] = None) -> V:
+    '''
+    Computes a result for every node of an ast in post-order, combining the
+    results of the children of each node into the result of the node. Nodes
+    are interned, so each distinct node is combined once, even if it is
+    shared by several parents.
+
+    If given, cached returns the result for a node that is already known
+    (or None), in which case the children of that node are not visited.
+    If given, results holds the result of every node combined, and can be
+    shared between folds with the same combine function
+    '''
+
+    results = {} if results is None else results
+
+    # Each entry is a node, and whether its children have been pushed already
+    stack = [(ast, False)]
+
+    while len(stack) > 0:
+        node, expanded = stack.pop()
+
+        if node in results:
+            continue
+
+        if expanded:
+            results[node] = combine(node, results.__getitem__)
+            continue
+
+        if cached is not None:
+            known = cached(node)
+
+            if known is not None:
+                results[node] = known
+                continue
+
+        stack.append((node, True))
+
+        # Push the children in reverse, so they are combined from left to right
+        for child in reversed(children_of(node)):
+            if child not in results:
+                stack.append((child, False))
+
+    return results[ast]
+
+def iterate_post_order(ast: RegexAST) -> Iterator[RegexAST]:
+    '''
+    Iterates over the nodes of an ast in post-order, as if it were a tree:
+    a node shared by several parents is visited once for each parent
+    '''
+
+    # Each entry is a node, and whether its children have been pushed already
+    stack = [(ast, False)]
+
+    while len(stack) > 0:
+        node, expanded = stack.pop()
+
+        if expanded:
+            yield node
+            continue
+
+        stack.append((node, True))
+
+        for child in reversed(children_of(node)):
+            stack.append((child, False))
@@ -0,0 +1,2 @@
+from .regular_language import RegularLanguage
+from .expression import LanguageExpression, Leaf, Union, Intersection, Concat, Closure, Complement, Plan, PlanStep
@@ -0,0 +1,548 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import cached_property
+from math import prod
+from typing import TYPE_CHECKING, Callable, Dict, List, Set, Tuple
+from weakref import WeakValueDictionary
+
+from regular_languages.DFAs.dfa import DFA, LanguageSize
+from regular_languages.NFAs.nfa import NFA, SpecialSymbols
+from regular_languages.Converters import DFA_to_NFA, NFA_to_DFA
+from regular_languages.operators import closure_nfa, complement_dfa, concat_nfa, minimize_dfa, product_dfa, union_nfa
+from regular_languages.operators.union import augment_dfa
+from regular_languages.RegularExpressions.regex_ast import CharClassNode, ClosureNode, ConcatNode, OptionalNode, PlusNode, RegexAST, RepeatNode, SymbolNode, UnionNode
+from regular_languages.RegularExpressions.traversal import fold_regex_ast
+
+if TYPE_CHECKING:
+    from .regular_language import RegularLanguage
+
+# A boolean combination of the DFAs of a product: ('operand', index),
+# ('not', formula), ('and', left, right) or ('or', left, right)
+Formula = Tuple
+
+class InternedExpressionMeta(type):
+    '''
+    Metaclass that hash-conses the nodes of an expression, like the nodes of
+    the regex AST: constructing a node that is structurally equal to a live
+    node returns that same node. Equality between nodes is then an identity
+    check, so hashing a node never walks the expression below it
+    '''
+
+    # Maps from the structural key of each live node to the node
+    interned: WeakValueDictionary = WeakValueDictionary()
+
+    def __call__(cls, *args, **kwargs):
+        if len(kwargs) > 0:
+            args = args + tuple(kwargs[name] for name in cls.__match_args__[len(args):])
+
+        # Languages are mutable, so leaves are keyed by the identity of their
+        # language. The leaf keeps its language alive as long as the key is
+        key = (cls, *(id(arg) if cls is Leaf else arg for arg in args))
+        node = InternedExpressionMeta.interned.get(key)
+
+        if node is None:
+            node = super().__call__(*args)
+            InternedExpressionMeta.interned[key] = node
+
+        return node
+
+class LanguageExpression(metaclass=InternedExpressionMeta):
+    '''
+    Base class for the nodes of a lazy expression over regular languages.
+    Operations only build the expression, and nothing is converted until a
+    query runs, when the whole expression is planned and evaluated at once.
+
+    Nodes are interned, so an expression that appears more than once is the
+    same node, and is planned and evaluated once
+    '''
+
+    def union(self, other: LanguageExpression) -> LanguageExpression:
+        return Union(self, other)
+
+    def intersection(self, other: LanguageExpression) -> LanguageExpression:
+        return Intersection(self, other)
+
+    def concat(self, other: LanguageExpression) -> LanguageExpression:
+        return Concat(self, other)
+
+    def closure(self) -> LanguageExpression:
+        return Closure(self)
+
+    def complement(self) -> LanguageExpression:
+        return Complement(self)
+
+    __or__ = union
+    __and__ = intersection
+    __invert__ = complement
+
+    def plan(self) -> Plan:
+        '''
+        Chooses the representation each operation runs on, and where to
+        determinize and minimize
+        '''
+
+        return Planner().plan_root(self)
+
+    def explain(self) -> str:
+        '''
+        Describes the plan for the expression, with the estimated number of
+        states of each intermediate automaton
+        '''
+
+        return self.plan().explain()
+
+    @cached_property
+    def evaluated(self) -> RegularLanguage:
+        '''
+        The language of the expression, evaluated on first use
+        '''
+
+        return self.plan().run()
+
+    def test(self, test_string) -> bool:
+        return self.evaluated.test(test_string)
+
+    def size(self) -> int | LanguageSize:
+        return self.evaluated.size()
+
+    def equivalent(self, other: LanguageExpression | RegularLanguage) -> bool:
+        if isinstance(other, LanguageExpression):
+            other = other.evaluated
+
+        return self.evaluated.equivalent(other)
+
+@dataclass(frozen=True, eq=False)
+class Leaf(LanguageExpression):
+    '''
+    A language that has already been created. There is one leaf per
+    language, since comparing languages is expensive
+    '''
+
+    language: RegularLanguage
+
+@dataclass(frozen=True, eq=False)
+class Union(LanguageExpression):
+    left: LanguageExpression
+    right: LanguageExpression
+
+@dataclass(frozen=True, eq=False)
+class Intersection(LanguageExpression):
+    left: LanguageExpression
+    right: LanguageExpression
+
+@dataclass(frozen=True, eq=False)
+class Concat(LanguageExpression):
+    left: LanguageExpression
+    right: LanguageExpression
+
+@dataclass(frozen=True, eq=False)
+class Closure(LanguageExpression):
+    child: LanguageExpression
+
+@dataclass(frozen=True, eq=False)
+class Complement(LanguageExpression):
+    child: LanguageExpression
+
+@dataclass(eq=False)
+class PlanStep:
+    '''
+    A step of a plan, which builds an NFA or a DFA from the automata built by
+    its inputs
+    '''
+
+    description: str
+    form: str
+    estimate: int
+    inputs: List[PlanStep]
+    build: Callable
+    alphabet: Set
+
+    # Whether the DFA built is known to be minimal
+    minimal: bool = False
+
+@dataclass
+class Plan:
+    '''
+    The steps to evaluate an expression, in the order they run. Each step
+    appears once, even if several later steps use what it builds
+    '''
+
+    steps: List[PlanStep]
+
+    @property
+    def root(self) -> PlanStep:
+        return self.steps[-1]
+
+    def run(self) -> RegularLanguage:
+        from .regular_language import RegularLanguage
+
+        results: Dict[PlanStep, object] = {}
+
+        for step in self.steps:
+            results[step] = step.build(*(results[input_step] for input_step in step.inputs))
+
+        match self.root:
+            case PlanStep(form='NFA'):
+                return RegularLanguage.from_NFA(results[self.root])
+
+            case PlanStep(minimal=True):
+                return RegularLanguage(_minimal_dfa=results[self.root])
+
+            case _:
+                return RegularLanguage.from_DFA(results[self.root])
+
+    def explain(self) -> str:
+        numbers = {step: number for number, step in enumerate(self.steps, 1)}
+        uses = {step: 0 for step in self.steps}
+
+        for step in self.steps:
+            for input_step in step.inputs:
+                uses[input_step] += 1
+
+        lines = []
+        for step in self.steps:
+            description = ' '.join([step.description, *(f'#{numbers[input_step]}' for input_step in step.inputs)])
+            shared = f' (shared by {uses[step]} steps)' if uses[step] > 1 else ''
+
+            lines.append(f'#{numbers[step]:<3} {description:<48} {step.form:<4} ~{step.estimate} states{shared}')
+
+        return '\n'.join(lines)
+
+class Planner:
+    '''
+    Plans an expression, one step per distinct subexpression and
+    representation. Planning only looks at what each language was created
+    from, so nothing is converted until the plan runs.
+
+    Union, concatenation and closure are cheap on NFAs, so they stay NFAs,
+    and an expression made only of them is never determinized. Complement
+    and intersection need DFAs, so their operands are determinized and
+    minimized first, since product sizes multiply. Nested intersections,
+    complements and unions of DFAs are fused into a single product of all
+    their operands, which only builds the reachable tuples of states once.
+
+    Every step builds its automaton over the alphabet of the step, which for
+    a leaf is the alphabet its language declares, so complements are
+    relative to the declared alphabets even where an automaton was built
+    over fewer symbols
+    '''
+
+    def __init__(self):
+        self.steps: List[PlanStep] = []
+        self.memo: Dict[Tuple[object, str], PlanStep] = {}
+        self.forms: Dict[LanguageExpression, str] = {}
+        self.alphabets: Dict[LanguageExpression, Set] = {}
+
+    def add_step(self, key: Tuple[object, str], *args, **kwargs) -> PlanStep:
+        step = PlanStep(*args, **kwargs)
+
+        self.memo[key] = step
+        self.steps.append(step)
+
+        return step
+
+    def plan_root(self, expression: LanguageExpression) -> Plan:
+        self.plan(expression)
+
+        return Plan(self.steps)
+
+    def plan(self, expression: LanguageExpression) -> PlanStep:
+        '''
+        Plans an expression in the representation it is cheapest to build in
+        '''
+
+        key = (expression, 'natural')
+
+        if key in self.memo:
+            return self.memo[key]
+
+        if self.fusable(expression):
+            return self.plan_product(expression)
+
+        match expression:
+            case Leaf(language) if self.form(expression) == 'DFA':
+                dfa = language._dfa or language._minimal_dfa
+                alphabet = language.alphabet
+
+                return self.add_step(key, 'load DFA', 'DFA', len(dfa.states), [],
+                                     lambda: dfa_over(language.dfa, alphabet), alphabet,
+                                     minimal=dfa is language._minimal_dfa and dfa.alphabet == alphabet)
+
+            case Leaf(language):
+                alphabet = language.alphabet
+
+                return self.add_step(key, 'load NFA', 'NFA', estimate_nfa_states(language), [],
+                                     lambda: nfa_over(language.nfa, alphabet), alphabet)
+
+            case Union(left, right):
+                left_step, right_step = self.plan_nfa(left), self.plan_nfa(right)
+
+                return self.add_step(key, 'union', 'NFA', left_step.estimate + right_step.estimate + 1,
+                                     [left_step, right_step], union_nfa, left_step.alphabet | right_step.alphabet)
+
+            case Concat(left, right):
+                left_step, right_step = self.plan_nfa(left), self.plan_nfa(right)
+
+                return self.add_step(key, 'concat', 'NFA', left_step.estimate + right_step.estimate,
+                                     [left_step, right_step], concat_nfa, left_step.alphabet | right_step.alphabet)
+
+            case Closure(child):
+                child_step = self.plan_nfa(child)
+
+                return self.add_step(key, 'closure', 'NFA', child_step.estimate + 1, [child_step], closure_nfa,
+                                     child_step.alphabet)
+
+            # The complement of a minimal DFA is minimal as well
+            case Complement(child):
+                child_step = self.plan_dfa(child)
+
+                return self.add_step(key, 'complement', 'DFA', child_step.estimate, [child_step], complement_dfa,
+                                     child_step.alphabet, minimal=True)
+
+    def plan_nfa(self, expression: LanguageExpression) -> PlanStep:
+        step = self.plan(expression)
+
+        if step.form == 'NFA':
+            return step
+
+        return self.memo.get((expression, 'NFA')) or \
+            self.add_step((expression, 'NFA'), 'convert to NFA', 'NFA', step.estimate, [step], DFA_to_NFA,
+                          step.alphabet)
+
+    def plan_dfa(self, expression: LanguageExpression) -> PlanStep:
+        '''
+        Plans an expression as a minimal DFA. NFAs are reduced before the
+        subset construction, which only builds the reachable subsets, so its
+        size is estimated as the size of the NFA rather than the exponential
+        worst case
+        '''
+
+        step = self.plan(expression)
+
+        if step.minimal:
+            return step
+
+        if (expression, 'minimal') in self.memo:
+            return self.memo[(expression, 'minimal')]
+
+        if step.form == 'NFA':
+            alphabet = step.alphabet
+            step = self.add_step((expression, 'DFA'), 'reduce and determinize', 'DFA', step.estimate, [step],
+                                 lambda nfa: dfa_over(NFA_to_DFA(nfa.reduce()), alphabet), alphabet)
+
+        return self.add_step((expression, 'minimal'), 'minimize', 'DFA', step.estimate, [step], minimize_dfa,
+                             step.alphabet, minimal=True)
+
+    def fusable(self, expression: LanguageExpression) -> bool:
+        '''
+        Determines if an expression is built as a product of DFAs. Unions are
+        only built as products when both sides are DFAs anyway
+        '''
+
+        match expression:
+            case Intersection(_, _):
+                return True
+
+            case Complement(child):
+                return self.fusable(child)
+
+            case Union(left, right):
+                return self.form(left) == 'DFA' and self.form(right) == 'DFA'
+
+            case _:
+                return False
+
+    def form(self, expression: LanguageExpression) -> str:
+        '''
+        Determines the representation an expression is planned in, without
+        adding any steps
+        '''
+
+        if expression not in self.forms:
+            match expression:
+                case Leaf(language):
+                    has_dfa = language._dfa is not None or language._minimal_dfa is not None
+                    self.forms[expression] = 'DFA' if has_dfa else 'NFA'
+
+                case Union(_, _):
+                    self.forms[expression] = 'DFA' if self.fusable(expression) else 'NFA'
+
+                case Concat(_, _) | Closure(_):
+                    self.forms[expression] = 'NFA'
+
+                case Intersection(_, _) | Complement(_):
+                    self.forms[expression] = 'DFA'
+
+        return self.forms[expression]
+
+    def alphabet(self, expression: LanguageExpression) -> Set:
+        if expression not in self.alphabets:
+            match expression:
+                case Leaf(language):
+                    self.alphabets[expression] = language.alphabet
+
+                case Union(left, right) | Intersection(left, right) | Concat(left, right):
+                    self.alphabets[expression] = self.alphabet(left) | self.alphabet(right)
+
+                case Closure(child) | Complement(child):
+                    self.alphabets[expression] = self.alphabet(child)
+
+        return self.alphabets[expression]
+
+    def plan_product(self, expression: LanguageExpression) -> PlanStep:
+        '''
+        Plans the nested intersections, unions and complements at the top of
+        an expression as a single product of the DFAs below them
+        '''
+
+        operands: List[LanguageExpression] = []
+        complement_alphabets: List[Set] = []
+        formulas: Dict[LanguageExpression, Formula] = {}
+
+        # Shared subexpressions get the same formula, so each is walked once
+        def formula_of(expression: LanguageExpression) -> Formula:
+            if expression in formulas:
+                return formulas[expression]
+
+            match expression:
+                case Intersection(left, right):
+                    formula = ('and', formula_of(left), formula_of(right))
+
+                case Union(left, right) if self.fusable(expression):
+                    formula = ('or', formula_of(left), formula_of(right))
+
+                # The index is taken before the child is walked, since the
+                # complements nested in the child append their own alphabets
+                case Complement(child):
+                    index = len(complement_alphabets)
+                    complement_alphabets.append(self.alphabet(child))
+                    formula = ('not', formula_of(child), index)
+
+                case _:
+                    operands.append(expression)
+                    formula = ('operand', len(operands) - 1)
+
+            formulas[expression] = formula
+
+            return formula
+
+        formula = formula_of(expression)
+        operand_steps = [self.plan_dfa(operand) for operand in operands]
+        alphabet = set().union(*(step.alphabet for step in operand_steps))
+
+        # Complements are relative to the alphabet of what they complement,
+        # which can be smaller than the alphabet of the product, so a DFA
+        # tracking that no other symbol was seen is added for each of those
+        trackers = {}
+        for index, complement_alphabet in enumerate(complement_alphabets):
+            if complement_alphabet != alphabet:
+                trackers[index] = len(operand_steps)
+                operand_steps.append(self.alphabet_step(complement_alphabet))
+
+        accepts = formula_function(formula, trackers)
+        estimate = prod(step.estimate for step in operand_steps)
+
+        return self.add_step((expression, 'natural'), f'product accepting {formula_to_string(formula)} of',
+                             'DFA', estimate, operand_steps, lambda *dfas: product_dfa(dfas, accepts), alphabet)
+
+    def alphabet_step(self, alphabet: Set) -> PlanStep:
+        key = (frozenset(alphabet), 'alphabet')
+
+        return self.memo.get(key) or \
+            self.add_step(key, 'strings over the alphabet', 'DFA', 1, [],
+                          lambda: DFA.from_transition_map({0: {symbol: 0 for symbol in alphabet}}, 0, {0}),
+                          set(alphabet), minimal=True)
+
+def formula_function(formula: Formula, trackers: Dict[int, int]) -> Callable[[Tuple[bool, ...]], bool]:
+    '''
+    Converts a formula to a function of whether each DFA of the product
+    accepts. Complements with a tracker also require it to accept
+    '''
+
+    match formula:
+        case ('operand', index):
+            return lambda accepted: accepted[index]
+
+        case ('not', child, complement_index):
+            child_function = formula_function(child, trackers)
+            tracker = trackers.get(complement_index)
+
+            if tracker is None:
+                return lambda accepted: not child_function(accepted)
+
+            return lambda accepted: accepted[tracker] and not child_function(accepted)
+
+        case ('and', left, right):
+            left_function, right_function = formula_function(left, trackers), formula_function(right, trackers)
+
+            return lambda accepted: left_function(accepted) and right_function(accepted)
+
+        case ('or', left, right):
+            left_function, right_function = formula_function(left, trackers), formula_function(right, trackers)
+
+            return lambda accepted: left_function(accepted) or right_function(accepted)
+
+def formula_to_string(formula: Formula) -> str:
+    match formula:
+        case ('operand', index):
+            return f'${index + 1}'
+
+        case ('not', child, _):
+            return f'not {formula_to_string(child)}'
+
+        case (operation, left, right):
+            return f'({formula_to_string(left)} {operation} {formula_to_string(right)})'
+
+def dfa_over(dfa: DFA, alphabet: Set) -> DFA:
+    '''
+    Extends a DFA to the given alphabet, with the symbols it did not have
+    leading to a dead state
+    '''
+
+    return dfa if dfa.alphabet == alphabet else augment_dfa(dfa, set(alphabet))
+
+def nfa_over(nfa: NFA, alphabet: Set) -> NFA:
+    '''
+    Extends an NFA to the given alphabet, with no transitions on the symbols
+    it did not have
+    '''
+
+    if nfa.alphabet == alphabet:
+        return nfa
+
+    def transition_function(state, symbol):
+        if symbol is SpecialSymbols.EMPTY or symbol in nfa.alphabet:
+            return nfa.transition_function(state, symbol)
+
+        return set()
+
+    return NFA.from_unsafe_transition_func(nfa.states, set(alphabet), transition_function,
+                                           nfa.start_state, nfa.accept_states)
+
+def estimate_nfa_states(language: RegularLanguage) -> int:
+    '''
+    Estimates the number of states of the reduced NFA of a language from the
+    representation it already has. A regex has about one state per position,
+    that is per occurrence of a symbol, plus the start state
+    '''
+
+    if language._nfa is not None:
+        return len(language._nfa.states)
+
+    return fold_regex_ast(language._regex.ast, node_positions) + 1
+
+def node_positions(node: RegexAST, positions_of: Callable[[RegexAST], int]) -> int:
+    match node:
+        case UnionNode(children) | ConcatNode(children):
+            return sum(positions_of(child) for child in children)
+
+        case ClosureNode(child) | OptionalNode(child) | PlusNode(child):
+            return positions_of(child)
+
+        case RepeatNode(child, min_count, max_count):
+            return positions_of(child) * max(min_count if max_count is None else max_count, 1)
+
+        case SymbolNode(_) | CharClassNode(_):
+            return 1
+
+    return 0
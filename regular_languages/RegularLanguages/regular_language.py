@@ -0,0 +1,195 @@
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Iterable, Optional, Set, TypeVar
+
+from regular_languages.DFAs.compiled_dfa import BaseCompiledDFA
+from regular_languages.DFAs.dfa import DFA, LanguageSize
+from regular_languages.NFAs.nfa import NFA
+from regular_languages.RegularExpressions.regex import DEFAULT_REGEX_COMPILER, Regex
+from regular_languages.RegularExpressions.regex_ast import RegexAST
+from regular_languages.Converters import DFA_to_NFA, DFA_to_Regex, NFA_to_DFA, NFA_to_Regex, regex_to_nfa
+from regular_languages.operators import complement_dfa, equivalent_dfa, minimize_dfa
+from regular_languages.operators.union import augment_dfa
+
+U = TypeVar('U')
+
+@dataclass
+class RegularLanguage(Generic[U]):
+    '''
+    A regular language, independent of how it is represented. The language
+    holds the representation it was created from, and converts it to the
+    others only when a query needs them, keeping every converted form so
+    each conversion happens at most once.
+
+    Queries are answered with the cheapest representation at hand: strings
+    are tested against a compiled DFA if there is a DFA, and otherwise by
+    simulating an NFA, which avoids the subset construction entirely
+    '''
+
+    _regex: Optional[Regex[U]] = field(default=None, repr=False)
+    _nfa: Optional[NFA[object, U]] = field(default=None, repr=False)
+    _dfa: Optional[DFA[object, U]] = field(default=None, repr=False)
+    _minimal_dfa: Optional[DFA[object, U]] = field(default=None, repr=False)
+    _compiled: Optional[BaseCompiledDFA[U]] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self._regex is None and self._nfa is None and self._dfa is None and self._minimal_dfa is None:
+            raise Exception('A regular language must be created from at least one representation')
+
+    @classmethod
+    def from_regex(cls, regex: Regex[U]):
+        return cls(_regex=regex)
+
+    @classmethod
+    def from_NFA(cls, nfa: NFA[object, U]):
+        return cls(_nfa=nfa)
+
+    @classmethod
+    def from_DFA(cls, dfa: DFA[object, U]):
+        return cls(_dfa=dfa)
+
+    @classmethod
+    def from_string(cls, regular_expression: str, alphabet: Optional[Set[U]] = None,
+                    compiler: Callable[[str], RegexAST] = DEFAULT_REGEX_COMPILER):
+        return cls(_regex=Regex.from_string(regular_expression, alphabet, compiler))
+
+    def lazy(self):
+        '''
+        Wraps the language in a lazy expression, whose operations are only
+        evaluated when it is queried
+        '''
+
+        from .expression import Leaf
+
+        return Leaf(self)
+
+    @property
+    def alphabet(self) -> Set[U]:
+        '''
+        The alphabet of the representation the language was created from
+        '''
+
+        for representation in (self._regex, self._nfa, self._dfa, self._minimal_dfa):
+            if representation is not None:
+                return representation.alphabet
+
+    @property
+    def regex(self) -> Regex[U]:
+        '''
+        A regular expression for the language, converted from the NFA if there
+        is no DFA yet, rather than determinizing it, or else from the minimal
+        DFA, since eliminating fewer states gives a smaller expression
+        '''
+
+        if self._regex is None:
+            if self._dfa is None and self._minimal_dfa is None:
+                self._regex = NFA_to_Regex(self._nfa)
+
+            else:
+                self._regex = DFA_to_Regex(self.minimal_dfa)
+
+        return self._regex
+
+    @property
+    def nfa(self) -> NFA[object, U]:
+        '''
+        An NFA for the language, built from the regular expression if there is
+        one, since Thompson's construction is cheap, or else from the DFA
+        '''
+
+        if self._nfa is None:
+            if self._regex is not None:
+                self._nfa = regex_to_nfa(self._regex)
+
+            else:
+                self._nfa = DFA_to_NFA(self.dfa)
+
+        return self._nfa
+
+    @property
+    def dfa(self) -> DFA[object, U]:
+        '''
+        A DFA for the language, which is the minimal DFA if it was already
+        computed, or else the subset construction of the reduced NFA
+        '''
+
+        if self._dfa is None:
+            if self._minimal_dfa is not None:
+                self._dfa = self._minimal_dfa
+
+            else:
+                self._dfa = NFA_to_DFA(self.nfa.reduce())
+
+        return self._dfa
+
+    @property
+    def minimal_dfa(self) -> DFA[object, U]:
+        if self._minimal_dfa is None:
+            self._minimal_dfa = minimize_dfa(self.dfa)
+
+        return self._minimal_dfa
+
+    @property
+    def compiled(self) -> BaseCompiledDFA[U]:
+        '''
+        The DFA compiled to a transition table, for testing many strings
+        '''
+
+        if self._compiled is None:
+            self._compiled = self.dfa.compile()
+
+        return self._compiled
+
+    def test(self, test_string: Iterable[U]) -> bool:
+        '''
+        Tests if the given string is in the language. A DFA is compiled on
+        the first test, but an NFA is never determinized just to test strings
+        '''
+
+        if self._compiled is not None or self._dfa is not None or self._minimal_dfa is not None:
+            return self.compiled.test(test_string)
+
+        # The NFA of a regex is only over the symbols the regex uses, which
+        # can be fewer than the declared alphabet, and no other symbol can
+        # lead to an accept state
+        test_string = list(test_string)
+        alphabet = self.nfa.alphabet
+
+        if any(symbol not in alphabet for symbol in test_string):
+            return False
+
+        return self.nfa.test(test_string)
+
+    def equivalent(self, other: 'RegularLanguage[U]') -> bool:
+        '''
+        Determines if the two languages contain exactly the same strings
+        '''
+
+        return equivalent_dfa(self.dfa, other.dfa)
+
+    def complement(self) -> 'RegularLanguage[U]':
+        '''
+        Constructs the complement of the language, over its alphabet. The DFA
+        may be over fewer symbols, like the DFA of a regex that does not use
+        every symbol of its alphabet, so it is augmented to the whole alphabet
+        first. The complement of a minimal DFA over the whole alphabet is
+        itself minimal, so it is kept as such
+        '''
+
+        alphabet = self.alphabet
+
+        if self._minimal_dfa is not None and self._minimal_dfa.alphabet == alphabet:
+            return RegularLanguage(_minimal_dfa=complement_dfa(self._minimal_dfa))
+
+        dfa = self.dfa
+
+        if dfa.alphabet != alphabet:
+            dfa = augment_dfa(dfa, set(alphabet))
+
+        return RegularLanguage(_dfa=complement_dfa(dfa))
+
+    def size(self) -> int | LanguageSize:
+        '''
+        Returns the number of strings in the language, or LanguageSize.INFINITE
+        '''
+
+        return self.dfa.size()
@@ -0,0 +1,4 @@
+from .symbolic_nfa import SymbolicNFA
+from .symbolic_dfa import SymbolicDFA
+from .determinize import symbolic_NFA_to_DFA
+from .products import product_symbolic_dfa, intersection_symbolic_dfa, union_symbolic_dfa, difference_symbolic_dfa
@@ -0,0 +1,40 @@
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, TypeVar
+
+from regular_languages.helpers.interval_set import IntervalSet, minterms
+from .symbolic_dfa import SymbolicDFA
+from .symbolic_nfa import Guards, SymbolicNFA
+
+T = TypeVar('T')
+
+def symbolic_NFA_to_DFA(nfa: SymbolicNFA[T]) -> SymbolicDFA[FrozenSet[T]]:
+    '''
+    Converts a symbolic NFA to an equivalent symbolic DFA with the subset
+    construction. The guards leaving each subset are split into the coarsest
+    classes of characters that no guard distinguishes, so each subset has as
+    many transitions as it has distinct classes, however large the classes
+    are. Classes that lead to the same subset are merged into one guard
+    '''
+
+    start_state = nfa.epsilon_closure({nfa.start_state})
+    transitions: Dict[FrozenSet[T], Guards] = {}
+    stack = [start_state]
+
+    while len(stack) > 0:
+        subset = stack.pop()
+
+        if subset in transitions:
+            continue
+
+        guards = [(guard, dest) for state in subset for guard, dest in nfa.transitions.get(state, ())]
+        targets: Dict[FrozenSet[T], List[IntervalSet]] = defaultdict(list)
+
+        for chars, indices in minterms([guard for guard, _ in guards]):
+            targets[nfa.epsilon_closure(guards[index][1] for index in indices)].append(chars)
+
+        transitions[subset] = [(IntervalSet().union(*classes), dest) for dest, classes in targets.items()]
+        stack.extend(dest for dest in targets if dest not in transitions)
+
+    accept_states = {subset for subset in transitions if not subset.isdisjoint(nfa.accept_states)}
+
+    return SymbolicDFA(set(transitions), transitions, start_state, accept_states)
@@ -0,0 +1,59 @@
+from typing import Callable, Dict, Tuple, TypeVar
+
+from .symbolic_dfa import SymbolicDFA
+from .symbolic_nfa import Guards
+
+T = TypeVar('T')
+V = TypeVar('V')
+
+def product_symbolic_dfa(left: SymbolicDFA[T], right: SymbolicDFA[V],
+                         accept: Callable[[bool, bool], bool]) -> SymbolicDFA[Tuple[T, V]]:
+    '''
+    Builds the product of two symbolic DFAs, over the pairs of states
+    reachable from the pair of start states. The guard of each transition is
+    the intersection of a guard of each DFA, and a pair of states accepts
+    when accept returns True given whether each of its states accepts
+    '''
+
+    # Completing both DFAs means every character is covered by one guard of
+    # each, so union and difference see the strings only one DFA accepts
+    left, right = left.complete(), right.complete()
+
+    start_state = (left.start_state, right.start_state)
+    transitions: Dict[Tuple[T, V], Guards] = {}
+    stack = [start_state]
+
+    while len(stack) > 0:
+        pair = stack.pop()
+
+        if pair in transitions:
+            continue
+
+        left_state, right_state = pair
+        guards = []
+
+        for left_guard, left_dest in left.transitions[left_state]:
+            for right_guard, right_dest in right.transitions[right_state]:
+                chars = left_guard & right_guard
+
+                if chars:
+                    guards.append((chars, (left_dest, right_dest)))
+
+                    if (left_dest, right_dest) not in transitions:
+                        stack.append((left_dest, right_dest))
+
+        transitions[pair] = guards
+
+    accept_states = {(left_state, right_state) for left_state, right_state in transitions
+                     if accept(left_state in left.accept_states, right_state in right.accept_states)}
+
+    return SymbolicDFA(set(transitions), transitions, start_state, accept_states)
+
+def intersection_symbolic_dfa(left: SymbolicDFA, right: SymbolicDFA) -> SymbolicDFA:
+    return product_symbolic_dfa(left, right, lambda left_accepts, right_accepts: left_accepts and right_accepts)
+
+def union_symbolic_dfa(left: SymbolicDFA, right: SymbolicDFA) -> SymbolicDFA:
+    return product_symbolic_dfa(left, right, lambda left_accepts, right_accepts: left_accepts or right_accepts)
+
+def difference_symbolic_dfa(left: SymbolicDFA, right: SymbolicDFA) -> SymbolicDFA:
+    return product_symbolic_dfa(left, right, lambda left_accepts, right_accepts: left_accepts and not right_accepts)
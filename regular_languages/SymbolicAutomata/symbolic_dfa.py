@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Dict, Generic, Iterable, Optional, Set, TypeVar
+
+from regular_languages.DFAs.dfa import DFASpecialStates
+from regular_languages.helpers.interval_set import IntervalSet
+from .symbolic_nfa import Guards
+
+T = TypeVar('T')
+
+@dataclass
+class SymbolicDFA(Generic[T]):
+    '''
+    A DFA over characters whose transitions are labelled with sets of
+    characters. The guards leaving each state are disjoint, so at most one
+    transition applies to each character. Characters with no transition lead
+    to an implicit dead state, unless the DFA is completed
+    '''
+
+    states: Set[T | DFASpecialStates]
+    transitions: Dict[T, Guards]
+    start_state: T
+    accept_states: Set[T]
+
+    def __post_init__(self):
+        if self.start_state not in self.states:
+            raise Exception(f'Start state {self.start_state} is not in the set of states')
+
+        if not self.accept_states.issubset(self.states):
+            raise Exception('The accept states are not a subset of the valid states')
+
+        for state, guards in self.transitions.items():
+            covered = IntervalSet()
+
+            for guard, dest in guards:
+                if state not in self.states or dest not in self.states:
+                    raise Exception(f'Transition from {state} to {dest} is not between valid states')
+
+                if not covered.isdisjoint(guard):
+                    raise Exception(f'The transitions from state {state} overlap')
+
+                covered |= guard
+
+    @property
+    def alphabet(self) -> IntervalSet:
+        '''
+        The characters that label any transition
+        '''
+
+        return IntervalSet().union(*(guard for guards in self.transitions.values() for guard, _ in guards))
+
+    def step(self, state: T, char: str) -> Optional[T]:
+        '''
+        Returns the state reached from a state on a character, or None if
+        there is no transition for it
+        '''
+
+        for guard, dest in self.transitions.get(state, ()):
+            if char in guard:
+                return dest
+
+        return None
+
+    def simulate(self, test_string: Iterable[str]) -> Optional[T]:
+        '''
+        Simulates the DFA, returning the resulting state, or None if it fell
+        into the implicit dead state
+        '''
+
+        curr_state = self.start_state
+
+        for char in test_string:
+            curr_state = self.step(curr_state, char)
+
+            if curr_state is None:
+                return None
+
+        return curr_state
+
+    def test(self, test_string: Iterable[str]) -> bool:
+        '''
+        Tests if the given string is accepted by the DFA
+        '''
+
+        return self.simulate(test_string) in self.accept_states
+
+    def complete(self):
+        '''
+        Returns an equivalent DFA with a transition for every character from
+        every state, adding a dead state for the characters that had none
+        '''
+
+        transitions = {}
+        needs_dead_state = False
+
+        for state in self.states:
+            guards = list(self.transitions.get(state, ()))
+            uncovered = IntervalSet().union(*(guard for guard, _ in guards)).complement()
+
+            if uncovered:
+                guards.append((uncovered, DFASpecialStates.DEAD))
+                needs_dead_state = True
+
+            transitions[state] = guards
+
+        states = set(self.states)
+
+        if needs_dead_state and DFASpecialStates.DEAD not in states:
+            states.add(DFASpecialStates.DEAD)
+            transitions[DFASpecialStates.DEAD] = [(IntervalSet.universe(), DFASpecialStates.DEAD)]
+
+        return SymbolicDFA(states, transitions, self.start_state, set(self.accept_states))
+
+    def complement(self):
+        '''
+        Returns a DFA that recognizes every string of characters this DFA
+        rejects
+        '''
+
+        complete = self.complete()
+
+        return SymbolicDFA(complete.states, complete.transitions, complete.start_state,
+                           complete.states.difference(complete.accept_states))
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Generic, Iterable, List, Set, Tuple, TypeVar
+
+from regular_languages.helpers.interval_set import IntervalSet
+
+T = TypeVar('T')
+
+# The transitions leaving a state: each is labelled with a set of characters,
+# and is taken on any character in the set
+Guards = List[Tuple[IntervalSet, T]]
+
+@dataclass
+class SymbolicNFA(Generic[T]):
+    '''
+    An NFA over characters whose transitions are labelled with sets of
+    characters rather than single symbols. The size of the automaton depends
+    on the number of distinct classes of characters, not on the size of the
+    alphabet, so classes like [^\\n] over all of Unicode are cheap
+    '''
+
+    states: Set[T]
+    transitions: Dict[T, Guards]
+    epsilon_transitions: Dict[T, Set[T]]
+    start_state: T
+    accept_states: Set[T]
+
+    def __post_init__(self):
+        if self.start_state not in self.states:
+            raise Exception(f'Start state {self.start_state} is not in the set of states')
+
+        if not self.accept_states.issubset(self.states):
+            raise Exception('The accept states are not a subset of the valid states')
+
+        for state, guards in self.transitions.items():
+            for _, dest in guards:
+                if state not in self.states or dest not in self.states:
+                    raise Exception(f'Transition from {state} to {dest} is not between valid states')
+
+    @property
+    def alphabet(self) -> IntervalSet:
+        '''
+        The characters that label any transition
+        '''
+
+        return IntervalSet().union(*(guard for guards in self.transitions.values() for guard, _ in guards))
+
+    def epsilon_closure(self, states: Iterable[T]) -> FrozenSet[T]:
+        '''
+        Computes the states reachable from the given states by empty
+        transitions alone
+        '''
+
+        closure = set(states)
+        stack = list(closure)
+
+        while len(stack) > 0:
+            for next_state in self.epsilon_transitions.get(stack.pop(), ()):
+                if next_state not in closure:
+                    closure.add(next_state)
+                    stack.append(next_state)
+
+        return frozenset(closure)
+
+    def move(self, states: Iterable[T], char: str) -> FrozenSet[T]:
+        '''
+        Computes the epsilon closure of the states reached from the given
+        states on a character
+        '''
+
+        return self.epsilon_closure(dest for state in states
+                                    for guard, dest in self.transitions.get(state, ())
+                                    if char in guard)
+
+    def simulate(self, test_string: Iterable[str]) -> FrozenSet[T]:
+        '''
+        Simulates the NFA, returning the set of states it ends in
+        '''
+
+        curr_states = self.epsilon_closure({self.start_state})
+
+        for char in test_string:
+            curr_states = self.move(curr_states, char)
+
+        return curr_states
+
+    def test(self, test_string: Iterable[str]) -> bool:
+        '''
+        Tests if the given string is accepted by the NFA
+        '''
+
+        return not self.simulate(test_string).isdisjoint(self.accept_states)
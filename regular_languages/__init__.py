@@ -1,5 +1,8 @@
 from .DFAs import DFA
 from .NFAs import NFA
 from .RegularExpressions import Regex
-from .converters import NFA_to_DFA, DFA_to_NFA, regex_to_nfa, DFA_to_Regex
+from .Converters import NFA_to_DFA, DFA_to_NFA, regex_to_nfa, DFA_to_Regex, NFA_to_Regex
 from .operators import minimize_dfa
+from .PatternSets import PatternSet, compile_pattern_set
+from .search import Searcher
+from .RegularLanguages import RegularLanguage
@@ -1,2 +1,3 @@
 from .stream import Stream
 from .partition_refinement import PartitionRefinement
+from .interval_set import IntervalSet, minterms
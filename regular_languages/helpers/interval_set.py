@@ -0,0 +1,240 @@
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Set
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Sequence, Tuple
+
+# The largest Unicode code point
+MAX_CODE_POINT = 0x10FFFF
+
+Interval = Tuple[int, int]
+
+@dataclass(frozen=True)
+class IntervalSet(Set):
+    '''
+    A set of characters, stored as sorted, disjoint ranges of code points.
+    Each interval is inclusive of both ends, and adjacent intervals are
+    merged, so equal sets have equal intervals.
+
+    It acts as a set of single character strings, but its size and the cost
+    of the set operations depend on the number of intervals rather than the
+    number of characters, so it can represent classes like "every character
+    but a newline" over all of Unicode
+    '''
+
+    intervals: Tuple[Interval, ...] = ()
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[Interval]):
+        '''
+        Constructs the set from any intervals, which may overlap or be out of
+        order
+        '''
+
+        merged: List[List[int]] = []
+
+        for first, last in sorted(intervals):
+            if first > last or first < 0 or last > MAX_CODE_POINT:
+                raise Exception(f'Invalid interval of code points: {(first, last)}')
+
+            if len(merged) > 0 and first <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], last)
+
+            else:
+                merged.append([first, last])
+
+        return cls(tuple((first, last) for first, last in merged))
+
+    @classmethod
+    def from_range(cls, first: str, last: str):
+        '''
+        Constructs the set of characters from first to last, inclusive
+        '''
+
+        return cls.from_intervals([(ord(first), ord(last))])
+
+    @classmethod
+    def from_chars(cls, chars: Iterable[str]):
+        '''
+        Constructs the set of the given characters
+        '''
+
+        code_points = []
+
+        for char in chars:
+            if not isinstance(char, str) or len(char) != 1:
+                raise Exception(f'{char!r} is not a single character')
+
+            code_points.append(ord(char))
+
+        return cls.from_intervals((code_point, code_point) for code_point in code_points)
+
+    # Used by the mixin methods of Set to build new sets
+    _from_iterable = from_chars
+
+    @classmethod
+    def universe(cls):
+        '''
+        Constructs the set of every character
+        '''
+
+        return cls(((0, MAX_CODE_POINT),))
+
+    def __contains__(self, char) -> bool:
+        if not isinstance(char, str) or len(char) != 1:
+            return False
+
+        code_point = ord(char)
+        index = bisect_right(self.intervals, (code_point, MAX_CODE_POINT)) - 1
+
+        return index >= 0 and self.intervals[index][0] <= code_point <= self.intervals[index][1]
+
+    def __iter__(self) -> Iterator[str]:
+        for first, last in self.intervals:
+            for code_point in range(first, last + 1):
+                yield chr(code_point)
+
+    def __len__(self) -> int:
+        return sum(last - first + 1 for first, last in self.intervals)
+
+    def __bool__(self) -> bool:
+        return len(self.intervals) > 0
+
+    def __and__(self, other):
+        if not isinstance(other, IntervalSet):
+            return super().__and__(other)
+
+        # Walk both lists of intervals, advancing past the one ending first
+        intervals = []
+        i, j = 0, 0
+
+        while i < len(self.intervals) and j < len(other.intervals):
+            first = max(self.intervals[i][0], other.intervals[j][0])
+            last = min(self.intervals[i][1], other.intervals[j][1])
+
+            if first <= last:
+                intervals.append((first, last))
+
+            if self.intervals[i][1] < other.intervals[j][1]:
+                i += 1
+
+            else:
+                j += 1
+
+        return IntervalSet(tuple(intervals))
+
+    def __or__(self, other):
+        if not isinstance(other, IntervalSet):
+            return super().__or__(other)
+
+        return IntervalSet.from_intervals(self.intervals + other.intervals)
+
+    def __sub__(self, other):
+        if not isinstance(other, IntervalSet):
+            return super().__sub__(other)
+
+        return self & other.complement()
+
+    def __le__(self, other):
+        if not isinstance(other, IntervalSet):
+            return super().__le__(other)
+
+        return self & other == self
+
+    def __ge__(self, other):
+        if not isinstance(other, IntervalSet):
+            return super().__ge__(other)
+
+        return other <= self
+
+    def isdisjoint(self, other) -> bool:
+        if not isinstance(other, IntervalSet):
+            return super().isdisjoint(other)
+
+        return not self & other
+
+    def issubset(self, other: Iterable) -> bool:
+        return self <= (other if isinstance(other, (IntervalSet, Set)) else set(other))
+
+    def issuperset(self, other: Iterable) -> bool:
+        if isinstance(other, IntervalSet):
+            return other <= self
+
+        return all(char in self for char in other)
+
+    def union(self, *others: Iterable[str]):
+        '''
+        Computes the union with any number of interval sets or collections of
+        characters
+        '''
+
+        others = [other if isinstance(other, IntervalSet) else IntervalSet.from_chars(other) for other in others]
+
+        return IntervalSet.from_intervals(self.intervals + tuple(interval for other in others for interval in other.intervals))
+
+    def complement(self):
+        '''
+        Computes the set of every character that is not in this set
+        '''
+
+        intervals = []
+        next_first = 0
+
+        for first, last in self.intervals:
+            if next_first < first:
+                intervals.append((next_first, first - 1))
+
+            next_first = last + 1
+
+        if next_first <= MAX_CODE_POINT:
+            intervals.append((next_first, MAX_CODE_POINT))
+
+        return IntervalSet(tuple(intervals))
+
+    def first_char(self) -> str:
+        '''
+        Returns the smallest character in the set
+        '''
+
+        if not self:
+            raise Exception('The set of characters is empty')
+
+        return chr(self.intervals[0][0])
+
+def minterms(sets: Sequence[IntervalSet]) -> List[Tuple[IntervalSet, FrozenSet[int]]]:
+    '''
+    Partitions the characters in any of the sets into the coarsest classes
+    that no set splits: every set is a union of classes. Returns each class,
+    with the indices of the sets that contain it.
+
+    Sweeps over the ends of the intervals, so the work depends on the number
+    of intervals rather than the number of characters
+    '''
+
+    # At each boundary, the sets whose intervals start and end there
+    starts: Dict[int, List[int]] = defaultdict(list)
+    ends: Dict[int, List[int]] = defaultdict(list)
+
+    for index, interval_set in enumerate(sets):
+        for first, last in interval_set.intervals:
+            starts[first].append(index)
+            ends[last + 1].append(index)
+
+    classes: Dict[FrozenSet[int], List[Interval]] = defaultdict(list)
+    active: Dict[int, int] = defaultdict(int)
+    boundaries = sorted(starts.keys() | ends.keys())
+
+    for boundary, next_boundary in zip(boundaries, boundaries[1:]):
+        for index in ends.get(boundary, ()):
+            active[index] -= 1
+
+            if active[index] == 0:
+                del active[index]
+
+        for index in starts.get(boundary, ()):
+            active[index] += 1
+
+        if len(active) > 0:
+            classes[frozenset(active)].append((boundary, next_boundary - 1))
+
+    return [(IntervalSet.from_intervals(intervals), indices) for indices, intervals in classes.items()]
@@ -1,51 +1,70 @@
-from dataclasses import dataclass
-from typing import Generic, Iterable, List, Optional, TypeVar
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Generic, Iterable, Iterator, Optional, TypeVar
 
 U = TypeVar('U')
 
 @dataclass
 class Stream(Generic[U]):
     '''
-    A data structure that represents a consumable stream of some objects
+    A data structure that represents a consumable stream of some objects.
+    Objects are only pulled from the source as far as the stream is peeked
+    at or consumed, so the source can be a lazy generator
     '''
 
-    data: List[U]
-    index: int
+    source: Iterator[U]
+
+    # The objects pulled from the source that have not been consumed yet
+    lookahead: Deque[U] = field(default_factory=deque)
 
     @classmethod
     def from_iterable(cls, data: Iterable[U]):
-        return cls(list(data), 0)
+        return cls(iter(data))
 
-    def peek(self, offset: int = 0) -> Optional[U]:
+    def fill(self, count: int) -> bool:
         '''
-        Peek at a token in the stream with the given offset
+        Pulls objects from the source until the given number of objects are
+        available, returning whether there were enough
         '''
 
-        effective_index = self.index + offset
+        while len(self.lookahead) < count:
+            next_object = next(self.source, self.lookahead)
+
+            # The lookahead itself is never in the source, so it marks the end
+            if next_object is self.lookahead:
+                return False
+
+            self.lookahead.append(next_object)
+
+        return True
 
-        if not 0 <= effective_index < len(self.data):
+    def peek(self, offset: int = 0) -> Optional[U]:
+        '''
+        Peek at a token in the stream with the given offset. Tokens that have
+        been consumed are no longer available
+        '''
+
+        if offset < 0 or not self.fill(offset + 1):
             return None
 
-        return self.data[effective_index]
+        return self.lookahead[offset]
 
     def consume(self, number: int = 1) -> U:
         '''
         Consumes the given number of tokens, returning the last token consumed
         '''
 
-        effective_index = self.index + number
-
         if number <= 0:
             raise Exception('Must consume 1 or more tokens')
 
-        # We can consume all tokens, make effective index the length
-        if effective_index > len(self.data):
+        # We can consume all tokens, but no more than that
+        if not self.fill(number):
             raise Exception('Too many tokens consumed')
 
-        data = self.data[effective_index - 1]
-        self.index = effective_index
+        for _ in range(number - 1):
+            self.lookahead.popleft()
 
-        return data
+        return self.lookahead.popleft()
 
     def is_empty(self) -> bool:
-        return self.index >= len(self.data)
+        return not self.fill(1)
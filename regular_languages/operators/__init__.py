@@ -1,5 +1,9 @@
 from .minimize_dfa import minimize_dfa
-from .union import union_regex, union_nfa, union_dfa
+from .union import union_regex, union_nfa, union_dfa, tagged_union_nfa
 from .closure import closure_nfa, closure_regex
 from .concatenation import concat_nfa, concat_regex
 from .complement import complement_dfa
+from .reversal import reverse_nfa
+from .equivalence import equivalent_dfa
+from .intersection import intersection_dfa, product_dfa
+from .reduce_nfa import reduce_nfa
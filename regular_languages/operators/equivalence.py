@@ -0,0 +1,34 @@
+from regular_languages import DFA
+from regular_languages.operators.union import augment_dfa
+
+def equivalent_dfa(dfa1: DFA, dfa2: DFA) -> bool:
+    '''
+    Determines if two DFAs recognize the same language, by searching the
+    pairs of states reachable in both DFAs together for a pair where only one
+    of them accepts. Symbols missing from the alphabet of a DFA lead it to a
+    dead state
+    '''
+
+    alphabet = dfa1.alphabet.union(dfa2.alphabet)
+
+    new_dfa1 = augment_dfa(dfa1, alphabet)
+    new_dfa2 = augment_dfa(dfa2, alphabet)
+
+    start_state = (new_dfa1.start_state, new_dfa2.start_state)
+    visited = {start_state}
+    queue = [start_state]
+
+    while len(queue) > 0:
+        state1, state2 = queue.pop()
+
+        if (state1 in new_dfa1.accept_states) != (state2 in new_dfa2.accept_states):
+            return False
+
+        for symbol in alphabet:
+            next_state = (new_dfa1.transition_function(state1, symbol), new_dfa2.transition_function(state2, symbol))
+
+            if next_state not in visited:
+                visited.add(next_state)
+                queue.append(next_state)
+
+    return True
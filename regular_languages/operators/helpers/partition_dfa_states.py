@@ -1,6 +1,6 @@
 from collections import defaultdict
 import itertools
-from typing import Dict, FrozenSet, Set, TypeVar
+from typing import Dict, FrozenSet, Hashable, Optional, Set, TypeVar
 
 from regular_languages.DFAs.dfa import DFA, DFASpecialStates
 from regular_languages.helpers import PartitionRefinement
@@ -8,12 +8,18 @@ from regular_languages.helpers import PartitionRefinement
 T = TypeVar('T')
 U = TypeVar('U')
 
-def partition_dfa_states(dfa: DFA[T, U]) -> PartitionRefinement[T | DFASpecialStates]:
+def partition_dfa_states(dfa: DFA[T, U],
+                         state_labels: Optional[Dict[T | DFASpecialStates, Hashable]] = None
+                         ) -> PartitionRefinement[T | DFASpecialStates]:
     '''
     Creates a disjoint parition of states for the dfa, where states are in the
     same partition are considered non-distinguishable, and states in different
     partitions are considered distingusable
 
+    If state labels are provided, states with different labels are considered
+    distinguishable, instead of only distinguishing accept and non-accept
+    states. Every state must have a label
+
     Based loosely on Hopcroft's algorithm outlined here:
     https://en.wikipedia.org/wiki/DFA_minimization
     '''
@@ -27,9 +33,20 @@ def partition_dfa_states(dfa: DFA[T, U]) -> PartitionRefinement[T | DFASpecialSt
 
         reverse_transitions[symbol][dest_state].add(state)
 
-    # The initial partition splits accept and non accept states
+    # The initial partition splits accept and non accept states, or states
+    # with different labels
     pr = PartitionRefinement.from_set(set(dfa.states))
-    pr.refine(dfa.accept_states)
+
+    if state_labels is None:
+        pr.refine(dfa.accept_states)
+
+    else:
+        label_classes = defaultdict(set)
+        for state in dfa.states:
+            label_classes[state_labels[state]].add(state)
+
+        for label_class in label_classes.values():
+            pr.refine(label_class)
 
     # Queue containing partitions to analyze: use the inital partitions
     q: Set[Set[T | DFASpecialStates] | FrozenSet[T | DFASpecialStates]] = set(frozenset(x) for x in pr.sets)
@@ -0,0 +1,47 @@
+from typing import Callable, Dict, Sequence, Tuple
+from regular_languages import DFA
+from regular_languages.operators.union import augment_dfa
+
+def intersection_dfa(dfa1: DFA, dfa2: DFA):
+    '''
+    Constructs a DFA that recognizes the strings recognized by both DFAs
+    '''
+
+    return product_dfa([dfa1, dfa2], all)
+
+def product_dfa(dfas: Sequence[DFA], accepts: Callable[[Tuple[bool, ...]], bool]):
+    '''
+    Constructs the product of any number of DFAs over the union of their
+    alphabets, where each state is a tuple of states of the DFAs, and is an
+    accept state if accepts returns True for the tuple of whether each of the
+    DFAs accepts. Only the tuples reachable from the start state are built,
+    which for most products is far fewer than all of them.
+
+    A DFA enters a dead state on symbols outside its own alphabet, like in
+    the union of DFAs
+    '''
+
+    alphabet = set().union(*(dfa.alphabet for dfa in dfas))
+    new_dfas = [augment_dfa(dfa, alphabet) for dfa in dfas]
+
+    start_state = tuple(dfa.start_state for dfa in new_dfas)
+    transition_map: Dict[Tuple, Dict] = {}
+    queue = [start_state]
+
+    while len(queue) > 0:
+        state = queue.pop()
+
+        if state in transition_map:
+            continue
+
+        transition_map[state] = {
+            symbol: tuple(dfa.transition_function(child, symbol) for dfa, child in zip(new_dfas, state))
+            for symbol in alphabet
+        }
+
+        queue.extend(next_state for next_state in transition_map[state].values() if next_state not in transition_map)
+
+    accept_states = {state for state in transition_map
+                     if accepts(tuple(child in dfa.accept_states for dfa, child in zip(new_dfas, state)))}
+
+    return DFA.from_transition_map(transition_map, start_state, accept_states)
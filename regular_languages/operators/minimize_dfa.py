@@ -1,9 +1,17 @@
-from typing import Set, TypeVar
+from typing import Dict, Hashable, Optional, Set, TypeVar
 from regular_languages.DFAs.dfa import DFA
 from regular_languages.operators.helpers import partition_dfa_states
 
-def minimize_dfa(dfa: DFA):
-    pr = partition_dfa_states(dfa)
+def minimize_dfa(dfa: DFA, state_labels: Optional[Dict[object, Hashable]] = None):
+    '''
+    Constructs the minimal DFA that recognizes the same language. Each state
+    of the new DFA is the frozenset of equivalent states it replaces.
+
+    If state labels are provided, only states with the same label are merged,
+    so every state of the new DFA can take the label of any of its members
+    '''
+
+    pr = partition_dfa_states(dfa, state_labels)
 
     new_states = set(pr.sets)
     alphabet = dfa.alphabet
@@ -0,0 +1,154 @@
+from typing import Callable, Dict, List, Set, TypeVar
+from regular_languages.NFAs.nfa import NFA
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+# The transitions of an NFA without epsilon transitions, from each state
+# index and symbol to the indices of the next states
+Moves = List[Dict[U, Set[int]]]
+
+def reduce_nfa(nfa: NFA[T, U]) -> NFA[int, U]:
+    '''
+    Constructs a smaller NFA that recognizes the same language, with states
+    renumbered to integers.
+
+    Epsilon transitions are removed first, so only the start state and the
+    states entered on a symbol are kept, which already removes most states of
+    NFAs from Thompson's construction. States that are not reachable from the
+    start state, or cannot reach an accept state, are dropped. Then states
+    that are forward bisimilar (they accept alike, and their transitions lead
+    to the same classes of states) are merged, and likewise states that are
+    backward bisimilar, until neither merges any more states
+    '''
+
+    states = list(nfa.states)
+    state_index = {state: index for index, state in enumerate(states)}
+    closures = [nfa.epsilon_closure({state}) for state in states]
+
+    moves: Moves = []
+    for closure in closures:
+        state_moves = {}
+
+        for symbol in nfa.alphabet:
+            next_states = {state_index[next_state] for state in closure
+                           for next_state in nfa.transition_function(state, symbol)}
+
+            if len(next_states) > 0:
+                state_moves[symbol] = next_states
+
+        moves.append(state_moves)
+
+    accepting = [len(closure.intersection(nfa.accept_states)) > 0 for closure in closures]
+    start = state_index[nfa.start_state]
+
+    # Keep only the states both reachable and co-reachable, numbered in the
+    # order they are reached
+    reachable = flood([start], lambda state: (next_state for next_states in moves[state].values()
+                                              for next_state in next_states))
+
+    predecessors: List[Set[int]] = [set() for _ in states]
+    for state in reachable:
+        for next_states in moves[state].values():
+            for next_state in next_states:
+                predecessors[next_state].add(state)
+
+    co_reachable = set(flood([state for state in reachable if accepting[state]], predecessors.__getitem__))
+    kept = [state for state in reachable if state in co_reachable or state == start]
+    kept_index = {state: index for index, state in enumerate(kept)}
+
+    moves = [{symbol: {kept_index[next_state] for next_state in next_states if next_state in co_reachable}
+              for symbol, next_states in moves[state].items()} for state in kept]
+    moves = [{symbol: next_states for symbol, next_states in state_moves.items() if len(next_states) > 0}
+             for state_moves in moves]
+    accepting = [accepting[state] for state in kept]
+
+    while True:
+        num_states = len(moves)
+
+        blocks = bisimulation_blocks(moves, accepting)
+        moves, accepting = quotient(moves, accepting, blocks)
+
+        blocks = bisimulation_blocks(reverse_moves(moves), [state == 0 for state in range(len(moves))])
+        moves, accepting = quotient(moves, accepting, blocks)
+
+        if len(moves) == num_states:
+            break
+
+    transition_map = {state: {symbol: next_states for symbol, next_states in state_moves.items()}
+                      for state, state_moves in enumerate(moves)}
+
+    return NFA.from_transition_map(transition_map, 0, {state for state in range(len(moves)) if accepting[state]},
+                                   set(range(len(moves))), set(nfa.alphabet))
+
+def flood(sources: List[int], neighbors: Callable) -> List[int]:
+    '''
+    Finds the states reachable from the sources, in the order they are found
+    '''
+
+    visited = set(sources)
+    order = list(sources)
+
+    for state in order:
+        for next_state in neighbors(state):
+            if next_state not in visited:
+                visited.add(next_state)
+                order.append(next_state)
+
+    return order
+
+def reverse_moves(moves: Moves) -> Moves:
+    reversed_moves: Moves = [{} for _ in moves]
+
+    for state, state_moves in enumerate(moves):
+        for symbol, next_states in state_moves.items():
+            for next_state in next_states:
+                reversed_moves[next_state].setdefault(symbol, set()).add(state)
+
+    return reversed_moves
+
+def bisimulation_blocks(moves: Moves, labels: List) -> List[int]:
+    '''
+    Partitions the states into blocks of bisimilar states: states with the
+    same label whose transitions on each symbol lead to the same blocks. The
+    partition is refined until it is stable, and blocks are numbered in the
+    order of their first state, so the block of state 0 is 0
+    '''
+
+    blocks = number_signatures(labels)
+
+    while True:
+        signatures = [(blocks[state], frozenset((symbol, blocks[next_state])
+                                                for symbol, next_states in state_moves.items()
+                                                for next_state in next_states))
+                      for state, state_moves in enumerate(moves)]
+        next_blocks = number_signatures(signatures)
+
+        if max(next_blocks, default=-1) == max(blocks, default=-1):
+            return next_blocks
+
+        blocks = next_blocks
+
+def number_signatures(signatures: List) -> List[int]:
+    numbers = {}
+
+    return [numbers.setdefault(signature, len(numbers)) for signature in signatures]
+
+def quotient(moves: Moves, accepting: List[bool], blocks: List[int]):
+    '''
+    Merges the states of each block. A block accepts if any of its states
+    does, and has every transition of its states
+    '''
+
+    num_blocks = max(blocks, default=-1) + 1
+    block_moves: Moves = [{} for _ in range(num_blocks)]
+    block_accepting = [False] * num_blocks
+
+    for state, state_moves in enumerate(moves):
+        block = blocks[state]
+        block_accepting[block] = block_accepting[block] or accepting[state]
+
+        for symbol, next_states in state_moves.items():
+            block_moves[block].setdefault(symbol, set()).update(blocks[next_state] for next_state in next_states)
+
+    return block_moves, block_accepting
@@ -0,0 +1,37 @@
+from collections import defaultdict
+from regular_languages import NFA
+from regular_languages.NFAs.generated_states import BasisState, InternalState
+from regular_languages.NFAs.nfa import SpecialSymbols
+
+def reverse_nfa(nfa: NFA):
+    '''
+    Constructs an NFA that recognizes the reversal of the language recognized
+    by the original NFA: every string, read backwards
+    '''
+
+    states = {BasisState.START}.union(InternalState.wrap(nfa.states))
+    alphabet = set(nfa.alphabet)
+
+    # Reverse every transition of the original NFA
+    reversed_transitions = defaultdict(set)
+    for state in nfa.states:
+        for symbol in nfa.alphabet.union({SpecialSymbols.EMPTY}):
+            for next_state in nfa.transition_function(state, symbol):
+                reversed_transitions[(next_state, symbol)].add(state)
+
+    def transition_function(state, symbol):
+        match state:
+            case InternalState(child):
+                return InternalState.wrap(reversed_transitions.get((child, symbol), set()))
+
+            # The new start state branches to every original accept state
+            case BasisState.START if symbol is SpecialSymbols.EMPTY:
+                return InternalState.wrap(nfa.accept_states)
+
+            case _:
+                return set()
+
+    start_state = BasisState.START
+    accept_states = {InternalState(nfa.start_state)}
+
+    return NFA.from_unsafe_transition_func(states, alphabet, transition_function, start_state, accept_states)
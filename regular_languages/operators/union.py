@@ -1,8 +1,8 @@
 import itertools
-from typing import Set
+from typing import Sequence, Set
 from regular_languages import NFA, Regex, DFA
 from regular_languages.DFAs.dfa import DFASpecialStates
-from regular_languages.NFAs.generated_states import BasisState, LeftInternalState, RightInternalState
+from regular_languages.NFAs.generated_states import BasisState, LeftInternalState, RightInternalState, TaggedInternalState
 from regular_languages.NFAs.nfa import SpecialSymbols
 from regular_languages.RegularExpressions.regex_ast import UnionNode
 
@@ -26,8 +26,8 @@ def union_dfa(dfa1: DFA, dfa2: DFA):
 
         return (dest_state_1, dest_state_2)
 
-    start_state = (dfa1.start_state, dfa2.start_state)
-    accept_states = {(state1, state2) for state1, state2 in states if state1 in dfa1.accept_states or state2 in dfa2.accept_states}
+    start_state = (new_dfa1.start_state, new_dfa2.start_state)
+    accept_states = {(state1, state2) for state1, state2 in states if state1 in new_dfa1.accept_states or state2 in new_dfa2.accept_states}
 
     return DFA(states, alphabet, transition_function, start_state, accept_states)
 
@@ -57,6 +57,35 @@ def union_nfa(nfa1: NFA, nfa2: NFA):
 
     return NFA.from_unsafe_transition_func(states, alphabet, transition_function, start_state, accept_states)
 
+def tagged_union_nfa(nfas: Sequence[NFA]):
+    '''
+    Constructs the union of any number of NFAs, where the states of each NFA
+    are tagged with the index of that NFA. The accept state reached reveals
+    which of the NFAs accepted the string
+    '''
+
+    states = {BasisState.START}.union(*(TaggedInternalState.wrap(tag, nfa.states)
+                                        for tag, nfa in enumerate(nfas)))
+    alphabet = set().union(*(nfa.alphabet for nfa in nfas))
+
+    def transition_function(state, symbol):
+        match state:
+            case TaggedInternalState(tag, child) if symbol in nfas[tag].alphabet or symbol is SpecialSymbols.EMPTY:
+                return TaggedInternalState.wrap(tag, nfas[tag].transition_function(child, symbol))
+
+            case BasisState.START if symbol is SpecialSymbols.EMPTY:
+                return {TaggedInternalState(tag, nfa.start_state) for tag, nfa in enumerate(nfas)}
+
+            # Catches the cases where the symbol was not valid in the above transitions
+            case _:
+                return set()
+
+    start_state = BasisState.START
+    accept_states = set().union(*(TaggedInternalState.wrap(tag, nfa.accept_states)
+                                  for tag, nfa in enumerate(nfas)))
+
+    return NFA.from_unsafe_transition_func(states, alphabet, transition_function, start_state, accept_states)
+
 # TODO: this should be in some other file, probably
 def augment_dfa(dfa: DFA, new_alphabet: Set):
     '''
@@ -64,6 +93,11 @@ def augment_dfa(dfa: DFA, new_alphabet: Set):
     state for character that weren't in the original alphabet
     '''
 
+    # The dead state of a complemented DFA accepts, so it is no longer dead.
+    # Its states are wrapped first, to leave the dead state free
+    if DFASpecialStates.DEAD in dfa.accept_states:
+        dfa = dfa.rename_states({state: (state,) for state in dfa.states})
+
     states = dfa.states.union({DFASpecialStates.DEAD})
 
     def transition_function(state, symbol):
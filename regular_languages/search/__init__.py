@@ -0,0 +1,2 @@
+from .searcher import Match, Searcher, find, finditer, search, unanchored_nfa
+from .prefilter import Prefilter, extract_required_prefix
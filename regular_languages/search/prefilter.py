@@ -0,0 +1,151 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Sequence, Tuple, TypeVar
+
+from regular_languages.DFAs.compiled_dfa import BaseCompiledDFA
+from regular_languages.RegularExpressions.required_literals import NO_LITERALS, Literal, LiteralSet, RequiredLiterals
+
+U = TypeVar('U')
+
+@dataclass
+class Prefilter:
+    '''
+    Skips over input that cannot contain a match using C-level substring
+    search (str.find and bytes.find), before any automaton is simulated.
+
+    Every match must start with one of the prefixes, and must contain one of
+    the factors. Either may be None, when there is nothing useful to search for
+    '''
+
+    prefixes: Optional[LiteralSet]
+    factors: Optional[LiteralSet]
+
+    # Caches the literals converted to the type of text being searched
+    converted: Dict[type, Optional[Tuple]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_required_literals(cls, literals: RequiredLiterals):
+        prefixes = None if literals.prefixes == NO_LITERALS else literals.prefixes
+        factors = None if literals.factors == NO_LITERALS else literals.factors
+
+        return cls(prefixes, factors)
+
+    @classmethod
+    def from_required_prefix(cls, prefix: Literal):
+        return cls(None if len(prefix) == 0 else frozenset({prefix}), None)
+
+    def is_useful(self) -> bool:
+        return self.prefixes is not None or self.factors is not None
+
+    def convert(self, text: Sequence, literals: LiteralSet) -> Optional[Tuple]:
+        '''
+        Converts literals to substrings of the same type as the text, or
+        returns None if the text cannot be searched with C-level substring
+        search. Strings are searched for strings of single characters, and
+        bytes-like objects for strings of integer bytes
+        '''
+
+        key = (type(text), literals)
+
+        if key not in self.converted:
+            self.converted[key] = convert_literals(text, literals)
+
+        return self.converted[key]
+
+    def may_match(self, text: Sequence, start: int = 0) -> bool:
+        '''
+        Returns False if no match can exist within text[start:], because the
+        text contains none of the required factors
+        '''
+
+        if self.factors is None:
+            return True
+
+        factors = self.convert(text, self.factors)
+
+        if factors is None:
+            return True
+
+        return any(text.find(factor, start) != -1 for factor in factors)
+
+    def candidate_starts(self, text: Sequence, start: int = 0) -> Optional[Iterator[int]]:
+        '''
+        Iterates, in increasing order, over the indices in text[start:] where
+        one of the required prefixes occurs, which are the only indices where
+        a match can start. Returns None if the prefixes cannot be used
+        '''
+
+        if self.prefixes is None:
+            return None
+
+        prefixes = self.convert(text, self.prefixes)
+
+        if prefixes is None:
+            return None
+
+        return iterate_occurrences(text, prefixes, start)
+
+def convert_literals(text: Sequence, literals: LiteralSet) -> Optional[Tuple]:
+    match text:
+        case str() if all(isinstance(symbol, str) and len(symbol) == 1
+                          for literal in literals for symbol in literal):
+            return tuple(''.join(literal) for literal in literals)
+
+        case bytes() | bytearray() if all(isinstance(symbol, int) and 0 <= symbol < 256
+                                          for literal in literals for symbol in literal):
+            return tuple(bytes(literal) for literal in literals)
+
+    return None
+
+def iterate_occurrences(text: Sequence, literals: Tuple, start: int) -> Iterator[int]:
+    '''
+    Merges the occurrences of several literals in the text, in increasing
+    order, searching for the next occurrence of a literal only once the
+    previous one has been passed
+    '''
+
+    next_occurrences = {literal: text.find(literal, start) for literal in literals}
+    next_occurrences = {literal: index for literal, index in next_occurrences.items() if index != -1}
+
+    while len(next_occurrences) > 0:
+        index = min(next_occurrences.values())
+        yield index
+
+        for literal, occurrence in list(next_occurrences.items()):
+            if occurrence == index:
+                occurrence = text.find(literal, index + 1)
+
+                if occurrence == -1:
+                    del next_occurrences[literal]
+
+                else:
+                    next_occurrences[literal] = occurrence
+
+def extract_required_prefix(compiled: BaseCompiledDFA[U]) -> Literal:
+    '''
+    Extracts the literal prefix that every string accepted by a compiled DFA
+    must start with, by following the start state while it has exactly one
+    transition on a single symbol that can still lead to an accept state
+    '''
+
+    column_symbols = {}
+    for symbol, column in compiled.symbol_columns.items():
+        column_symbols.setdefault(column, []).append(symbol)
+
+    prefix = []
+    visited = set()
+    state = 0
+
+    while not compiled.accepting[state] and state not in visited:
+        visited.add(state)
+
+        live_columns = [column for column in column_symbols if
+                        not compiled.dead[compiled.transition(state, column)]]
+
+        if len(live_columns) != 1 or len(column_symbols[live_columns[0]]) != 1:
+            break
+
+        column = live_columns[0]
+        prefix.append(column_symbols[column][0])
+        state = compiled.transition(state, column)
+
+    return tuple(prefix)
@@ -0,0 +1,302 @@
+from dataclasses import dataclass
+from typing import Dict, Generic, Iterable, Iterator, Optional, Sequence, Tuple, TypeVar
+
+from regular_languages.DFAs.compiled_dfa import CompiledDFA
+from regular_languages.DFAs.dfa import DFA
+from regular_languages.NFAs.generated_states import BasisState, InternalState
+from regular_languages.NFAs.nfa import NFA, SpecialSymbols
+from regular_languages.RegularExpressions.regex import Regex
+from regular_languages.RegularExpressions.required_literals import extract_required_literals
+from regular_languages.Converters.DFA_to_NFA import DFA_to_NFA
+from regular_languages.Converters.NFA_to_DFA import NFA_to_DFA
+from regular_languages.Converters.regex_to_nfa import regex_to_nfa
+from regular_languages.operators import reverse_nfa
+from .prefilter import Prefilter, extract_required_prefix
+
+U = TypeVar('U')
+
+@dataclass(frozen=True)
+class Match:
+    '''
+    The span of a match within a larger text: text[start:end] is accepted
+    '''
+
+    start: int
+    end: int
+
+    def span(self) -> Tuple[int, int]:
+        return (self.start, self.end)
+
+def unanchored_nfa(nfa: NFA):
+    '''
+    Constructs an NFA that recognizes every string ending with a string
+    recognized by the original NFA. Effectively, the original NFA prefixed
+    with a closure over its alphabet
+    '''
+
+    states = {BasisState.START}.union(InternalState.wrap(nfa.states))
+    alphabet = set(nfa.alphabet)
+
+    def transition_function(state, symbol):
+        match state:
+            case InternalState(child):
+                return InternalState.wrap(nfa.transition_function(child, symbol))
+
+            case BasisState.START if symbol is SpecialSymbols.EMPTY:
+                return {InternalState(nfa.start_state)}
+
+            # The start state loops on every symbol in the alphabet
+            case BasisState.START:
+                return {BasisState.START}
+
+    start_state = BasisState.START
+    accept_states = InternalState.wrap(nfa.accept_states)
+
+    return NFA.from_unsafe_transition_func(states, alphabet, transition_function, start_state, accept_states)
+
+@dataclass
+class Searcher(Generic[U]):
+    '''
+    Finds the leftmost-longest matches of a pattern within a larger text, in
+    time linear in the length of the text for a given pattern.
+
+    The forward automaton recognizes the pattern prefixed with a closure over
+    the alphabet, so a single pass finds every index where a match ends. The
+    reverse automaton does the same for the reversed pattern, so a single
+    backwards pass finds every index where a match starts. The anchored
+    automaton recognizes the pattern itself, and extends each leftmost start
+    to the longest match. The extensions of nearby starts can run over the
+    same text, so where an extension reaches an index in a state some earlier
+    extension already reached it in, it reuses the longest end found from
+    there. Each index is then simulated at most once per anchored state.
+
+    If the pattern requires literals, the prefilter skips texts that cannot
+    contain a match, and jumps straight to the indices where a required
+    prefix occurs, without simulating the forward and reverse automata
+    '''
+
+    anchored: CompiledDFA[U]
+    forward: CompiledDFA[U]
+    reverse: CompiledDFA[U]
+    prefilter: Optional[Prefilter] = None
+
+    @classmethod
+    def from_pattern(cls, pattern: DFA[object, U] | Regex[U]):
+        '''
+        Compiles the automata used to search for a pattern
+        '''
+
+        match pattern:
+            case DFA():
+                nfa = DFA_to_NFA(pattern)
+                anchored = pattern.compile()
+                prefilter = Prefilter.from_required_prefix(extract_required_prefix(anchored))
+
+            case Regex():
+                nfa = regex_to_nfa(pattern)
+                anchored = NFA_to_DFA(nfa).compile()
+                prefilter = Prefilter.from_required_literals(extract_required_literals(pattern.ast))
+
+            case _:
+                raise Exception(f'Cannot search for a pattern of type {type(pattern)}')
+
+        # A symbol outside the alphabet cannot be part of any match, so these
+        # automata forget everything they have read when they encounter one
+        forward = NFA_to_DFA(unanchored_nfa(nfa)).compile(restart_on_unknown_symbol=True)
+        reverse = NFA_to_DFA(unanchored_nfa(reverse_nfa(nfa))).compile(restart_on_unknown_symbol=True)
+
+        return cls(anchored, forward, reverse, prefilter if prefilter.is_useful() else None)
+
+    def last_match_end(self, text: Sequence[U], start: int = 0) -> int:
+        '''
+        Returns the largest index at which a match within text[start:] ends,
+        or -1 if there are no matches
+        '''
+
+        forward = self.forward
+        table, num_columns, accepting = forward.table, forward.num_columns, forward.accepting
+        get_column, unknown_column = forward.symbol_columns.get, forward.num_columns - 1
+
+        state = 0
+        last_end = start if accepting[state] else -1
+
+        for index in range(start, len(text)):
+            state = table[state * num_columns + get_column(text[index], unknown_column)]
+
+            if accepting[state]:
+                last_end = index + 1
+
+        return last_end
+
+    def match_starts(self, text: Sequence[U], start: int, end: int) -> bytearray:
+        '''
+        Returns a bytearray that marks, for every index in [start, end], if a
+        match within text[start:end] starts at that index. Indices before the
+        start are left unmarked
+        '''
+
+        reverse = self.reverse
+        table, num_columns, accepting = reverse.table, reverse.num_columns, reverse.accepting
+        get_column, unknown_column = reverse.symbol_columns.get, reverse.num_columns - 1
+
+        starts = bytearray(end + 1)
+
+        state = 0
+        starts[end] = accepting[state]
+
+        for index in range(end - 1, start - 1, -1):
+            state = table[state * num_columns + get_column(text[index], unknown_column)]
+            starts[index] = accepting[state]
+
+        return starts
+
+    def longest_match_end(self, text: Sequence[U], match_start: int, end: int,
+                          known_ends: Dict[Tuple[int, int], int]) -> int:
+        '''
+        Returns the end index of the longest match within text[match_start:end]
+        starting at match_start, or -1 if there is none.
+
+        Known ends maps from an index and an anchored state reached there to
+        the longest end found from that point by an earlier call, with the
+        same end. The simulation stops as soon as it reaches one of them, and
+        adds the points it went through
+        '''
+
+        anchored = self.anchored
+        table, num_columns, accepting, dead = anchored.table, anchored.num_columns, anchored.accepting, anchored.dead
+        get_column, unknown_column = anchored.symbol_columns.get, anchored.num_columns - 1
+
+        path = []
+        index, state = match_start, 0
+        longest = -1
+
+        while True:
+            if (index, state) in known_ends:
+                longest = known_ends[(index, state)]
+                break
+
+            if dead[state]:
+                break
+
+            path.append((index, state))
+
+            if index == end:
+                break
+
+            state = table[state * num_columns + get_column(text[index], unknown_column)]
+            index += 1
+
+        # The longest end from each point is the longest end after it, unless
+        # the point itself accepts
+        for point in reversed(path):
+            if longest == -1 and accepting[point[1]]:
+                longest = point[0]
+
+            known_ends[point] = longest
+
+        return longest
+
+    def finditer(self, text: Sequence[U], start: int = 0) -> Iterator[Match]:
+        '''
+        Iterates over the non-overlapping leftmost-longest matches in the
+        text, from left to right. After a non-empty match, an empty match at
+        the index where it ends is still reported, like the re module does.
+        After an empty match, the search resumes at the next index
+        '''
+
+        if self.prefilter is not None:
+            if not self.prefilter.may_match(text, start):
+                return
+
+            candidates = self.prefilter.candidate_starts(text, start)
+
+            if candidates is not None:
+                yield from self.finditer_candidates(text, candidates, start)
+                return
+
+        end = self.last_match_end(text, start)
+
+        if end == -1:
+            return
+
+        starts = self.match_starts(text, start, end)
+        known_ends: Dict[Tuple[int, int], int] = {}
+        index = start
+
+        while index <= end:
+            match_start = starts.find(1, index)
+
+            if match_start == -1:
+                return
+
+            match_end = self.longest_match_end(text, match_start, end, known_ends)
+            yield Match(match_start, match_end)
+
+            # Skip past empty matches, so the search always progresses
+            index = match_end if match_end > match_start else match_end + 1
+
+    def finditer_candidates(self, text: Sequence[U], candidates: Iterable[int],
+                            start: int = 0) -> Iterator[Match]:
+        '''
+        Iterates over the non-overlapping leftmost-longest matches that start
+        at one of the candidate indices, given in increasing order
+        '''
+
+        known_ends: Dict[Tuple[int, int], int] = {}
+        index = start
+
+        for match_start in candidates:
+            if match_start < index:
+                continue
+
+            match_end = self.longest_match_end(text, match_start, len(text), known_ends)
+
+            if match_end == -1:
+                continue
+
+            yield Match(match_start, match_end)
+            index = match_end if match_end > match_start else match_end + 1
+
+    def search(self, text: Sequence[U], start: int = 0) -> Optional[Match]:
+        '''
+        Returns the leftmost-longest match in the text, or None if there is no
+        match
+        '''
+
+        return next(self.finditer(text, start), None)
+
+    def find(self, text: Sequence[U], start: int = 0) -> int:
+        '''
+        Returns the index where the leftmost-longest match in the text starts,
+        or -1 if there is no match, like str.find
+        '''
+
+        match = self.search(text, start)
+
+        return -1 if match is None else match.start
+
+def finditer(pattern: DFA | Regex | Searcher, text: Sequence, start: int = 0) -> Iterator[Match]:
+    '''
+    Iterates over the non-overlapping leftmost-longest matches of a pattern in
+    the text. Compile a Searcher once to search many texts with a pattern
+    '''
+
+    return _searcher(pattern).finditer(text, start)
+
+def search(pattern: DFA | Regex | Searcher, text: Sequence, start: int = 0) -> Optional[Match]:
+    '''
+    Returns the leftmost-longest match of a pattern in the text, or None
+    '''
+
+    return _searcher(pattern).search(text, start)
+
+def find(pattern: DFA | Regex | Searcher, text: Sequence, start: int = 0) -> int:
+    '''
+    Returns the index where the leftmost-longest match of a pattern in the
+    text starts, or -1 if there is no match
+    '''
+
+    return _searcher(pattern).find(text, start)
+
+def _searcher(pattern: DFA | Regex | Searcher) -> Searcher:
+    return pattern if isinstance(pattern, Searcher) else Searcher.from_pattern(pattern)